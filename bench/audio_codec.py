@@ -0,0 +1,112 @@
+# bench/audio_codec.py
+"""
+CPU cost of Twilio media framing per 20 ms frame, at many streams at once.
+
+Drives N call serializers side by side, one inbound media message and one
+outbound 20 ms TTS frame per stream per tick (interleaved across streams,
+as the server's event loop sees them), and reports CPU microseconds per
+frame in each direction for pipecat's TwilioFrameSerializer and for
+FastTwilioFrameSerializer. `cores_at_realtime` is the share of one core
+the framing alone needs to keep N streams in real time.
+
+    python -m bench.audio_codec --streams 100,200 --seconds 5
+"""
+import argparse
+import base64
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from pipecat.frames.frames import OutputAudioRawFrame
+from pipecat.serializers.twilio import TwilioFrameSerializer
+
+from services.audio_codec import FastTwilioFrameSerializer, TWILIO_RATE
+
+FRAME_SECONDS = 0.02  # Twilio sends 20 ms media frames
+
+SERIALIZERS = {"pipecat": TwilioFrameSerializer, "fast": FastTwilioFrameSerializer}
+
+def inbound_messages(streams: int, ticks: int, seed: int = 0) -> list:
+    """Twilio-format media messages, [tick][stream], with random mu-law payloads."""
+    rng = np.random.default_rng(seed)
+    samples = int(TWILIO_RATE * FRAME_SECONDS)
+    return [
+        [
+            json.dumps({
+                "event": "media", "sequenceNumber": str(tick + 2), "streamSid": f"MZ{stream:032d}",
+                "media": {
+                    "track": "inbound", "chunk": str(tick + 1), "timestamp": str(tick * 20),
+                    "payload": base64.b64encode(rng.integers(0, 256, samples, dtype=np.uint8).tobytes()).decode("ascii"),
+                },
+            }, separators=(",", ":"))
+            for stream in range(streams)
+        ]
+        for tick in range(ticks)
+    ]
+
+def outbound_frames(count: int, sample_rate: int, seed: int = 1) -> list:
+    """Distinct 20 ms TTS frames, reused round-robin."""
+    rng = np.random.default_rng(seed)
+    samples = int(sample_rate * FRAME_SECONDS)
+    return [
+        OutputAudioRawFrame(
+            audio=rng.integers(-12000, 12000, samples, dtype=np.int16).tobytes(),
+            sample_rate=sample_rate, num_channels=1,
+        )
+        for _ in range(count)
+    ]
+
+def run(name: str, streams: int, inbound: list, outbound: list) -> dict:
+    serializers = [SERIALIZERS[name](f"MZ{stream:032d}") for stream in range(streams)]
+    in_cpu = out_cpu = 0.0
+    for tick, messages in enumerate(inbound):
+        start = time.process_time()
+        for serializer, message in zip(serializers, messages):
+            serializer.deserialize(message)
+        middle = time.process_time()
+        frame = outbound[tick % len(outbound)]
+        for serializer in serializers:
+            serializer.serialize(frame)
+        in_cpu += middle - start
+        out_cpu += time.process_time() - middle
+    frames = streams * len(inbound)
+    audio_seconds = len(inbound) * FRAME_SECONDS
+    return {
+        "serializer": name,
+        "streams": streams,
+        "inbound_us_per_frame": round(in_cpu / frames * 1e6, 2),
+        "outbound_us_per_frame": round(out_cpu / frames * 1e6, 2),
+        "cores_at_realtime": round((in_cpu + out_cpu) / audio_seconds, 3),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--streams", default="100,200",
+                        type=lambda value: [int(v) for v in value.split(",")],
+                        help="comma-separated numbers of concurrent streams")
+    parser.add_argument("--seconds", type=float, default=5.0, help="audio seconds per stream")
+    parser.add_argument("--out-rate", type=int, default=24000, help="sample rate of the TTS frames sent out")
+    args = parser.parse_args()
+
+    ticks = int(args.seconds / FRAME_SECONDS)
+    outbound = outbound_frames(50, args.out_rate)
+    for streams in args.streams:
+        inbound = inbound_messages(streams, ticks)
+        results = {name: run(name, streams, inbound, outbound) for name in SERIALIZERS}
+        for result in results.values():
+            print(json.dumps(result))
+        base, fast = results["pipecat"], results["fast"]
+        print(json.dumps({
+            "streams": streams,
+            "speedup": round(base["cores_at_realtime"] / max(fast["cores_at_realtime"], 1e-9), 2),
+        }))
+
+if __name__ == "__main__":
+    main()
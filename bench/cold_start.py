@@ -0,0 +1,141 @@
+# bench/cold_start.py
+"""
+Cold start of the server, checked against a startup budget.
+
+Starts the real app under uvicorn in a fresh process --runs times and, for
+each run, measures from spawning the process until its port accepts
+connections and until the background provider warmup is done. The app's
+own /startup breakdown (interpreter, imports, app setup, startup hooks,
+per-provider import and warmup times) is reported with each run, and a
+separate `python -X importtime` pass lists the packages that dominate
+import time. Exits non-zero when the median time to an open port exceeds
+--budget-s (STARTUP_BUDGET_SECONDS by default).
+
+    python -m bench.cold_start --runs 3
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from collections import defaultdict
+from pathlib import Path
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from config import STARTUP_BUDGET_SECONDS
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def server_env(data_dir: str, warmup: bool) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "TRANSCRIPT_DB_PATH": f"{data_dir}/transcripts.sqlite3",
+        "CALL_REGISTRY_PATH": f"{data_dir}/calls.sqlite3",
+        "AGENT_REGISTRY_PATH": f"{data_dir}/agents.sqlite3",
+        "FRAME_LOG_PATH": f"{data_dir}/frames.jsonl",
+        "TTS_CACHE_DIR": f"{data_dir}/tts",
+        "STARTUP_WARMUP": "1" if warmup else "0",
+    })
+    return env
+
+def port_open(port: int) -> bool:
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=0.1):
+            return True
+    except OSError:
+        return False
+
+def get_json(port: int, path: str) -> dict:
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=5) as response:
+        return json.loads(response.read())
+
+def measure_run(args) -> dict:
+    """One cold start: spawn the server, wait for its port, then for its warmup."""
+    port = free_port()
+    command = [sys.executable, "-m", "uvicorn", "server.app:app", "--host", "127.0.0.1",
+               "--port", str(port), "--log-level", "warning"]
+    with tempfile.TemporaryDirectory(prefix="klix-cold-") as data_dir:
+        started = time.perf_counter()
+        server = subprocess.Popen(command, cwd=root_dir, env=server_env(data_dir, not args.no_warmup),
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            while not port_open(port):
+                if server.poll() is not None:
+                    raise RuntimeError(f"server exited with code {server.returncode}")
+                if time.perf_counter() - started > args.timeout:
+                    raise RuntimeError("server did not open its port in time")
+                time.sleep(0.005)
+            port_s = time.perf_counter() - started
+            startup = get_json(port, "/startup")
+            warm_s = None
+            if not args.no_warmup:
+                while not startup["warm"] and time.perf_counter() - started < args.timeout:
+                    time.sleep(0.02)
+                    startup = get_json(port, "/startup")
+                warm_s = round(time.perf_counter() - started, 3)
+        finally:
+            server.terminate()
+            server.wait()
+    return {"port_open_s": round(port_s, 3), "warm_s": warm_s, "startup": startup}
+
+def import_breakdown(top: int) -> dict:
+    """Milliseconds of import time by top-level package for `import server.app`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import server.app"],
+        cwd=root_dir, env=server_env(tempfile.mkdtemp(prefix="klix-cold-"), False),
+        capture_output=True, text=True,
+    )
+    by_package = defaultdict(int)
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        by_package[name.strip().split(".")[0]] += int(self_us)
+    slowest = sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "total_ms": round(sum(by_package.values()) / 1000, 1),
+        "slowest_ms": {name: round(us / 1000, 1) for name, us in slowest},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="cold starts measured")
+    parser.add_argument("--budget-s", type=float, default=STARTUP_BUDGET_SECONDS,
+                        help="seconds from spawn until the port is open")
+    parser.add_argument("--no-warmup", action="store_true", help="start with STARTUP_WARMUP=0")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds to wait for each start")
+    parser.add_argument("--top", type=int, default=8, help="slowest packages listed in the import breakdown")
+    args = parser.parse_args()
+
+    runs = []
+    for run in range(args.runs):
+        result = measure_run(args)
+        runs.append(result)
+        print(json.dumps({"run": run, **result}))
+    print(json.dumps({"imports": import_breakdown(args.top)}))
+
+    port_open = statistics.median(r["port_open_s"] for r in runs)
+    warm = [r["warm_s"] for r in runs if r["warm_s"] is not None]
+    within = port_open <= args.budget_s
+    print(json.dumps({
+        "runs": len(runs),
+        "port_open_s": round(port_open, 3),
+        "warm_s": round(statistics.median(warm), 3) if warm else None,
+        "budget_s": args.budget_s,
+        "within_budget": within,
+    }))
+    sys.exit(0 if within else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# bench/control_plane.py
+"""
+Event loop lag while many Twilio dials run at once.
+
+Runs a burst of dials against a fake Twilio client whose requests block
+for a fixed round-trip time, while simulated media streams tick every
+20 ms on the same loop. Compares calling the SDK directly inside
+coroutines (the old CallBot path) with TwilioControlPlane.
+
+    python -m bench.control_plane --dials 200 --rtt 0.15 --streams 100
+"""
+import argparse
+import asyncio
+import itertools
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from services.loop_lag import LoopLagMonitor
+from services.stats import percentile
+from services.twilio_control import TwilioControlPlane
+
+FRAME_INTERVAL = 0.02  # Twilio sends 20 ms media frames
+
+class FakeCallContext:
+    def __init__(self, rtt, sid):
+        self._rtt = rtt
+        self._sid = sid
+
+    def update(self, **kwargs):
+        time.sleep(self._rtt)
+        return SimpleNamespace(sid=self._sid, status="completed")
+
+    def fetch(self):
+        time.sleep(self._rtt)
+        return SimpleNamespace(sid=self._sid, status="in-progress")
+
+class FakeCallList:
+    """Mimics client.calls: callable for a call context, with a blocking create()."""
+
+    def __init__(self, rtt):
+        self._rtt = rtt
+        self._ids = itertools.count()
+
+    def __call__(self, sid):
+        return FakeCallContext(self._rtt, sid)
+
+    def create(self, **kwargs):
+        time.sleep(self._rtt)
+        return SimpleNamespace(sid=f"CA{next(self._ids):032d}")
+
+class FakeTwilioClient:
+    def __init__(self, rtt):
+        self.calls = FakeCallList(rtt)
+
+async def media_stream(stop: asyncio.Event, lateness: list):
+    """Tick like a live media stream and record how late each frame is (ms)."""
+    next_tick = time.perf_counter()
+    while not stop.is_set():
+        next_tick += FRAME_INTERVAL
+        await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
+        lateness.append(max(0.0, time.perf_counter() - next_tick) * 1000.0)
+
+async def run(mode: str, dials: int, rtt: float, streams: int, workers: int) -> dict:
+    client = FakeTwilioClient(rtt)
+    control_plane = TwilioControlPlane(None, None, max_workers=workers, client=client)
+
+    async def dial_blocking():
+        # What CallBot.make_call used to do: a sync SDK call inside a coroutine.
+        return client.calls.create(to="+15550000000", from_="+15550000001", twiml="<Response/>").sid
+
+    async def dial_control_plane():
+        return await control_plane.create_call("+15550000000", "+15550000001", "<Response/>")
+
+    dial = dial_blocking if mode == "blocking" else dial_control_plane
+
+    monitor = LoopLagMonitor(interval=0.01, window=100000)
+    monitor.start()
+    stop = asyncio.Event()
+    lateness = []
+    pumps = [asyncio.create_task(media_stream(stop, lateness)) for _ in range(streams)]
+    await asyncio.sleep(0.1)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(dial() for _ in range(dials)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await asyncio.gather(*pumps)
+    await monitor.stop()
+    control_plane.close()
+
+    ordered = sorted(lateness)
+    return {
+        "mode": mode,
+        "dials_per_second": round(dials / elapsed, 1),
+        "loop_lag": monitor.stats(),
+        "media_frame_lateness_p99_ms": round(percentile(ordered, 99), 2),
+        "media_frame_lateness_max_ms": round(ordered[-1], 2) if ordered else 0.0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dials", type=int, default=100)
+    parser.add_argument("--rtt", type=float, default=0.1, help="simulated Twilio round trip in seconds")
+    parser.add_argument("--streams", type=int, default=50, help="simulated live media streams")
+    parser.add_argument("--workers", type=int, default=16, help="control plane thread pool size")
+    args = parser.parse_args()
+
+    for mode in ("blocking", "control_plane"):
+        result = asyncio.run(run(mode, args.dials, args.rtt, args.streams, args.workers))
+        print(result)
+
+if __name__ == "__main__":
+    main()
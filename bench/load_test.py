@@ -0,0 +1,191 @@
+# bench/load_test.py
+"""
+Capacity of a single server process under simulated calls.
+
+Starts the real FastAPI app in a child process with mock STT/LLM/TTS
+services (bench.mock_providers), then runs increasing numbers of
+concurrent SimulatedCalls (bench.twilio_sim) against /ws/stream. For each
+level it reports client-side turn latency and reply-frame gaps, the
+server's CPU time per inbound 20 ms media frame, its event loop lag and
+its own per-stage latency percentiles. The highest level that meets the
+latency and lag targets is reported as max concurrent sessions.
+
+    python -m bench.load_test --sessions 5,10,20,40 --turns 3
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import aiohttp
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from services.stats import summarize
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def serve(args):
+    """Child process: the real app with mock providers and a stats endpoint."""
+    data_dir = tempfile.mkdtemp(prefix="klix-bench-")
+    os.environ["TRANSCRIPT_DB_PATH"] = f"{data_dir}/transcripts.sqlite3"
+    os.environ["CALL_REGISTRY_PATH"] = f"{data_dir}/calls.sqlite3"
+    os.environ["AGENT_REGISTRY_PATH"] = f"{data_dir}/agents.sqlite3"
+    os.environ["FRAME_LOG_PATH"] = f"{data_dir}/frames.jsonl"
+    os.environ["RECORDING_SAMPLE_FRACTION"] = "0"
+    os.environ["ADMISSION_MAX_SESSIONS"] = "0"  # measure capacity, do not cap it
+
+    import uvicorn
+    from bench.mock_providers import EnergyVADAnalyzer, MockProviders
+    from server import app as server_app
+    from services.loop_lag import LoopLagMonitor
+
+    bot = server_app.bot
+    bot.provider_factory = MockProviders(args.stt_latency, args.llm_latency, args.tts_latency)
+    if not args.silero:
+        bot.vad_factory = EnergyVADAnalyzer
+    monitor = LoopLagMonitor(interval=0.01, window=100000)
+
+    @server_app.app.on_event("startup")
+    async def start_monitor():
+        monitor.start()
+
+    @server_app.app.post("/bench/reset")
+    async def bench_reset():
+        monitor.reset()
+        bot.latency_tracker = type(bot.latency_tracker)()
+        return {}
+
+    @server_app.app.get("/bench/stats")
+    async def bench_stats():
+        return {
+            "cpu_seconds": time.process_time(),
+            "loop_lag": monitor.stats(),
+            "active_calls": len(bot.active_calls),
+            "latency": bot.latency_tracker.summary()["stages"],
+        }
+
+    uvicorn.run(server_app.app, host="127.0.0.1", port=args.port, log_level="warning")
+
+async def wait_for_server(http: aiohttp.ClientSession, base: str, timeout: float = 60.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            async with http.get(f"{base}/bench/stats") as response:
+                if response.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.5)
+    raise RuntimeError("server did not start")
+
+async def run_level(http, base: str, sessions: int, args, speech: bytes) -> dict:
+    from bench.twilio_sim import SimulatedCall
+
+    await http.post(f"{base}/bench/reset")
+    async with http.get(f"{base}/bench/stats") as response:
+        before = await response.json()
+
+    async def call(i: int):
+        # Spread call arrivals over the ramp so VAD windows do not all line up.
+        await asyncio.sleep(args.ramp * i / sessions)
+        return await SimulatedCall(f"ws://127.0.0.1:{args.port}/ws/stream", speech, args.turns).run()
+
+    results = await asyncio.gather(*(call(i) for i in range(sessions)))
+    async with http.get(f"{base}/bench/stats") as response:
+        after = await response.json()
+
+    frames = sum(r.frames_sent for r in results)
+    client = summarize({
+        "turn_latency_ms": [v for r in results for v in r.turn_latencies_ms],
+        "reply_gap_ms": [v for r in results for v in r.reply_gaps_ms],
+    })
+    cpu_ms_per_frame = (after["cpu_seconds"] - before["cpu_seconds"]) * 1000.0 / max(frames, 1)
+    errors = [r.error for r in results if r.error]
+    unanswered = sum(r.unanswered for r in results)
+    ok = (
+        not errors
+        and unanswered == 0
+        and client["turn_latency_ms"]["p95"] <= args.slo_ms
+        and client["reply_gap_ms"]["p99"] <= args.max_gap_ms
+        and after["loop_lag"]["p99_ms"] <= args.max_lag_ms
+    )
+    return {
+        "sessions": sessions,
+        "ok": ok,
+        "errors": errors[:3],
+        "unanswered_turns": unanswered,
+        "turn_latency_ms": client["turn_latency_ms"],
+        "reply_gap_ms": client["reply_gap_ms"],
+        "server_cpu_ms_per_frame": round(cpu_ms_per_frame, 3),
+        "server_loop_lag": after["loop_lag"],
+        "server_stages_p95_ms": {stage: s["p95"] for stage, s in after["latency"].items()},
+    }
+
+async def run(args):
+    from bench.twilio_sim import load_speech
+
+    speech = load_speech(args.audio)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "bench.load_test", "--serve", "--port", str(args.port),
+         "--stt-latency", str(args.stt_latency), "--llm-latency", str(args.llm_latency),
+         "--tts-latency", str(args.tts_latency)] + (["--silero"] if args.silero else []),
+        cwd=root_dir,
+    )
+    base = f"http://127.0.0.1:{args.port}"
+    levels = []
+    try:
+        async with aiohttp.ClientSession() as http:
+            await wait_for_server(http, base)
+            for sessions in args.sessions:
+                level = await run_level(http, base, sessions, args, speech)
+                levels.append(level)
+                print(json.dumps(level))
+                if not level["ok"] and args.stop_on_failure:
+                    break
+    finally:
+        server.terminate()
+        server.wait()
+
+    passing = [level["sessions"] for level in levels if level["ok"]]
+    print(json.dumps({"max_concurrent_sessions": max(passing) if passing else 0}))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", default="5,10,20,40",
+                        type=lambda value: [int(v) for v in value.split(",")],
+                        help="comma-separated concurrency levels to run")
+    parser.add_argument("--turns", type=int, default=3, help="caller turns per simulated call")
+    parser.add_argument("--ramp", type=float, default=2.0, help="seconds over which calls of a level start")
+    parser.add_argument("--audio", help="mono 16-bit WAV to replay as caller speech (default: synthetic)")
+    parser.add_argument("--silero", action="store_true", help="let Silero decide speech (needs real speech audio)")
+    parser.add_argument("--stt-latency", type=float, default=0.15, help="mock STT seconds to final transcript")
+    parser.add_argument("--llm-latency", type=float, default=0.35, help="mock LLM seconds to first token")
+    parser.add_argument("--tts-latency", type=float, default=0.12, help="mock TTS seconds to first audio")
+    parser.add_argument("--slo-ms", type=float, default=2000, help="turn latency p95 target (includes VAD stop_secs)")
+    parser.add_argument("--max-gap-ms", type=float, default=250, help="reply frame gap p99 target")
+    parser.add_argument("--max-lag-ms", type=float, default=50, help="server loop lag p99 target")
+    parser.add_argument("--stop-on-failure", action="store_true", help="stop at the first level that misses a target")
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    args.port = args.port or free_port()
+
+    if args.serve:
+        serve(args)
+    else:
+        asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
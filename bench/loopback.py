@@ -0,0 +1,91 @@
+# bench/loopback.py
+"""
+Throughput of in-process loopback conversations.
+
+Runs a suite of scripted conversations between a tester persona and the
+default agent (services.loopback) with mock providers, at each
+--conversations level, all at once. Each conversation is --turns agent
+replies; LLM latency is set by --llm-latency. Reports wall time,
+conversations per second, roughly how long the same conversations would
+take as phone calls (their words spoken at 150 per minute, one call at a
+time) and agent reply latency percentiles from the quality metrics.
+
+    python -m bench.loopback --conversations 100,500 --turns 5
+"""
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from loguru import logger
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from bench.mock_providers import MockProviders
+from models.agent import Agent
+from models.loopback import LoopbackScenario
+from services.agent_registry import AgentRegistry
+from services.bot import CallBot
+from services.call_metrics import compute_call_metrics, summarize_call_metrics
+from services.loopback import LoopbackRunner, loopback_activity
+
+WORDS_PER_SECOND = 2.5  # speaking rate for the phone-call time estimate
+
+async def run_level(bot: CallBot, conversations: int, args) -> dict:
+    runner = LoopbackRunner(bot, text_only=not args.audio, max_concurrency=conversations)
+    scenarios = [
+        LoopbackScenario(persona="Ask about opening hours.", name=f"bench-{i}", max_turns=args.turns)
+        for i in range(conversations)
+    ]
+    started = time.perf_counter()
+    results = await runner.run(scenarios)
+    wall = time.perf_counter() - started
+    quality = summarize_call_metrics(compute_call_metrics([loopback_activity(r) for r in results]))
+    spoken = sum(
+        len(m["content"].split()) for r in results for m in r.messages
+        if m["role"] in ("user", "assistant") and isinstance(m.get("content"), str)
+    )
+    return {
+        "conversations": conversations,
+        "mode": "audio" if args.audio else "text",
+        "errors": sum(1 for r in results if r.error),
+        "agent_turns": sum(r.turns for r in results),
+        "wall_s": round(wall, 3),
+        "conversations_per_s": round(conversations / wall, 1),
+        "call_time_s": round(spoken / WORDS_PER_SECOND, 1),
+        "speedup": round(spoken / WORDS_PER_SECOND / wall, 1),
+        "response_latency_ms": quality["response_latency"],
+    }
+
+async def run(args):
+    bot = CallBot(
+        Agent(agent_id="default", name="bench agent", prompt="You answer questions about the shop."),
+        "ACbench", "token", "+15550000000", "https://example.test",
+        provider_factory=MockProviders(args.stt_latency, args.llm_latency, args.tts_latency),
+        agents=AgentRegistry(f"{tempfile.mkdtemp(prefix='klix-bench-')}/agents.sqlite3"),
+    )
+    for level in [int(n) for n in args.conversations.split(",")]:
+        print(json.dumps(await run_level(bot, level, args)))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--conversations", default="100,500",
+                        help="comma-separated numbers of conversations run at once")
+    parser.add_argument("--turns", type=int, default=5, help="agent replies per conversation")
+    parser.add_argument("--audio", action="store_true", help="exchange TTS audio through STT instead of text")
+    parser.add_argument("--stt-latency", type=float, default=0.15, help="mock STT seconds to final transcript")
+    parser.add_argument("--llm-latency", type=float, default=0.35, help="mock LLM seconds to first token")
+    parser.add_argument("--tts-latency", type=float, default=0.12, help="mock TTS seconds to first audio")
+    args = parser.parse_args()
+    # pipecat logs every frame processor link and function call at debug level
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
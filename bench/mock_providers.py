@@ -0,0 +1,170 @@
+# bench/mock_providers.py
+"""
+Stand-in STT, LLM and TTS services with configurable latency.
+
+They plug into CallBot through `provider_factory`, so load tests exercise
+the real transport, VAD, aggregators and pipeline without calling any
+provider. Each mock also has the prewarm()/release() hooks the warm
+session pool expects.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from config import AUDIO_OUT_SAMPLE_RATE
+from services.vad import SharedSileroVADAnalyzer
+
+from pipecat.frames.frames import (
+    TextFrame,
+    TranscriptionFrame,
+    TTSAudioRawFrame,
+    TTSStartedFrame,
+    TTSStoppedFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.services.ai_services import STTService, TTSService
+from pipecat.services.openai import OpenAILLMService
+from pipecat.utils.time import time_now_iso8601
+
+MOCK_REPLY = "Sure, I can help with that. What else would you like to know?"
+
+class MockProviderMixin:
+    async def prewarm(self):
+        pass
+
+    async def release(self):
+        await self.cleanup()
+
+class MockSTTService(MockProviderMixin, STTService):
+    """Emits a final transcript `latency` seconds after VAD reports the end of user speech."""
+
+    def __init__(self, latency: float, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency
+        self._turns = 0
+        self._tasks = set()
+
+    async def set_model(self, model: str):
+        pass
+
+    async def set_language(self, language):
+        pass
+
+    async def run_stt(self, audio: bytes):
+        yield None
+
+    async def process_frame(self, frame, direction):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, UserStoppedSpeakingFrame):
+            task = asyncio.create_task(self._transcribe())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _transcribe(self):
+        await asyncio.sleep(self.latency)
+        self._turns += 1
+        await self.push_frame(TranscriptionFrame(f"mock utterance {self._turns}", "caller", time_now_iso8601()))
+
+    async def cleanup(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await super().cleanup()
+
+class MockLLMService(MockProviderMixin, OpenAILLMService):
+    """Streams a canned reply: first token after `latency`, then one word every `token_interval`."""
+
+    def __init__(self, latency: float, token_interval: float = 0.02, reply: str = MOCK_REPLY, **kwargs):
+        super().__init__(api_key="mock", model="mock", **kwargs)
+        self.latency = latency
+        self.token_interval = token_interval
+        self.reply = reply
+
+    def create_client(self, api_key=None, base_url=None, **kwargs):
+        # Never used, and building an HTTPS client costs tens of ms of CPU per service
+        return None
+
+    async def _process_context(self, context):
+        await asyncio.sleep(self.latency)
+        for word in self.reply.split():
+            await self.push_frame(TextFrame(f"{word} "))
+            await asyncio.sleep(self.token_interval)
+
+class ScriptedLLMService(MockLLMService):
+    """Speaks `replies` in order, one per turn, then calls end_call instead of replying."""
+
+    def __init__(self, replies, latency: float = 0.0, token_interval: float = 0.0, **kwargs):
+        super().__init__(latency, token_interval, **kwargs)
+        self.replies = list(replies)
+        self.turns = 0
+
+    async def _process_context(self, context):
+        if self.turns >= len(self.replies):
+            await self.call_function(
+                context=context, tool_call_id=f"end-{self.turns}", function_name="end_call", arguments="{}"
+            )
+            return
+        self.reply = self.replies[self.turns]
+        self.turns += 1
+        await super()._process_context(context)
+
+class MockTTSService(MockProviderMixin, TTSService):
+    """Answers each sentence with a tone, first audio after `latency`, about 60 ms per character."""
+
+    def __init__(self, latency: float, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency
+
+    async def set_model(self, model: str):
+        pass
+
+    async def set_voice(self, voice: str):
+        pass
+
+    async def set_language(self, language):
+        pass
+
+    async def run_tts(self, text: str):
+        await asyncio.sleep(self.latency)
+        yield TTSStartedFrame()
+        seconds = min(6.0, 0.06 * len(text))
+        t = np.arange(int(self.sample_rate * seconds)) / self.sample_rate
+        audio = (np.sin(2 * np.pi * 440 * t) * 6000).astype(np.int16).tobytes()
+        chunk = self.sample_rate // 10 * 2  # 100 ms
+        for start in range(0, len(audio), chunk):
+            yield TTSAudioRawFrame(audio[start:start + chunk], self.sample_rate, 1)
+        yield TTSStoppedFrame()
+
+class EnergyVADAnalyzer(SharedSileroVADAnalyzer):
+    """
+    Silero VAD that still runs the model on every window (so the CPU cost
+    is real) but decides by signal energy, so synthetic caller audio is
+    detected as speech.
+    """
+
+    def voice_confidence(self, buffer) -> float:
+        super().voice_confidence(buffer)
+        samples = np.frombuffer(buffer, dtype=np.int16).astype(np.float32)
+        rms = float(np.sqrt(np.mean(samples * samples))) if len(samples) else 0.0
+        return 1.0 if rms > 500 else 0.0
+
+class MockProviders:
+    """provider_factory for CallBot that builds mock services with the given latencies (seconds)."""
+
+    def __init__(self, stt_latency: float = 0.15, llm_latency: float = 0.35, tts_latency: float = 0.12,
+                 token_interval: float = 0.02):
+        self.stt_latency = stt_latency
+        self.llm_latency = llm_latency
+        self.tts_latency = tts_latency
+        self.token_interval = token_interval
+
+    def __call__(self, agent):
+        stt = MockSTTService(self.stt_latency)
+        llm = MockLLMService(self.llm_latency, self.token_interval)
+        tts = MockTTSService(self.tts_latency, sample_rate=AUDIO_OUT_SAMPLE_RATE)
+        return stt, llm, tts
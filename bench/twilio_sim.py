@@ -0,0 +1,211 @@
+# bench/twilio_sim.py
+"""
+A local stand-in for Twilio's side of a media stream.
+
+SimulatedCall connects to the server's /ws/stream endpoint, sends the
+`connected` and `start` events, then streams 20 ms mu-law `media` frames in
+real time: recorded (or synthetic) caller speech for each turn, silence in
+between. It measures turn latency (end of caller speech to the first
+non-silent audio frame back) and the gaps between reply frames, and ends
+with a `stop` event.
+
+    python -m bench.twilio_sim --url ws://localhost:8080/ws/stream --turns 3
+"""
+import argparse
+import asyncio
+import audioop
+import base64
+import json
+import sys
+import time
+import uuid
+import wave
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import websockets
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from services.stats import summarize
+
+TWILIO_RATE = 8000
+FRAME_SECONDS = 0.02
+FRAME_BYTES = int(TWILIO_RATE * FRAME_SECONDS)  # 160 mu-law bytes per 20 ms
+SILENCE = b"\xff" * FRAME_BYTES                 # mu-law zero
+SILENCE_RMS = 200                               # below this, a received frame counts as silence
+
+def load_speech(path: Optional[str] = None, seconds: float = 1.5) -> bytes:
+    """
+    Caller audio as 8 kHz mu-law. Reads a mono 16-bit WAV if given, otherwise
+    synthesizes `seconds` of syllable-like modulated noise.
+    """
+    if path:
+        with wave.open(path, "rb") as wav:
+            pcm = wav.readframes(wav.getnframes())
+            if wav.getnchannels() == 2:
+                pcm = audioop.tomono(pcm, 2, 0.5, 0.5)
+            rate = wav.getframerate()
+        if rate != TWILIO_RATE:
+            pcm, _ = audioop.ratecv(pcm, 2, 1, rate, TWILIO_RATE, None)
+    else:
+        rng = np.random.default_rng(0)
+        t = np.arange(int(TWILIO_RATE * seconds)) / TWILIO_RATE
+        envelope = 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t)
+        pcm = (rng.normal(0, 1, len(t)) * envelope * 6000).clip(-32768, 32767).astype(np.int16).tobytes()
+    return audioop.lin2ulaw(pcm, 2)
+
+@dataclass
+class CallResult:
+    """
+    What one simulated call observed.
+
+    Attributes:
+        turn_latencies_ms (list): End of caller speech to first reply audio, per answered turn.
+        reply_gaps_ms (list): Inter-arrival gaps between reply frames (playback smoothness).
+        frames_sent (int): Media frames sent to the server.
+        frames_received (int): Media frames received from the server.
+        unanswered (int): Turns that got no reply within the timeout.
+    """
+    call_sid: str
+    turn_latencies_ms: List[float] = field(default_factory=list)
+    reply_gaps_ms: List[float] = field(default_factory=list)
+    frames_sent: int = 0
+    frames_received: int = 0
+    unanswered: int = 0
+    error: Optional[str] = None
+
+class SimulatedCall:
+    """
+    One caller speaking `turns` times over a Twilio-style media stream.
+
+    Attributes:
+        url (str): The server's media-stream websocket URL.
+        speech (bytes): Caller audio for each turn, 8 kHz mu-law.
+        reply_timeout (float): Seconds to wait for a reply to start.
+        reply_gap (float): Seconds without reply audio that end a reply.
+    """
+
+    def __init__(self, url: str, speech: bytes, turns: int = 3, reply_timeout: float = 10.0,
+                 reply_gap: float = 1.0, call_sid: Optional[str] = None):
+        self.url = url
+        self.speech = speech
+        self.turns = turns
+        self.reply_timeout = reply_timeout
+        self.reply_gap = reply_gap
+        self.call_sid = call_sid or f"CA{uuid.uuid4().hex}"
+        self.stream_sid = f"MZ{uuid.uuid4().hex}"
+        self.result = CallResult(self.call_sid)
+        self._queued: List[bytes] = []
+        self._speech_end: Optional[float] = None
+        self._speech_done = asyncio.Event()
+        self._reply_started = asyncio.Event()
+        self._last_reply_frame: Optional[float] = None
+        self._sequence = 0
+
+    def _message(self, event: str, **body) -> str:
+        self._sequence += 1
+        return json.dumps({"event": event, "sequenceNumber": str(self._sequence), "streamSid": self.stream_sid, **body})
+
+    async def run(self) -> CallResult:
+        try:
+            async with websockets.connect(self.url, max_queue=None) as ws:
+                await ws.send(json.dumps({"event": "connected", "protocol": "Call", "version": "1.0.0"}))
+                await ws.send(self._message("start", start={
+                    "accountSid": "AC" + "0" * 32,
+                    "streamSid": self.stream_sid,
+                    "callSid": self.call_sid,
+                    "tracks": ["inbound"],
+                    "mediaFormat": {"encoding": "audio/x-mulaw", "sampleRate": TWILIO_RATE, "channels": 1},
+                    "customParameters": {},
+                }))
+                sender = asyncio.create_task(self._send_media(ws))
+                receiver = asyncio.create_task(self._receive(ws))
+                try:
+                    await self._converse()
+                finally:
+                    sender.cancel()
+                    receiver.cancel()
+                await ws.send(self._message("stop", stop={"accountSid": "AC" + "0" * 32, "callSid": self.call_sid}))
+        except Exception as e:
+            self.result.error = f"{type(e).__name__}: {e}"
+        return self.result
+
+    async def _converse(self):
+        for _ in range(self.turns):
+            self._speech_done.clear()
+            self._reply_started.clear()
+            self._queued = [self.speech[i:i + FRAME_BYTES] for i in range(0, len(self.speech), FRAME_BYTES)]
+            await self._speech_done.wait()
+            try:
+                await asyncio.wait_for(self._reply_started.wait(), timeout=self.reply_timeout)
+            except asyncio.TimeoutError:
+                self.result.unanswered += 1
+                continue
+            # Let the reply play out before speaking again.
+            while time.perf_counter() - self._last_reply_frame < self.reply_gap:
+                await asyncio.sleep(0.1)
+
+    async def _send_media(self, ws):
+        """Send one frame every 20 ms like a phone line: queued speech, otherwise silence."""
+        next_send = time.perf_counter()
+        timestamp = 0
+        while True:
+            if self._queued:
+                payload = self._queued.pop(0)
+                if not self._queued:
+                    self._speech_end = next_send + FRAME_SECONDS
+                    self._speech_done.set()
+            else:
+                payload = SILENCE
+            await ws.send(self._message("media", media={
+                "track": "inbound",
+                "chunk": str(self.result.frames_sent + 1),
+                "timestamp": str(timestamp),
+                "payload": base64.b64encode(payload).decode("ascii"),
+            }))
+            self.result.frames_sent += 1
+            timestamp += int(FRAME_SECONDS * 1000)
+            next_send += FRAME_SECONDS
+            await asyncio.sleep(max(0.0, next_send - time.perf_counter()))
+
+    async def _receive(self, ws):
+        async for raw in ws:
+            message = json.loads(raw)
+            if message.get("event") != "media":
+                continue
+            now = time.perf_counter()
+            self.result.frames_received += 1
+            audio = audioop.ulaw2lin(base64.b64decode(message["media"]["payload"]), 2)
+            if audioop.rms(audio, 2) < SILENCE_RMS:
+                continue
+            if self._last_reply_frame is not None and self._reply_started.is_set():
+                self.result.reply_gaps_ms.append((now - self._last_reply_frame) * 1000.0)
+            self._last_reply_frame = now
+            if self._speech_done.is_set() and not self._reply_started.is_set():
+                self.result.turn_latencies_ms.append((now - self._speech_end) * 1000.0)
+                self._reply_started.set()
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="ws://localhost:8080/ws/stream")
+    parser.add_argument("--calls", type=int, default=1, help="concurrent calls")
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--audio", help="mono 16-bit WAV to replay as caller speech")
+    args = parser.parse_args()
+
+    speech = load_speech(args.audio)
+    results = await asyncio.gather(*(SimulatedCall(args.url, speech, args.turns).run() for _ in range(args.calls)))
+    for result in results:
+        print(f"{result.call_sid}: turns {result.turn_latencies_ms}, unanswered {result.unanswered}, error {result.error}")
+    print(summarize({
+        "turn_latency_ms": [v for r in results for v in r.turn_latencies_ms],
+        "reply_gap_ms": [v for r in results for v in r.reply_gaps_ms],
+    }))
+
+if __name__ == "__main__":
+    asyncio.run(main())
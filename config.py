@@ -14,10 +14,142 @@ DEFAULT_VOICE_ID = 'sage'
 CARTESIA_API_KEY='sk_car_fY2tTPfEj58hXUSlQIDCD'
 YOUR_TWILIO_NUMBER=os.getenv("YOUR_TWILIO_NUMBER")
 SERVER_PORT = 8765
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", "1"))  # uvicorn worker processes
 MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 2.0  # base delay between retries, doubled on each attempt
 AUDIO_CHUNK_SIZE = 1024
 SAMPLE_RATE = 16000
+AUDIO_OUT_SAMPLE_RATE = 8000  # Hz of call audio from TTS to Twilio: Twilio's own rate, so nothing is resampled on the way out
 DEEPGRAM_API_KEY='615ae4008f4fe86b5dccd571408ae577f02040e2'
 
+# Providers (a backend's modules are imported only once it is selected)
+STT_PROVIDER = os.getenv("STT_PROVIDER", "deepgram")
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "openai")
+TTS_PROVIDER = os.getenv("TTS_PROVIDER", "cartesia")
+VAD_PROVIDER = os.getenv("VAD_PROVIDER", "silero")
+
+# Cold start
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "1") == "1"  # import providers and load the VAD model in the background once the port is open
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "5.0"))  # process start until the port serves, checked by bench/cold_start.py
+
+# Voice activity detection
+VAD_POOL_SIZE = min(8, os.cpu_count() or 1)  # concurrent Silero inferences across all calls
+
+# Twilio control plane
+TWILIO_MAX_WORKERS = 16       # threads (and pooled HTTP connections) for Twilio REST calls
+TWILIO_HTTP_TIMEOUT = 10      # seconds per Twilio REST request
+TWILIO_RING_TIMEOUT = 60      # seconds an outbound call rings before Twilio gives up (Twilio's default)
+CALL_STATUS_POLL_INTERVAL = 5 # seconds between status checks while waiting for a call to connect
+
+# Call registry shared by worker processes
+CALL_REGISTRY_BACKEND = os.getenv("CALL_REGISTRY_BACKEND", "sqlite")  # "sqlite" or "memory" (single worker only)
+CALL_REGISTRY_PATH = os.getenv("CALL_REGISTRY_PATH", "data/calls.sqlite3")
+CALL_REGISTRY_POLL_INTERVAL = 1      # seconds between registry checks while waiting on another worker's call
+CALL_REGISTRY_RETENTION = 86400      # seconds finished calls are kept in the registry
+
+# Agent registry shared by worker processes
+AGENT_REGISTRY_PATH = os.getenv("AGENT_REGISTRY_PATH", "data/agents.sqlite3")
+AGENT_COMPILED_CACHE_SIZE = 256      # compiled agent versions (messages, tools, voice) kept per worker
+
+# LLM context compaction for long calls
+CONTEXT_TOKEN_BUDGET = 4000        # default per-agent token budget for a call's LLM context
+CONTEXT_KEEP_TURNS = 6             # most recent turns always kept verbatim
+CONTEXT_SUMMARY_TRIGGER = 0.75     # share of the budget at which older turns start being summarized
+CONTEXT_SUMMARY_MODEL = "gpt-4o-mini"
+CONTEXT_SUMMARY_MAX_TOKENS = 300   # length cap for the running summary
+
+# Speculative LLM generation on interim transcripts
+SPECULATIVE_LLM_ENABLED = os.getenv("SPECULATIVE_LLM_ENABLED", "0") == "1"  # opt-in
+SPECULATION_MATCH_RATIO = 0.9   # draft kept if its text is at least this similar to the final transcript
+SPECULATION_MAX_DRAFTS = 3      # drafts started per user turn at most
+
+# Event loop lag monitoring
+LOOP_LAG_INTERVAL = 0.05  # seconds between lag samples
+LOOP_LAG_WINDOW = 1200    # samples kept (one minute at the default interval)
+
+# Admission control: when this worker takes on more calls
+ADMISSION_MAX_SESSIONS = int(os.getenv("ADMISSION_MAX_SESSIONS", "50"))  # calls per worker, dialed or live; 0 for no limit
+ADMISSION_MAX_LOOP_LAG_MS = float(os.getenv("ADMISSION_MAX_LOOP_LAG_MS", "50"))  # recent loop lag that holds back dials
+ADMISSION_LAG_SAMPLES = 40          # recent lag samples judged (two seconds at the default interval)
+ADMISSION_DEFER_TIMEOUT = 5.0       # seconds a dial waits for capacity before it is rejected
+ADMISSION_RESERVATION_TTL = TWILIO_RING_TIMEOUT + 60  # seconds a dialed call holds its slot without a media stream: ringing, then the TwiML greeting and stream setup, with margin
+ADMISSION_RETRY_AFTER = 5           # seconds callers are told to wait after a rejected dial
+
+# Warm provider sessions opened at dial time
+WARM_SESSION_TTL = 120     # seconds an unclaimed session is kept before teardown
+WARM_SESSION_MAX = 200     # sessions held at once; further dials start cold
+WARM_CLAIM_TIMEOUT = 3     # seconds the pipeline waits for a session still warming up
+
+# TTS phrase cache (8 kHz mu-law, ready for Twilio)
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", ".cache/tts")
+TTS_CACHE_MEMORY_BYTES = 64 * 1024 * 1024   # in-memory LRU budget
+TTS_CACHE_DISK_BYTES = 1024 * 1024 * 1024   # memory-mapped disk store budget
+TTS_CACHE_ADMIT_AFTER = 2                   # times a phrase is spoken before it is cached
+
+# Conversation evaluation
+EVALUATION_MODEL = "gpt-4o"                           # judge model (must support JSON schema output)
+EVALUATION_MAX_CONCURRENCY = 8                        # evaluation requests in flight at once
+EVALUATION_CACHE_PATH = ".cache/evaluations.sqlite3"  # verdicts keyed by transcript, criterion and model
+
+# Call quality metrics (computed locally for every call)
+QUALITY_SILENCE_GAP_SECONDS = 3.0   # silences longer than this count as gaps
+QUALITY_GOODBYE_PATTERN = r"\b(bye|goodbye|good bye|that's all|hang up)\b"  # caller wants to end the call
+QUALITY_REVIEW_LATENCY_MS = 3000    # calls with a slower reply are flagged for LLM review
+QUALITY_REVIEW_WER = 0.3            # calls whose transcript is further off the script are flagged
+EVALUATION_JUDGE_FRACTION = 0.1     # share of unflagged calls also sent to the LLM judge
+
+# Transcript store
+TRANSCRIPT_DB_PATH = os.getenv("TRANSCRIPT_DB_PATH", "data/transcripts.sqlite3")
+TRANSCRIPT_BATCH_SIZE = 500  # writes committed per transaction by the writer thread
+TRANSCRIPT_PAGE_SIZE = 100   # default page size for transcript queries
+
+# Call audio recording
+RECORDING_DIR = os.getenv("RECORDING_DIR", "data/recordings")
+RECORDING_SAMPLE_FRACTION = float(os.getenv("RECORDING_SAMPLE_FRACTION", "0.05"))  # share of calls recorded
+RECORDING_AUDIO_RATE = 8000      # Hz of the stereo WAV files (telephone bandwidth)
+RECORDING_BUFFER_SECONDS = 10    # ring buffer length per leg
+RECORDING_FLUSH_INTERVAL = 0.5   # seconds between writer passes
+
+# Structured pipeline logging
+FRAME_LOG_ENABLED = os.getenv("FRAME_LOG_ENABLED", "1") == "1"  # insert FrameLogger processors into call pipelines
+FRAME_LOG_PATH = os.getenv("FRAME_LOG_PATH")  # JSON lines file; stdout if unset
+FRAME_LOG_SAMPLE_RATES = {                    # frame class (or base class) name -> share of frames logged
+    "TranscriptionFrame": 1.0,
+    "InterimTranscriptionFrame": 0.1,
+    "TextFrame": 1.0,
+    "UserStartedSpeakingFrame": 1.0,
+    "UserStoppedSpeakingFrame": 1.0,
+    "LLMFullResponseStartFrame": 1.0,
+    "LLMFullResponseEndFrame": 1.0,
+    "StartInterruptionFrame": 1.0,
+    "ErrorFrame": 1.0,
+    "AudioRawFrame": 0.001,
+}
+FRAME_LOG_MAX_FIELD_CHARS = 200   # longer field values are truncated
+FRAME_LOG_QUEUE_SIZE = 10000      # events buffered for the writer; more are dropped
+FRAME_LOG_FLUSH_INTERVAL = 0.2    # seconds the writer waits between batches
+
+# Latency tracing
+LATENCY_TRACE_RETENTION = 500  # number of recent calls kept for latency summaries
+
+# Runtime metrics (/metrics)
+METRICS_CACHE_SECONDS = 1.0  # a snapshot is reused for scrapes within this long
+
+# Call campaigns
+CAMPAIGN_MAX_CONCURRENCY = 10     # live campaign calls at once
+CAMPAIGN_CALLS_PER_SECOND = 1.0   # Twilio's default outbound CPS per account
+CAMPAIGN_CONNECT_TIMEOUT = 60     # seconds to wait for the media stream to connect
+CAMPAIGN_CALL_TIMEOUT = 1800      # seconds before a live call releases its slot
+CAMPAIGN_MAX_DEFERRALS = 20       # dials rejected by admission control before a job fails
+
+# Loopback conversations (tester persona against an agent, in process)
+LOOPBACK_MAX_TURNS = 10         # agent replies before a conversation is cut off
+LOOPBACK_TIMEOUT = 120          # wall-clock seconds before a conversation is cut off
+LOOPBACK_MAX_CONCURRENCY = 200  # conversations run at once
+LOOPBACK_TESTER_PROMPT = (
+    "You are testing a phone agent by playing a caller. Stay in character, speak in short "
+    "spoken sentences, and end the call once your goal is met or clearly cannot be."
+)
+
 # API endpoints
 TWILIO_WEBHOOK_URL = os.getenv("TWILIO_WEBHOOK_URL")
\ No newline at end of file
@@ -1,6 +1,8 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 import sys
+import time
+import uuid
 from pathlib import Path
 
 # Add the project root to the Python path
@@ -19,11 +21,19 @@ class Agent:
         prompt (str): The system prompt/instructions for the agent.
         voice_id (str): The voice id for the agent. Defaults to DEFAULT_VOICE_ID.
         api_key (str): OpenAI API key. If not provided, will try to get from config or environment.
+        agent_id (str): Identifier used to select the agent for a call. Generated if not given.
+        version (int): Incremented on every update, so compiled copies of an older version are not reused.
+        context_token_budget (int): Token budget for a call's LLM context. Defaults to CONTEXT_TOKEN_BUDGET.
     """
     name: str
     prompt: str
     voice_id: str = DEFAULT_VOICE_ID
     api_key: Optional[str] = None
+    agent_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    version: int = 1
+    context_token_budget: Optional[int] = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
     
     # Note: We're simplifying the Agent class to avoid OpenAI Assistants API integration
-    # since the CallBot is using a direct chat completion approach
\ No newline at end of file
+    # since the CallBot is using a direct chat completion approach
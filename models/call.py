@@ -0,0 +1,34 @@
+from dataclasses import dataclass, field
+from typing import Optional
+import time
+
+# Call states
+CALL_DIALING = "dialing"
+CALL_STREAMING = "streaming"
+CALL_ENDED = "ended"
+
+@dataclass
+class CallRecord:
+    """
+    A call as seen by every worker process.
+
+    Attributes:
+        call_sid (str): The Twilio call SID.
+        state (str): One of the CALL_* states.
+        owner (str): Worker ("host:pid") running the call's media stream, once it connects.
+        stream_sid (str): The Twilio media stream SID, once it connects.
+        dialed_by (str): Worker that placed the call, if it was dialed by us.
+        to_number (str): The number dialed.
+        record (bool): Recording switched on or off at dial time; None leaves it to sampling.
+        status (str): Final status when the call ended (e.g. "completed", "no-stream").
+    """
+    call_sid: str
+    state: str = CALL_DIALING
+    owner: Optional[str] = None
+    stream_sid: Optional[str] = None
+    dialed_by: Optional[str] = None
+    to_number: Optional[str] = None
+    record: Optional[bool] = None
+    status: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
@@ -0,0 +1,80 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+import time
+import uuid
+
+# Job states
+JOB_PENDING = "pending"
+JOB_DIALING = "dialing"
+JOB_IN_PROGRESS = "in_progress"
+JOB_RETRYING = "retrying"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+FINISHED_STATES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+@dataclass
+class CampaignJob:
+    """
+    A single outbound call in a campaign.
+
+    Attributes:
+        phone_number (str): The number to dial.
+        agent (str): ID or name of the agent to call with; the default agent if not given.
+        scenario (str): Free-form scenario label used when reporting results.
+        status (str): One of the JOB_* states.
+        attempts (int): Number of dial attempts made so far.
+        deferrals (int): Dials held back because the server was saturated (not counted as attempts).
+        call_sid (str): SID of the last successful dial.
+        error (str): Last error seen, if any.
+    """
+    phone_number: str
+    agent: Optional[str] = None
+    scenario: Optional[str] = None
+    status: str = JOB_PENDING
+    attempts: int = 0
+    deferrals: int = 0
+    call_sid: Optional[str] = None
+    error: Optional[str] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+@dataclass
+class Campaign:
+    """
+    A batch of jobs dialed by the CampaignScheduler.
+
+    Attributes:
+        jobs (list): The jobs in submission order.
+        campaign_id (str): Generated identifier.
+        cancelled (bool): Set when the campaign was cancelled; pending jobs are skipped.
+    """
+    jobs: List[CampaignJob]
+    campaign_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    cancelled: bool = False
+
+    @property
+    def done(self) -> bool:
+        return all(job.status in FINISHED_STATES for job in self.jobs)
+
+    def progress(self) -> dict:
+        """Live progress snapshot: counts per state, attempts and dial throughput."""
+        counts = {}
+        for job in self.jobs:
+            counts[job.status] = counts.get(job.status, 0) + 1
+        end = self.finished_at or time.time()
+        elapsed = max(end - self.created_at, 1e-6)
+        dials = sum(job.attempts for job in self.jobs)
+        return {
+            "campaign_id": self.campaign_id,
+            "total": len(self.jobs),
+            "done": self.done,
+            "cancelled": self.cancelled,
+            "counts": counts,
+            "dial_attempts": dials,
+            "elapsed_seconds": round(elapsed, 1),
+            "dials_per_minute": round(dials * 60.0 / elapsed, 2),
+        }
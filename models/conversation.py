@@ -0,0 +1,35 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+@dataclass
+class Conversation:
+    """
+    A finished conversation between an agent and a caller.
+
+    Attributes:
+        messages (list): Chat messages as {"role": ..., "content": ...} dicts, as
+            returned by CallBot.run_pipeline.
+        call_sid (str): The Twilio call the conversation came from, if any.
+        agent (str): Name of the agent that took the call.
+        scenario (str): Free-form scenario label used when reporting results.
+    """
+    messages: List[dict] = field(default_factory=list)
+    call_sid: Optional[str] = None
+    agent: Optional[str] = None
+    scenario: Optional[str] = None
+
+    @property
+    def transcript(self) -> str:
+        """The spoken turns as "role: text" lines; system prompts are left out."""
+        lines = []
+        for message in self.messages:
+            content = message.get("content")
+            if message.get("role") in ("user", "assistant") and isinstance(content, str) and content:
+                lines.append(f"{message['role']}: {content}")
+        return "\n".join(lines)
@@ -0,0 +1,44 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+@dataclass
+class CriterionVerdict:
+    """
+    The judgement for one criterion on one conversation.
+
+    Attributes:
+        criterion (str): The criterion as given to the evaluator.
+        passed (bool): Whether the conversation met it.
+        reason (str): The model's short justification.
+        cached (bool): True when the verdict came from the evaluation cache.
+    """
+    criterion: str
+    passed: bool
+    reason: str = ""
+    cached: bool = False
+
+@dataclass
+class EvaluationResult:
+    """
+    Every criterion verdict for one conversation.
+
+    Attributes:
+        verdicts (list): One CriterionVerdict per criterion, in the order given.
+        call_sid (str): The call the conversation came from, if known.
+        error (str): Set when the conversation could not be evaluated.
+    """
+    verdicts: List[CriterionVerdict] = field(default_factory=list)
+    call_sid: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def passed(self) -> bool:
+        return self.error is None and all(verdict.passed for verdict in self.verdicts)
+
+    def to_dict(self) -> dict:
+        return {
+            "call_sid": self.call_sid,
+            "passed": self.passed,
+            "error": self.error,
+            "verdicts": [vars(verdict) for verdict in self.verdicts],
+        }
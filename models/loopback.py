@@ -0,0 +1,53 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+import uuid
+
+# Why a loopback conversation ended
+ENDED_BY_AGENT = "agent"      # the agent under test called end_call
+ENDED_BY_TESTER = "tester"    # the tester persona called end_call
+ENDED_MAX_TURNS = "max_turns"
+ENDED_TIMEOUT = "timeout"
+
+@dataclass
+class LoopbackScenario:
+    """
+    One simulated conversation between a tester persona and the agent under test.
+
+    Attributes:
+        persona (str): Instructions for the tester: who it is and what it wants from the agent.
+        name (str): Label used when reporting results.
+        agent (str): ID or name of the agent under test; the default agent if not given.
+        opening (str): The tester's first line. If not given, the tester's LLM opens the conversation.
+        max_turns (int): Agent replies after which the conversation is cut off. Defaults to LOOPBACK_MAX_TURNS.
+    """
+    persona: str
+    name: Optional[str] = None
+    agent: Optional[str] = None
+    opening: Optional[str] = None
+    max_turns: Optional[int] = None
+
+@dataclass
+class LoopbackResult:
+    """
+    The outcome of one loopback conversation.
+
+    Attributes:
+        scenario (LoopbackScenario): The scenario that was run.
+        call_sid (str): Generated identifier, in place of a Twilio call SID.
+        messages (list): The agent's side of the conversation (its LLM context).
+        said (list): What the tester said, in order; the script the agent's transcript is scored against.
+        timeline (list): The agent's speech timeline, as recorded by a CallTrace.
+        duration (float): Wall-clock seconds the conversation took.
+        turns (int): Agent replies.
+        ended_by (str): One of the ENDED_* reasons.
+        error (str): Set if the conversation failed to run.
+    """
+    scenario: LoopbackScenario
+    call_sid: str = field(default_factory=lambda: f"LB{uuid.uuid4().hex[:32]}")
+    messages: List[dict] = field(default_factory=list)
+    said: List[str] = field(default_factory=list)
+    timeline: list = field(default_factory=list)
+    duration: float = 0.0
+    turns: int = 0
+    ended_by: Optional[str] = None
+    error: Optional[str] = None
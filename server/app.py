@@ -1,10 +1,19 @@
 # server/app.py
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+import time
+# cold start is timed from here, before the heavy imports below (see /startup)
+import_started = time.perf_counter()
+
+import asyncio
+import random
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Query
 from fastapi import Request
+from fastapi.responses import FileResponse
 import sys
 from pathlib import Path
 import os
+from typing import List, Optional
 from dotenv import load_dotenv
+from pydantic import BaseModel
 
 # load environment variables from .env early
 load_dotenv()
@@ -14,14 +23,31 @@ root_dir = Path(__file__).parent
 sys.path.append(str(root_dir.parent))
 
 from services.bot import CallBot
+from services.campaign import CampaignScheduler
+from services.admission import AdmissionRejected
+from services.evaluator import ConversationEvaluator
+from services.loopback import LoopbackRunner, loopback_activity
+from services.runtime_metrics import RuntimeMetrics
+from services.startup import StartupTimings
+from services.call_metrics import CallActivity, compute_call_metrics, summarize_call_metrics, needs_review
 from models.agent import Agent
-from config import TWILIO_ACCOUNT_SID, OPENAI_API_KEY, TWILIO_AUTH_TOKEN, TWILIO_WEBHOOK_URL, YOUR_TWILIO_NUMBER
+from models.campaign import CampaignJob
+from models.loopback import LoopbackScenario
+from models.conversation import Conversation
+from config import TWILIO_ACCOUNT_SID, OPENAI_API_KEY, TWILIO_AUTH_TOKEN, TWILIO_WEBHOOK_URL, YOUR_TWILIO_NUMBER, TRANSCRIPT_PAGE_SIZE, SERVER_WORKERS, DEFAULT_VOICE_ID
+from config import STARTUP_WARMUP
+from config import EVALUATION_JUDGE_FRACTION, QUALITY_REVIEW_LATENCY_MS, QUALITY_REVIEW_WER
+
+# durations of this worker's cold start, served by /startup.
+startup_timings = StartupTimings(import_started)
+startup_timings.mark("imports")
 
 # create an instance of FastAPI
 app = FastAPI()
 
-# instantiate your agent.
+# instantiate your default agent, used when a call does not pick one.
 agent = Agent(
+    agent_id="default",
     name="ai agent",
     prompt="you are a helpful ai assistant. answer questions to the best of your ability.",
     api_key=OPENAI_API_KEY
@@ -36,6 +62,99 @@ bot = CallBot(
     webhook_url=TWILIO_WEBHOOK_URL
 )
 
+# dials campaign jobs with bounded concurrency and a calls-per-second limit.
+scheduler = CampaignScheduler(bot)
+
+# runtime figures for /metrics, read from the bot's own state when scraped.
+metrics = RuntimeMetrics(bot)
+
+startup_timings.mark("app")
+
+class AgentRequest(BaseModel):
+    name: str
+    prompt: str
+    voice_id: str = DEFAULT_VOICE_ID
+    context_token_budget: Optional[int] = None
+
+class AgentUpdateRequest(BaseModel):
+    name: Optional[str] = None
+    prompt: Optional[str] = None
+    voice_id: Optional[str] = None
+    context_token_budget: Optional[int] = None
+
+class CallRequest(BaseModel):
+    phone_number: str
+    agent_id: Optional[str] = None
+    name: Optional[str] = None
+    prompt: Optional[str] = None
+    voice_id: Optional[str] = None
+    record: Optional[bool] = None
+
+class CampaignJobRequest(BaseModel):
+    phone_number: str
+    agent: Optional[str] = None
+    scenario: Optional[str] = None
+
+class CampaignRequest(BaseModel):
+    jobs: List[CampaignJobRequest]
+
+class ConversationRequest(BaseModel):
+    messages: List[dict]
+    call_sid: Optional[str] = None
+    expected: Optional[List[str]] = None
+
+class LoopbackScenarioRequest(BaseModel):
+    persona: str
+    name: Optional[str] = None
+    agent: Optional[str] = None
+    opening: Optional[str] = None
+    max_turns: Optional[int] = None
+
+class LoopbackRequest(BaseModel):
+    scenarios: List[LoopbackScenarioRequest]
+    text_only: bool = True
+
+class EvaluationRequest(BaseModel):
+    conversations: List[ConversationRequest]
+    criteria: List[str]
+    judge_fraction: float = EVALUATION_JUDGE_FRACTION
+
+# scores transcripts with an llm judge; created on first use.
+evaluator: Optional[ConversationEvaluator] = None
+
+@app.on_event("startup")
+async def reap_calls():
+    """
+    end registry entries left behind by workers that exited mid-call.
+    """
+    await bot.registry.reap()
+
+@app.on_event("startup")
+async def register_default_agent():
+    """
+    store the default agent in the agent registry so it can be listed and updated.
+    """
+    await bot.agents.ensure(agent)
+
+@app.on_event("startup")
+async def start_admission_control():
+    """
+    start sampling event loop lag, so admission decisions have data before the first dial.
+    """
+    bot.admission.start()
+
+@app.on_event("startup")
+async def start_warmup():
+    """
+    registered last: the port opens once this returns. the selected providers
+    are imported and the vad model loaded in the background from here on, so
+    the first call does not pay for them; with STARTUP_WARMUP off they load
+    on the first call instead.
+    """
+    startup_timings.serving()
+    if STARTUP_WARMUP:
+        app.state.warmup = asyncio.create_task(startup_timings.warm_up(bot.providers))
+
 @app.websocket("/ws/stream")
 async def websocket_endpoint(websocket: WebSocket):
     """
@@ -49,17 +168,361 @@ async def websocket_endpoint(websocket: WebSocket):
     except Exception as e:
         print(f"error in websocket endpoint: {e}")
 
+def agent_response(registered: Agent) -> dict:
+    """
+    an agent as returned by the api, without its api key.
+    """
+    return {key: value for key, value in vars(registered).items() if key != "api_key"}
+
+@app.post("/agents")
+async def create_agent(request: AgentRequest):
+    """
+    register an agent that calls can be placed with.
+    """
+    created = await bot.agents.create(Agent(
+        name=request.name, prompt=request.prompt, voice_id=request.voice_id,
+        context_token_budget=request.context_token_budget
+    ))
+    return agent_response(created)
+
+@app.get("/agents")
+async def list_agents():
+    """
+    every registered agent.
+    """
+    return [agent_response(registered) for registered in await bot.agents.list()]
+
+@app.get("/agents/{agent_id}")
+async def get_agent(agent_id: str):
+    """
+    one agent, by id or name.
+    """
+    found = await bot.agents.find(agent_id)
+    if found is None:
+        raise HTTPException(status_code=404, detail="agent not found")
+    return agent_response(found)
+
+@app.put("/agents/{agent_id}")
+async def update_agent(agent_id: str, request: AgentUpdateRequest):
+    """
+    change an agent's name, prompt, voice or context token budget. calls dialed afterwards use the
+    new version on every worker; live calls keep the version they started with.
+    """
+    updated = await bot.agents.update(
+        agent_id, request.name, request.prompt, request.voice_id, request.context_token_budget
+    )
+    if updated is None:
+        raise HTTPException(status_code=404, detail="agent not found")
+    return agent_response(updated)
+
 @app.post("/call")
-async def start_call(phone_number: str):
+async def start_call(request: CallRequest):
     """
-    initiate an outbound call using callbot.
+    initiate an outbound call using callbot. the agent is picked by agent_id,
+    or by name (404 if unknown, unless a prompt is given to create it from);
+    without either the default agent is used. a dial never changes a registered
+    agent: a prompt or voice_id that differs from the named agent's is
+    rejected with 409 (use PUT /agents/{agent_id} to change it).
+    record=true/false overrides sampling for this call's audio recording.
+    returns 503 with retry-after when the server stays saturated.
     """
-    call_sid = await bot.make_call(phone_number)
+    agent_id = request.agent_id
+    if agent_id is not None:
+        if await bot.agents.find(agent_id) is None:
+            raise HTTPException(status_code=404, detail="agent not found")
+    elif request.name:
+        named = await bot.agents.find(request.name)
+        if named is None:
+            if not request.prompt:
+                raise HTTPException(status_code=404, detail="agent not found")
+            named = await bot.agents.create(Agent(
+                name=request.name, prompt=request.prompt, voice_id=request.voice_id or DEFAULT_VOICE_ID
+            ))
+        elif (request.prompt and named.prompt != request.prompt) or (
+                request.voice_id and named.voice_id != request.voice_id):
+            raise HTTPException(
+                status_code=409,
+                detail=f"agent '{request.name}' exists with a different prompt or voice; update it first",
+            )
+        agent_id = named.agent_id
+    try:
+        call_sid = await bot.make_call(request.phone_number, record=request.record, agent_id=agent_id)
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(int(e.retry_after))})
     if call_sid:
         return {"call_sid": call_sid}
     else:
         return {"error": "failed to initiate call"}
 
+@app.post("/campaigns")
+async def create_campaign(request: CampaignRequest):
+    """
+    submit a batch of calls to be dialed by the campaign scheduler.
+    """
+    if not request.jobs:
+        raise HTTPException(status_code=400, detail="campaign has no jobs")
+    for name in {job.agent for job in request.jobs if job.agent}:
+        if await bot.agents.find(name) is None:
+            raise HTTPException(status_code=400, detail=f"unknown agent: {name}")
+    jobs = [
+        CampaignJob(phone_number=job.phone_number, agent=job.agent, scenario=job.scenario)
+        for job in request.jobs
+    ]
+    campaign = scheduler.submit(jobs)
+    return campaign.progress()
+
+@app.get("/campaigns")
+async def list_campaigns():
+    """
+    progress of every campaign submitted to this server.
+    """
+    return [campaign.progress() for campaign in scheduler.campaigns.values()]
+
+@app.get("/campaigns/{campaign_id}")
+async def get_campaign(campaign_id: str):
+    """
+    live progress and per-job status of a campaign.
+    """
+    campaign = scheduler.get(campaign_id)
+    if campaign is None:
+        raise HTTPException(status_code=404, detail="campaign not found")
+    progress = campaign.progress()
+    progress["jobs"] = [vars(job) for job in campaign.jobs]
+    return progress
+
+@app.post("/campaigns/{campaign_id}/cancel")
+async def cancel_campaign(campaign_id: str):
+    """
+    stop dialing the remaining jobs of a campaign.
+    """
+    if not scheduler.cancel(campaign_id):
+        raise HTTPException(status_code=404, detail="campaign not found")
+    return scheduler.get(campaign_id).progress()
+
+@app.get("/latency")
+async def latency_summary():
+    """
+    per-stage latency percentiles (ms) across the most recent calls.
+    """
+    return bot.latency_tracker.summary()
+
+@app.get("/calls/{call_sid}/latency")
+async def call_latency(call_sid: str):
+    """
+    per-stage latency percentiles (ms) for a single call.
+    """
+    summary = bot.latency_tracker.call_summary(call_sid)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="no latency trace for this call")
+    return summary
+
+@app.post("/evaluations")
+async def evaluate_conversations(request: EvaluationRequest):
+    """
+    compute local quality metrics for every conversation (using the call's
+    speech timeline when this worker still has it), then score against every
+    criterion with the llm judge only the conversations the metrics flag plus
+    a random judge_fraction of the rest. verdicts are cached, so re-running a
+    suite only evaluates new transcripts and changed criteria.
+    """
+    global evaluator
+    activities = []
+    for c in request.conversations:
+        trace = bot.latency_tracker.get(c.call_sid) if c.call_sid else None
+        activities.append(CallActivity(
+            c.call_sid, c.messages, list(trace.timeline) if trace else [],
+            trace.elapsed() if trace else None, c.expected,
+        ))
+    quality = compute_call_metrics(activities)
+    judged = [
+        index for index, metrics in enumerate(quality)
+        if needs_review(metrics, QUALITY_REVIEW_LATENCY_MS, QUALITY_REVIEW_WER)
+        or random.random() < request.judge_fraction
+    ]
+    results = []
+    if judged:
+        if evaluator is None:
+            evaluator = ConversationEvaluator()
+        conversations = [
+            Conversation(messages=request.conversations[i].messages, call_sid=request.conversations[i].call_sid)
+            for i in judged
+        ]
+        results = await evaluator.evaluate_many(conversations, request.criteria)
+        for result in results:
+            if result.call_sid and result.error is None:
+                bot.transcripts.set_evaluation(result.call_sid, result.passed)
+    verdicts = dict(zip(judged, results))
+    return {
+        "results": [
+            {
+                "call_sid": metrics["call_sid"], "judged": i in verdicts, "quality": metrics,
+                **(verdicts[i].to_dict() if i in verdicts else {}),
+            }
+            for i, metrics in enumerate(quality)
+        ],
+        "quality": summarize_call_metrics(quality),
+        "stats": evaluator.stats if evaluator else None,
+    }
+
+@app.post("/loopback")
+async def run_loopback(request: LoopbackRequest):
+    """
+    run each scenario as an in-process conversation between a tester persona
+    and the agent under test, without a phone call. conversations run in
+    parallel and, with text_only, skip stt and tts. returns each transcript
+    with its quality metrics, ready to pass to /evaluations.
+    """
+    if not request.scenarios:
+        raise HTTPException(status_code=400, detail="no scenarios")
+    for name in {s.agent for s in request.scenarios if s.agent}:
+        if await bot.agents.find(name) is None:
+            raise HTTPException(status_code=400, detail=f"unknown agent: {name}")
+    scenarios = [LoopbackScenario(**s.model_dump()) for s in request.scenarios]
+    results = await LoopbackRunner(bot, text_only=request.text_only).run(scenarios)
+    quality = compute_call_metrics([loopback_activity(r, not request.text_only) for r in results])
+    return {
+        "results": [
+            {
+                "call_sid": r.call_sid, "name": r.scenario.name, "agent": r.scenario.agent,
+                "ended_by": r.ended_by, "turns": r.turns, "duration_s": round(r.duration, 3),
+                "error": r.error, "messages": r.messages, "expected": r.said, "quality": metrics,
+            }
+            for r, metrics in zip(results, quality)
+        ],
+        "quality": summarize_call_metrics(quality),
+    }
+
+@app.get("/calls/{call_sid}/quality")
+async def call_quality(call_sid: str):
+    """
+    the call's quality metrics, computed locally when it ended: response
+    latencies, barge-ins, talk/listen ratio, silence gaps and missed end_call.
+    """
+    call = await asyncio.to_thread(bot.transcripts.get_call, call_sid)
+    if call is None or call.get("quality") is None:
+        raise HTTPException(status_code=404, detail="no quality metrics for this call")
+    return call["quality"]
+
+@app.get("/quality")
+async def quality_summary(agent: Optional[str] = None, since: Optional[float] = None,
+                          until: Optional[float] = None, limit: int = Query(1000, ge=1, le=10000)):
+    """
+    quality metrics summed and summarized over the most recent calls, optionally
+    for one agent or time range.
+    """
+    page = await asyncio.to_thread(bot.transcripts.list_calls, agent, None, since, until, limit)
+    metrics = [call["quality"] for call in page["calls"] if call.get("quality") is not None]
+    return summarize_call_metrics(metrics)
+
+@app.get("/calls")
+async def list_calls(agent: Optional[str] = None, evaluation: Optional[str] = None,
+                     since: Optional[float] = None, until: Optional[float] = None,
+                     limit: int = Query(TRANSCRIPT_PAGE_SIZE, ge=1, le=1000), cursor: Optional[str] = None):
+    """
+    recorded calls, newest first. filter by agent, evaluation outcome
+    ("passed"/"failed") and start time; pass next_cursor back for the next page.
+    """
+    return await asyncio.to_thread(
+        bot.transcripts.list_calls, agent, evaluation, since, until, limit, cursor
+    )
+
+@app.get("/calls/active")
+async def active_calls():
+    """
+    live calls across every worker process, with the worker that owns each media stream.
+    """
+    return {"calls": [vars(record) for record in await bot.registry.active()]}
+
+@app.post("/calls/{call_sid}/hangup")
+async def hangup_call(call_sid: str):
+    """
+    hang up a call. works from any worker: twilio closes the media stream on
+    whichever worker owns it.
+    """
+    if await bot.registry.get(call_sid) is None:
+        raise HTTPException(status_code=404, detail="unknown call")
+    if not await bot.hangup(call_sid):
+        raise HTTPException(status_code=502, detail="twilio hangup failed")
+    return {"call_sid": call_sid, "hangup": True}
+
+@app.get("/calls/{call_sid}/recording")
+async def call_recording(call_sid: str):
+    """
+    the call's stereo wav recording (left: caller, right: agent), if it was recorded.
+    """
+    path = bot.recorder.recording_path(call_sid)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="no recording for this call")
+    return FileResponse(path, media_type="audio/wav")
+
+@app.get("/calls/{call_sid}/transcript")
+async def call_transcript(call_sid: str, limit: int = Query(TRANSCRIPT_PAGE_SIZE, ge=1, le=1000),
+                          cursor: Optional[str] = None):
+    """
+    one call's turns, oldest first, a page at a time.
+    """
+    return await asyncio.to_thread(bot.transcripts.list_turns, call_sid, limit=limit, cursor=cursor)
+
+@app.get("/turns")
+async def list_turns(agent: Optional[str] = None, role: Optional[str] = None,
+                     evaluation: Optional[str] = None, since: Optional[float] = None,
+                     until: Optional[float] = None, limit: int = Query(TRANSCRIPT_PAGE_SIZE, ge=1, le=1000),
+                     cursor: Optional[str] = None):
+    """
+    turns across all calls, newest first, filtered by agent, role, the call's
+    evaluation outcome and time.
+    """
+    return await asyncio.to_thread(
+        bot.transcripts.list_turns, None, agent, role, evaluation, since, until, limit, cursor
+    )
+
+@app.get("/capacity")
+async def capacity():
+    """
+    how close this worker is to its limits: live and reserved sessions against
+    the session cap, recent event loop lag against its limit, whether new dials
+    are being held back (and why), and dials admitted, deferred, rejected or shed.
+    """
+    return bot.admission.gauges()
+
+@app.get("/metrics")
+async def runtime_metrics():
+    """
+    this worker's health: active calls and running pipelines, asyncio task
+    count, frames queued in pipeline processors, event loop lag, per-provider
+    latency and error rates over recent calls, cpu time and process memory.
+    """
+    return metrics.snapshot()
+
+@app.get("/startup")
+async def startup_stats():
+    """
+    how long this worker's cold start took: interpreter startup, app imports,
+    building the app, startup hooks (until the port opened), and the
+    background warmup with each provider's import and warmup time.
+    """
+    return {**startup_timings.summary(), "providers": bot.providers.stats()}
+
+@app.get("/llm/speculation")
+async def speculation_stats():
+    """
+    speculative generation counters: drafts started on interim transcripts,
+    turns answered from a draft (hits) or not, and draft tokens reused or wasted.
+    """
+    stats = dict(bot.speculation_stats)
+    judged = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / judged, 3) if judged else None
+    return stats
+
+@app.get("/tts/cache")
+async def tts_cache_stats():
+    """
+    hit/miss counters and tier sizes for the tts phrase cache.
+    """
+    from services.tts_cache import get_tts_cache  # imports the cartesia sdk; only on request
+    return get_tts_cache().stats()
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8080)
\ No newline at end of file
+    # calls are tracked in a shared registry, so the app can run on several workers
+    uvicorn.run("server.app:app", host="0.0.0.0", port=8080, workers=SERVER_WORKERS)
\ No newline at end of file
@@ -0,0 +1,176 @@
+import asyncio
+import itertools
+import time
+from typing import Dict, Optional
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from config import (
+    ADMISSION_MAX_SESSIONS, ADMISSION_MAX_LOOP_LAG_MS, ADMISSION_LAG_SAMPLES,
+    ADMISSION_DEFER_TIMEOUT, ADMISSION_RESERVATION_TTL, ADMISSION_RETRY_AFTER
+)
+from services.loop_lag import LoopLagMonitor
+from services.stats import percentile
+
+# Why a dial or stream was turned away.
+REASON_SESSIONS = "sessions"
+REASON_LOOP_LAG = "loop_lag"
+
+class AdmissionRejected(Exception):
+    """A dial was refused because the worker is saturated."""
+
+    def __init__(self, reason: str, retry_after: float = ADMISSION_RETRY_AFTER):
+        super().__init__(f"server saturated ({reason})")
+        self.reason = reason
+        self.retry_after = retry_after
+
+class AdmissionController:
+    """
+    Decides whether this worker takes on another call.
+
+    A call holds a slot from the moment it is dialed: the dial reserves
+    one, and the reservation turns into a session when the call's media
+    stream connects (or expires after `reservation_ttl` if it never does;
+    the TTL outlasts Twilio's ring timeout plus the TwiML lead-in, so a
+    call answered late still finds its slot).
+    New dials are admitted while sessions plus reservations stay under
+    `max_sessions` and recent event loop lag stays under `max_loop_lag_ms`;
+    otherwise they wait up to `defer_timeout` for capacity and are then
+    rejected. Lag only holds back new dials, since by the time a stream
+    connects the callee has already answered. Streams are only shed on the
+    session limit, and only for calls nobody dialed: a call dialed by a
+    sibling worker was admitted there, so its stream is taken even when
+    this worker is full.
+
+    Attributes:
+        max_sessions (int): Calls this worker carries at once; 0 for no limit. Defaults to ADMISSION_MAX_SESSIONS.
+        max_loop_lag_ms (float): Recent loop lag (p90) above which dials are held back. Defaults to ADMISSION_MAX_LOOP_LAG_MS.
+        monitor (LoopLagMonitor): Source of the lag samples; started on first use.
+        stats (dict): Dials admitted, deferred and rejected, and streams shed.
+    """
+
+    def __init__(self, max_sessions: int = ADMISSION_MAX_SESSIONS,
+                 max_loop_lag_ms: float = ADMISSION_MAX_LOOP_LAG_MS,
+                 defer_timeout: float = ADMISSION_DEFER_TIMEOUT,
+                 reservation_ttl: float = ADMISSION_RESERVATION_TTL,
+                 lag_samples: int = ADMISSION_LAG_SAMPLES,
+                 monitor: Optional[LoopLagMonitor] = None):
+        self.max_sessions = max_sessions
+        self.max_loop_lag_ms = max_loop_lag_ms
+        self.defer_timeout = defer_timeout
+        self.reservation_ttl = reservation_ttl
+        self.lag_samples = lag_samples
+        self.monitor = monitor or LoopLagMonitor()
+        self.sessions = set()  # call SIDs with a live media stream on this worker
+        self._reservations: Dict[str, float] = {}  # call SID -> expiry, for dialed calls not yet streaming
+        self._capacity = asyncio.Condition()
+        self._tickets = itertools.count()
+        self.stats = {"admitted": 0, "deferred": 0, "rejected": 0, "shed": 0}
+
+    def start(self):
+        self.monitor.start()
+
+    def loop_lag(self) -> float:
+        """p90 of the most recent lag samples, in ms."""
+        recent = list(self.monitor.samples)[-self.lag_samples:]
+        return percentile(sorted(recent), 90)
+
+    def reserved(self) -> int:
+        now = time.monotonic()
+        for call_sid in [sid for sid, expiry in self._reservations.items() if expiry <= now]:
+            del self._reservations[call_sid]
+        return len(self._reservations)
+
+    def _full(self) -> bool:
+        return self.max_sessions > 0 and len(self.sessions) + self.reserved() >= self.max_sessions
+
+    def saturation(self) -> Optional[str]:
+        """Why a new dial would be held back right now, or None if there is room."""
+        if self._full():
+            return REASON_SESSIONS
+        if self.loop_lag() > self.max_loop_lag_ms:
+            return REASON_LOOP_LAG
+        return None
+
+    async def admit_dial(self) -> str:
+        """
+        Wait for room for one more call and reserve it. Returns a ticket to
+        pass to `assign` once the call has a SID (or to `release`). Raises
+        AdmissionRejected if there is still no room after defer_timeout.
+        """
+        self.start()
+        reason = self.saturation()
+        if reason is None:
+            return self._admit()
+        self.stats["deferred"] += 1
+        deadline = time.monotonic() + self.defer_timeout
+        while reason is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.stats["rejected"] += 1
+                raise AdmissionRejected(reason)
+            # Woken early when a session ends; lag is re-checked every sample interval.
+            async with self._capacity:
+                try:
+                    await asyncio.wait_for(
+                        self._capacity.wait(), timeout=min(remaining, self.monitor.interval)
+                    )
+                except asyncio.TimeoutError:
+                    pass
+            reason = self.saturation()
+        return self._admit()
+
+    def _admit(self) -> str:
+        self.stats["admitted"] += 1
+        # Reserve before the dial goes out, so concurrent dials see the slot taken.
+        ticket = f"dial-{next(self._tickets)}"
+        self._reservations[ticket] = time.monotonic() + self.reservation_ttl
+        return ticket
+
+    def assign(self, ticket: str, call_sid: str):
+        """Hold the ticket's slot for the dialed call until its stream connects."""
+        self._reservations.pop(ticket, None)
+        self._reservations[call_sid] = time.monotonic() + self.reservation_ttl
+
+    async def release(self, call_sid: str):
+        """Give back a ticket's or dialed call's slot (the dial failed or never streamed)."""
+        if self._reservations.pop(call_sid, None) is not None:
+            await self._notify()
+
+    def open_session(self, call_sid: str, dialed: bool = False) -> bool:
+        """
+        Admit a connected media stream. `dialed` says another worker dialed
+        the call (and so admitted it). False means the stream should be shed.
+        """
+        if self._reservations.pop(call_sid, None) is None and not dialed and self._full():
+            self.stats["shed"] += 1
+            return False
+        self.sessions.add(call_sid)
+        return True
+
+    async def close_session(self, call_sid: str):
+        if call_sid in self.sessions:
+            self.sessions.discard(call_sid)
+            await self._notify()
+
+    async def _notify(self):
+        async with self._capacity:
+            self._capacity.notify_all()
+
+    def gauges(self) -> dict:
+        sessions = len(self.sessions)
+        reserved = self.reserved()
+        return {
+            "active_sessions": sessions,
+            "reserved_dials": reserved,
+            "max_sessions": self.max_sessions,
+            "utilization": round((sessions + reserved) / self.max_sessions, 3) if self.max_sessions else None,
+            "loop_lag_ms": round(self.loop_lag(), 2),
+            "max_loop_lag_ms": self.max_loop_lag_ms,
+            "saturated": self.saturation(),
+            **self.stats,
+        }
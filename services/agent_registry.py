@@ -0,0 +1,177 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from config import AGENT_REGISTRY_PATH, AGENT_COMPILED_CACHE_SIZE, CONTEXT_TOKEN_BUDGET
+from models.agent import Agent
+
+# Instructions every agent gets after its own prompt.
+CALL_INSTRUCTIONS = [
+    "You are connected to an AI voice assistant.",
+    "Please end the call if the user says goodbye.",
+]
+
+# Tools every agent can call.
+CALL_TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "end_call",
+            "description": "Ends the call when invoked."
+        }
+    }
+]
+
+@dataclass(frozen=True)
+class CompiledAgent:
+    """
+    The per-call setup of one agent version, built once and shared by its calls.
+
+    Attributes:
+        agent (Agent): The agent this was compiled from.
+        messages (tuple): System messages that open every call's context.
+        tools (list): Tool schema passed to the LLM.
+        tts_options (dict): Keyword arguments for the agent's TTS service.
+        context_budget (int): Token budget for the call's LLM context.
+    """
+    agent: Agent
+    messages: Tuple[dict, ...]
+    tools: List[dict]
+    tts_options: dict
+    context_budget: int
+
+    def initial_messages(self) -> List[dict]:
+        """A fresh message list for one call. The context appends to it, so it is never shared."""
+        return list(self.messages)
+
+def compile_agent(agent: Agent) -> CompiledAgent:
+    messages = tuple(
+        {"role": "system", "content": content} for content in [agent.prompt, *CALL_INSTRUCTIONS]
+    )
+    return CompiledAgent(
+        agent=agent,
+        messages=messages,
+        tools=CALL_TOOLS,
+        tts_options={"voice_id": agent.voice_id},
+        context_budget=agent.context_token_budget or CONTEXT_TOKEN_BUDGET,
+    )
+
+class AgentRegistry:
+    """
+    Agents that calls can be placed with, in a SQLite file shared by every worker.
+
+    Calls select an agent by ID (or by name, for campaign jobs). Each agent
+    version is compiled once per worker and kept in a small LRU, so building
+    a call's session only copies the compiled message list. Updating an
+    agent bumps its version; calls dialed after that get the new setup on
+    every worker.
+
+    Attributes:
+        path (str): The SQLite database file. Defaults to AGENT_REGISTRY_PATH.
+        cache_size (int): Compiled agent versions kept per worker. Defaults to AGENT_COMPILED_CACHE_SIZE.
+    """
+
+    COLUMNS = [
+        "agent_id", "name", "prompt", "voice_id", "version", "created_at", "updated_at", "context_token_budget"
+    ]
+
+    def __init__(self, path: str = AGENT_REGISTRY_PATH, cache_size: int = AGENT_COMPILED_CACHE_SIZE):
+        self.path = path
+        self.cache_size = cache_size
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS agents ("
+            "agent_id TEXT PRIMARY KEY, name TEXT NOT NULL, prompt TEXT NOT NULL, voice_id TEXT NOT NULL, "
+            "version INTEGER NOT NULL, created_at REAL NOT NULL, updated_at REAL NOT NULL, "
+            "context_token_budget INTEGER)"
+        )
+        # Registries created before context budgets were added lack the column.
+        existing = {row[1] for row in self._db.execute("PRAGMA table_info(agents)")}
+        if "context_token_budget" not in existing:
+            self._db.execute("ALTER TABLE agents ADD COLUMN context_token_budget INTEGER")
+        self._db.execute("CREATE INDEX IF NOT EXISTS agents_by_name ON agents (name, updated_at)")
+        self._compiled: "OrderedDict[Tuple[str, int], CompiledAgent]" = OrderedDict()
+        self.stats = {"compiled": 0, "reused": 0}
+
+    def _execute(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    async def _run(self, sql: str, params: tuple = ()) -> List[tuple]:
+        return await asyncio.to_thread(self._execute, sql, params)
+
+    def _agent(self, row: tuple) -> Agent:
+        return Agent(**dict(zip(self.COLUMNS, row)))
+
+    async def create(self, agent: Agent) -> Agent:
+        await self._run(
+            f"INSERT INTO agents ({', '.join(self.COLUMNS)}) VALUES ({', '.join('?' * len(self.COLUMNS))})",
+            tuple(getattr(agent, column) for column in self.COLUMNS),
+        )
+        return agent
+
+    async def ensure(self, agent: Agent) -> Agent:
+        """Register `agent` unless an agent with its ID exists; returns the stored agent."""
+        await self._run(
+            f"INSERT OR IGNORE INTO agents ({', '.join(self.COLUMNS)}) VALUES ({', '.join('?' * len(self.COLUMNS))})",
+            tuple(getattr(agent, column) for column in self.COLUMNS),
+        )
+        return await self.get(agent.agent_id)
+
+    async def update(self, agent_id: str, name: Optional[str] = None, prompt: Optional[str] = None,
+                     voice_id: Optional[str] = None, context_token_budget: Optional[int] = None) -> Optional[Agent]:
+        """Change the given fields and bump the version. Returns None for an unknown agent."""
+        changes = {"name": name, "prompt": prompt, "voice_id": voice_id, "context_token_budget": context_token_budget}
+        changes = {column: value for column, value in changes.items() if value is not None}
+        assignments = "".join(f"{column} = ?, " for column in changes)
+        await self._run(
+            f"UPDATE agents SET {assignments}version = version + 1, updated_at = ? WHERE agent_id = ?",
+            (*changes.values(), time.time(), agent_id),
+        )
+        return await self.get(agent_id)
+
+    async def get(self, agent_id: str) -> Optional[Agent]:
+        rows = await self._run(f"SELECT {', '.join(self.COLUMNS)} FROM agents WHERE agent_id = ?", (agent_id,))
+        return self._agent(rows[0]) if rows else None
+
+    async def find(self, key: str) -> Optional[Agent]:
+        """Look an agent up by ID, falling back to the most recently updated agent with that name."""
+        agent = await self.get(key)
+        if agent is None:
+            rows = await self._run(
+                f"SELECT {', '.join(self.COLUMNS)} FROM agents WHERE name = ? ORDER BY updated_at DESC LIMIT 1",
+                (key,),
+            )
+            agent = self._agent(rows[0]) if rows else None
+        return agent
+
+    async def list(self) -> List[Agent]:
+        rows = await self._run(f"SELECT {', '.join(self.COLUMNS)} FROM agents ORDER BY created_at")
+        return [self._agent(row) for row in rows]
+
+    def compile(self, agent: Agent) -> CompiledAgent:
+        """The compiled setup for this version of the agent, built on first use."""
+        key = (agent.agent_id, agent.version)
+        compiled = self._compiled.get(key)
+        if compiled is not None:
+            self._compiled.move_to_end(key)
+            self.stats["reused"] += 1
+            return compiled
+        compiled = self._compiled[key] = compile_agent(agent)
+        self.stats["compiled"] += 1
+        while len(self._compiled) > self.cache_size:
+            self._compiled.popitem(last=False)
+        return compiled
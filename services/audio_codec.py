@@ -0,0 +1,221 @@
+import audioop
+import base64
+import json
+from typing import Dict, Optional
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to the Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from config import SAMPLE_RATE
+
+from pipecat.frames.frames import AudioRawFrame, Frame, InputAudioRawFrame, StartInterruptionFrame
+from pipecat.serializers.twilio import TwilioFrameSerializer
+
+TWILIO_RATE = 8000  # Twilio media streams are 8 kHz mu-law
+
+# G.711 mu-law constants (as in audioop and the ITU reference code).
+ULAW_BIAS = 0x84
+ULAW_CLIP = 8159
+ULAW_SEGMENT_ENDS = np.array([0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF])
+
+# Big-endian uint16 read at every byte offset: previous << 8 | current.
+PAIR_DTYPE = np.dtype(">u2")
+
+def _ulaw_decode_table() -> np.ndarray:
+    """int16 sample for each of the 256 mu-law bytes."""
+    u = ~np.arange(256) & 0xFF
+    magnitude = (((u & 0x0F) << 3) + ULAW_BIAS) << ((u >> 4) & 0x07)
+    return np.where(u & 0x80, ULAW_BIAS - magnitude, magnitude - ULAW_BIAS).astype(np.int16)
+
+def _ulaw_encode_table() -> np.ndarray:
+    """mu-law byte for each int16 sample, indexed by sample + 32768."""
+    pcm = np.arange(-32768, 32768) >> 2
+    mask = np.where(pcm < 0, 0x7F, 0xFF)
+    pcm = np.minimum(np.abs(pcm), ULAW_CLIP) + (ULAW_BIAS >> 2)
+    segment = np.searchsorted(ULAW_SEGMENT_ENDS, pcm)
+    value = np.where(
+        segment >= 8, 0x7F, (np.minimum(segment, 7) << 4) | ((pcm >> (np.minimum(segment, 7) + 1)) & 0x0F)
+    )
+    return (value ^ mask).astype(np.uint8)
+
+ULAW_DECODE = _ulaw_decode_table()
+ULAW_ENCODE = _ulaw_encode_table()
+
+def ulaw_decode(data: bytes) -> np.ndarray:
+    return ULAW_DECODE[np.frombuffer(data, dtype=np.uint8)]
+
+def ulaw_encode(samples: np.ndarray) -> bytes:
+    return ULAW_ENCODE[samples.astype(np.int32) + 32768].tobytes()
+
+_upsample_tables: Dict[int, np.ndarray] = {}
+_downsample_tables: Dict[int, np.ndarray] = {}
+
+def upsample_table(factor: int) -> np.ndarray:
+    """
+    For every pair of consecutive mu-law bytes (previous << 8 | current), the
+    `factor` native-endian int16 samples that linearly interpolate from the previous sample
+    to the current one. Decoding and upsampling are then one lookup.
+    """
+    table = _upsample_tables.get(factor)
+    if table is None:
+        pairs = np.arange(65536)
+        previous = ULAW_DECODE[pairs >> 8].astype(np.int32)
+        current = ULAW_DECODE[pairs & 0xFF].astype(np.int32)
+        steps = np.arange(1, factor + 1)
+        table = previous[:, None] + (current - previous)[:, None] * steps // factor
+        # One element of 2 * factor bytes per pair, so a lookup is a single 1-D take.
+        table = np.ascontiguousarray(table.astype(np.int16)).view(f"V{2 * factor}").ravel()
+        _upsample_tables[factor] = table
+    return table
+
+def downsample_table(factor: int) -> np.ndarray:
+    """
+    mu-law byte for the average of `factor` samples, indexed by their sum.
+    Negative sums index from the end, as negative numpy indices do.
+    """
+    table = _downsample_tables.get(factor)
+    if table is None:
+        size = 65536 * factor
+        sums = np.arange(size)
+        sums = np.where(sums >= size // 2, sums - size, sums)
+        # Round toward zero like integer division in C, and keep within int16.
+        average = np.clip(np.fix(sums / factor), -32768, 32767).astype(np.int32)
+        table = _downsample_tables[factor] = ULAW_ENCODE[average + 32768]
+    return table
+
+class InboundAudioConverter:
+    """
+    Twilio mu-law (8 kHz) to 16-bit PCM at `rate`, one media frame at a time.
+
+    For whole multiples of 8 kHz, decoding and linear-interpolation
+    upsampling are a single table lookup over overlapping byte pairs; the
+    last byte of each frame is carried into the next, so there are no
+    discontinuities at frame boundaries (and, unlike a stateless ratecv,
+    every frame comes out exactly twice as long). Other rates fall back to
+    audioop.ratecv with its state carried between frames.
+    """
+
+    def __init__(self, rate: int = SAMPLE_RATE):
+        self.rate = rate
+        self.factor = rate // TWILIO_RATE if rate % TWILIO_RATE == 0 else None
+        self._previous = b"\xff"  # mu-law silence
+        self._ratecv_state = None
+        if self.factor:
+            self._table = upsample_table(self.factor)
+
+    def convert(self, payload: bytes) -> bytes:
+        if not payload:
+            return b""
+        if self.factor is None:
+            pcm = ulaw_decode(payload).tobytes()
+            pcm, self._ratecv_state = audioop.ratecv(pcm, 2, 1, TWILIO_RATE, self.rate, self._ratecv_state)
+            return pcm
+        count = len(payload)
+        data = self._previous + payload
+        self._previous = payload[-1:]
+        pairs = np.ndarray((count,), dtype=PAIR_DTYPE, buffer=data, strides=(1,))
+        return self._table[pairs].tobytes()
+
+class OutboundAudioConverter:
+    """
+    16-bit PCM at `rate` to Twilio mu-law (8 kHz), one frame at a time.
+
+    For whole multiples of 8 kHz, each group of `rate / 8000` samples is
+    summed into a reused buffer and the sum is mapped straight to the mu-law
+    byte of its average (a box filter and the encoder in one lookup).
+    Samples left over when a frame does not divide evenly are carried into
+    the next frame. Other rates fall back to audioop.ratecv with its state
+    carried between frames.
+    """
+
+    def __init__(self, rate: int):
+        self.rate = rate
+        self.factor = rate // TWILIO_RATE if rate % TWILIO_RATE == 0 else None
+        self._carry = np.empty(0, dtype=np.int16)
+        self._sums = np.empty(0, dtype=np.intp)
+        self._ratecv_state = None
+        if self.factor:
+            self._table = downsample_table(self.factor)
+
+    def reset(self):
+        """Forget carried samples, e.g. when playback is interrupted."""
+        self._carry = np.empty(0, dtype=np.int16)
+        self._ratecv_state = None
+
+    def convert(self, pcm: bytes) -> bytes:
+        if self.factor is None:
+            pcm, self._ratecv_state = audioop.ratecv(pcm, 2, 1, self.rate, TWILIO_RATE, self._ratecv_state)
+            return ulaw_encode(np.frombuffer(pcm, dtype=np.int16))
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        if len(self._carry):
+            samples = np.concatenate([self._carry, samples])
+        count = len(samples) // self.factor
+        used = count * self.factor
+        self._carry = samples[used:].copy() if used < len(samples) else self._carry[:0]
+        if count == 0:
+            return b""
+        if len(self._sums) != count:
+            # intp, so the lookup below indexes without a cast.
+            self._sums = np.empty(count, dtype=np.intp)
+        sums = self._sums
+        np.copyto(sums, samples[0:used:self.factor])
+        for offset in range(1, self.factor):
+            np.add(sums, samples[offset:used:self.factor], out=sums)
+        return self._table[sums].tobytes()
+
+class FastTwilioFrameSerializer(TwilioFrameSerializer):
+    """
+    TwilioFrameSerializer with the project's table-driven codec.
+
+    Keeps one inbound converter and one outbound converter per output
+    sample rate for the call, so resampling state carries across frames,
+    and builds outbound media messages from a string template instead of
+    json.dumps. Inbound media messages have their payload sliced out
+    without parsing the JSON; other messages are parsed as usual.
+    """
+
+    MEDIA_TEMPLATE = '{"event": "media", "streamSid": "%s", "media": {"payload": "%s"}}'
+    MEDIA_PREFIXES = ('{"event":"media"', '{"event": "media"')
+    PAYLOAD_KEY = '"payload":"'
+
+    def __init__(self, stream_sid: str, params: TwilioFrameSerializer.InputParams = TwilioFrameSerializer.InputParams()):
+        super().__init__(stream_sid, params)
+        self._inbound = InboundAudioConverter(params.sample_rate)
+        self._outbound: Dict[int, OutboundAudioConverter] = {}
+
+    def serialize(self, frame: Frame) -> Optional[str]:
+        if isinstance(frame, AudioRawFrame):
+            converter = self._outbound.get(frame.sample_rate)
+            if converter is None:
+                converter = self._outbound[frame.sample_rate] = OutboundAudioConverter(frame.sample_rate)
+            payload = base64.b64encode(converter.convert(frame.audio)).decode("ascii")
+            return self.MEDIA_TEMPLATE % (self._stream_sid, payload)
+        if isinstance(frame, StartInterruptionFrame):
+            for converter in self._outbound.values():
+                converter.reset()
+        return super().serialize(frame)
+
+    def _payload(self, data) -> Optional[str]:
+        """The base64 payload of a media message, or None for any other message."""
+        if isinstance(data, str) and data.startswith(self.MEDIA_PREFIXES):
+            start = data.find(self.PAYLOAD_KEY)
+            if start != -1:
+                start += len(self.PAYLOAD_KEY)
+                # Base64 never contains a quote, so the next one ends the payload.
+                return data[start:data.index('"', start)]
+        message = json.loads(data)
+        if message.get("event") != "media":
+            return None
+        return message["media"]["payload"]
+
+    def deserialize(self, data) -> Optional[Frame]:
+        payload = self._payload(data)
+        if payload is None:
+            return None
+        audio = self._inbound.convert(base64.b64decode(payload))
+        return InputAudioRawFrame(audio=audio, num_channels=1, sample_rate=self._params.sample_rate)
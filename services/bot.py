@@ -1,9 +1,9 @@
-from twilio.rest import Client
 from twilio.twiml.voice_response import VoiceResponse, Say, Start, Stream
 from fastapi import WebSocket, WebSocketDisconnect
 import asyncio
 import json
 import os
+from typing import Optional
 import sys
 from pathlib import Path
 
@@ -12,66 +12,73 @@ root_dir = Path(__file__).parent.parent
 sys.path.append(str(root_dir))
 
 from config import (
-    TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, OPENAI_API_KEY,
-    YOUR_TWILIO_NUMBER, TWILIO_WEBHOOK_URL, DEEPGRAM_API_KEY, CARTESIA_API_KEY
+    TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN,
+    YOUR_TWILIO_NUMBER, TWILIO_WEBHOOK_URL,
+    CALL_STATUS_POLL_INTERVAL, CALL_REGISTRY_POLL_INTERVAL, FRAME_LOG_ENABLED, SPECULATIVE_LLM_ENABLED,
+    AUDIO_OUT_SAMPLE_RATE
 )
 
 # Import pipecat modules
-from pipecat.audio.vad.silero import SileroVADAnalyzer
 from pipecat.frames.frames import EndFrame, EndTaskFrame
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.pipeline.runner import PipelineRunner
 from pipecat.pipeline.task import PipelineParams, PipelineTask
-from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext
-from pipecat.processors.frame_processor import FrameProcessor, FrameDirection
-from pipecat.serializers.twilio import TwilioFrameSerializer
-from pipecat.services.cartesia import CartesiaTTSService
-from pipecat.services.deepgram import DeepgramSTTService
-from pipecat.services.openai import OpenAILLMService
+from pipecat.processors.frame_processor import FrameDirection
 from pipecat.transports.network.fastapi_websocket import FastAPIWebsocketParams, FastAPIWebsocketTransport
 
 from models.agent import Agent
-
-class DebugUserLogger(FrameProcessor):
-    """Logs what the user said if the frame has a 'text' attribute."""
-    async def process_frame(self, frame, direction):
-        if hasattr(frame, "text"):
-            print(f"User said: {frame.text}")
-        return [frame]
-
-class DebugAssistantLogger(FrameProcessor):
-    """Logs what the assistant replied if the frame has a 'content' attribute."""
-    async def process_frame(self, frame, direction):
-        if hasattr(frame, "role") and frame.role == "assistant":
-            if hasattr(frame, "content"):
-                print(f"Assistant replied: {frame.content}")
-            else:
-                print("Assistant replied: (no 'content' attribute)")
-        return [frame]
-
-class GenericDebugLogger(FrameProcessor):
-    """Logs every frame type and its attributes for debugging."""
-    async def process_frame(self, frame, direction):
-        try:
-            # Attempt to print the frame's dictionary representation
-            attrs = frame.__dict__
-        except Exception:
-            attrs = str(frame)
-        print(f"Frame type: {type(frame)}, Attributes: {attrs}")
-        return [frame]
+from services.admission import AdmissionController, AdmissionRejected
+from services.agent_registry import AgentRegistry, CompiledAgent
+from services.audio_codec import FastTwilioFrameSerializer
+from services.providers import ProviderRegistry
+from services.warm_pool import WarmSession, WarmSessionPool
+from services.speculation import Speculator, SpeculationTap, new_speculation_stats
+from services.twilio_control import TwilioControlPlane, TERMINAL_STATUSES
+from services.call_registry import CallRegistry, create_call_registry
+from models.call import CALL_DIALING, CALL_ENDED
+from services.recorder import CallRecorder, AudioRecorderTap, CHANNEL_IN, CHANNEL_OUT
+from services.transcripts import TranscriptStore, CallTranscriptWriter, TranscriptTap
+from services.context_compactor import ContextCompactor, ContextSummarizer
+from services.frame_log import FrameLog, FrameLogger, loggable
+from services.call_metrics import CallActivity, compute_call_metrics
+from services.tracing import LatencyTracker, END_CALL, PROBE_INPUT, PROBE_STT, PROBE_LLM, PROBE_TTS, PROBE_OUTPUT
 
 class CallBot:
     def __init__(self, agent: Agent, twilio_account_sid: str, twilio_auth_token: str, 
-                 twilio_number: str, webhook_url: str):
-        """Initialize CallBot with an agent and Twilio credentials."""
+                 twilio_number: str, webhook_url: str, provider_factory=None, vad_factory=None,
+                 registry: Optional[CallRegistry] = None, agents: Optional[AgentRegistry] = None,
+                 providers: Optional[ProviderRegistry] = None):
+        """
+        Initialize CallBot with a default agent and Twilio credentials.
+        provider_factory(agent) -> (stt, llm, tts) and vad_factory() -> VADAnalyzer
+        replace the default providers and Silero VAD, e.g. with mocks for load tests.
+        registry defaults to the CALL_REGISTRY_BACKEND shared by all worker processes.
+        agents holds the agents a call can be placed with; `agent` is used when none is chosen.
+        providers picks the STT/LLM/TTS/VAD backends, each imported on first use.
+        """
         self.agent = agent
+        self.agents = agents or AgentRegistry()  # Agents selectable per call, compiled once per version
         self.twilio_number = twilio_number
         self.webhook_url = webhook_url  # Base URL for your streaming endpoint
-        self.twilio_client = Client(twilio_account_sid, twilio_auth_token)
-        self.active_calls = {}  # Tracking active calls
+        self.twilio = TwilioControlPlane(twilio_account_sid, twilio_auth_token)  # Non-blocking call control
+        self.active_calls = {}  # Calls whose media stream is connected to this worker
+        self.pipelines = {}  # call SID -> processors of its running pipeline, for runtime metrics
+        self.registry = registry or create_call_registry()  # Calls across every worker process
+        self.latency_tracker = LatencyTracker()  # Per-turn latency traces for recent calls
+        self.call_events = {}  # call SID -> {"started": Event, "ended": Event} for awaited calls
+        self.warm_pool = WarmSessionPool()  # Provider sessions opened at dial time
+        self.transcripts = TranscriptStore()  # Every call's turns, persisted as they happen
+        self.recorder = CallRecorder()  # Stereo WAV recordings of sampled or selected calls
+        self.frame_log = FrameLog()  # Structured, sampled pipeline events written off the event loop
+        self.summarizer = ContextSummarizer()  # Summarizes older turns of long calls
+        self.speculation_stats = new_speculation_stats()  # Draft hit rate and wasted tokens across calls
+        self.admission = AdmissionController()  # Holds back dials and sheds streams when this worker is saturated
+        self.providers = providers or ProviderRegistry()  # Selected backends, imported when first used
+        self.provider_factory = provider_factory
+        self.vad_factory = vad_factory or (lambda: self.providers.create("vad"))
 
-    def generate_twiml(self) -> str:
-        """Generate TwiML for call setup with WebSocket streaming."""
+    def generate_twiml(self, agent_id: str) -> str:
+        """Generate TwiML for call setup with WebSocket streaming, naming the call's agent."""
         response = VoiceResponse()
         response.say("Hello, I'm connecting you with an AI assistant.")
 
@@ -80,6 +87,7 @@ class CallBot:
         stream = Stream(name="audio_stream", url=f"{self.webhook_url}/ws/stream")
         stream.parameter(name="direction", value="duplex")
         stream.parameter(name="mediaformat", value="audio/webm")
+        stream.parameter(name="agent_id", value=agent_id)
         start.append(stream)
         response.append(start)
 
@@ -87,67 +95,129 @@ class CallBot:
         response.pause(length=3600)
         return str(response)
 
-    async def run_pipeline(self, websocket: WebSocket, call_sid: str):
+    def create_providers(self, compiled: CompiledAgent):
+        """
+        Create the STT, LLM and TTS services for one call. If a provider_factory
+        was given (e.g. mock services for load tests), it is used instead.
+        """
+        if self.provider_factory:
+            return self.provider_factory(compiled.agent)
+
+        # The selected backends (OpenAI, Deepgram and Cartesia by default)
+        llm = self.providers.create("llm")
+        stt = self.providers.create("stt")
+        tts = self.providers.create("tts", sample_rate=AUDIO_OUT_SAMPLE_RATE, **compiled.tts_options)
+        return stt, llm, tts
+
+    async def compiled_agent(self, agent_id: Optional[str] = None) -> Optional[CompiledAgent]:
+        """
+        The compiled setup of the agent with this ID (or name), or of the default
+        agent if none is given. Returns None for an unknown agent.
+        """
+        agent = await self.agents.find(agent_id or self.agent.agent_id)
+        if agent is None and agent_id is None:
+            agent = self.agent
+        return self.agents.compile(agent) if agent else None
+
+    def build_session(self, call_sid: str, compiled: CompiledAgent, on_end_call=None) -> WarmSession:
+        """
+        Create the provider services and initial LLM context for one call.
+        on_end_call(call_sid, llm) replaces hanging up through Twilio when the
+        LLM ends the call, e.g. for loopback conversations.
+        """
+        stt, llm, tts = self.create_providers(compiled)
+        # Register an end_call function so that the LLM can trigger call termination
+        async def end_call(function_name, tool_call_id, args, llm, context, result_callback):
+            await (on_end_call or self.end_call)(call_sid, llm)
+        llm.register_function("end_call", end_call)
+
+        # The agent's system messages and tools were built when it was compiled
+        from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext  # loads the OpenAI SDK
+        messages = compiled.initial_messages()
+        context = OpenAILLMContext(messages, compiled.tools)
+        context_aggregator = llm.create_context_aggregator(context)
+        return WarmSession(
+            stt=stt, llm=llm, tts=tts, context=context,
+            context_aggregator=context_aggregator, messages=messages, agent=compiled.agent
+        )
+
+    async def run_pipeline(self, websocket: WebSocket, call_sid: str, agent_id: Optional[str] = None,
+                           stream_sid: Optional[str] = None):
         """Set up and run the pipecat pipeline using the connected websocket."""
-        print(f"Starting pipeline for call SID: {call_sid}")
+        print(f"Starting pipeline for call SID: {call_sid}, agent: {agent_id or 'default'}")
         
         # Initialize Twilio streaming transport with pipecat
         transport = FastAPIWebsocketTransport(
             websocket=websocket,
             params=FastAPIWebsocketParams(
                 audio_out_enabled=True,
+                audio_out_sample_rate=AUDIO_OUT_SAMPLE_RATE,  # TTS audio is relabeled at this rate
                 add_wav_header=False,
                 vad_enabled=True,
-                vad_analyzer=SileroVADAnalyzer(),
+                vad_analyzer=self.vad_factory(),  # Per-call state over the shared model
                 vad_audio_passthrough=True,
-                serializer=TwilioFrameSerializer(call_sid),  # Using call_sid as stream identifier
+                serializer=FastTwilioFrameSerializer(stream_sid or call_sid),  # Outbound media must name the stream
             ),
         )
 
-        # Set up the OpenAI LLM service
-        llm = OpenAILLMService(api_key=OPENAI_API_KEY, model="gpt-4o")
-        # Register an end_call function so that the LLM can trigger call termination
-        llm.register_function("end_call", self.end_call)
-
-        # Optionally, define any tools (functions) your LLM may call
-        tools = [
-            {
-                "type": "function",
-                "function": {
-                    "name": "end_call",
-                    "description": "Ends the call when invoked."
-                }
-            }
-        ]
-
-        # Set up STT and TTS services
-        stt = DeepgramSTTService(api_key=DEEPGRAM_API_KEY)
-        tts = CartesiaTTSService(
-            api_key=CARTESIA_API_KEY,
-            voice_id=self.agent.voice_id,
-        )
+        # Use the session prewarmed at dial time, or build one now
+        session = await self.warm_pool.claim(call_sid)
+        if session is None:
+            compiled = await self.compiled_agent(agent_id)
+            if compiled is None:
+                print(f"Unknown agent {agent_id} for call {call_sid}; using the default agent")
+                compiled = await self.compiled_agent()
+            session = self.build_session(call_sid, compiled)
+        print(f"Using {'warm' if session.warm else 'cold'} session for call {call_sid}")
+        stt, llm, tts = session.stt, session.llm, session.tts
+        messages = session.messages
+        context_aggregator = session.context_aggregator
 
-        # Build the initial conversation context
-        messages = [
-            {"role": "system", "content": self.agent.prompt},
-            {"role": "system", "content": "You are connected to an AI voice assistant."},
-            {"role": "system", "content": "Please end the call if the user says goodbye."}
-        ]
-        context = OpenAILLMContext(messages, tools)
-        context_aggregator = llm.create_context_aggregator(context)
+        # Latency probes timestamp each turn between the pipeline stages (and the speech timeline)
+        trace = self.latency_tracker.start_call(call_sid)
+        probes = self.latency_tracker.probes(trace)
+        # Turns are written to the transcript store as each side's message is aggregated
+        transcript = CallTranscriptWriter(self.transcripts, call_sid, session.agent.name)
+        # Record both legs if this call is sampled or was switched on at dial time (by any worker)
+        dialed = await self.registry.get(call_sid)
+        recording = self.recorder.start(call_sid, dialed.record if dialed else None)
+        record_in = [AudioRecorderTap(recording, CHANNEL_IN)] if recording else []
+        record_out = [AudioRecorderTap(recording, CHANNEL_OUT)] if recording else []
+        # Older turns are summarized so the context stays within the agent's token budget
+        compactor = ContextCompactor(self.agents.compile(session.agent).context_budget, self.summarizer)
+        # Opt-in: start the LLM on stable interim transcripts, before the user turn closes
+        speculate = []
+        if SPECULATIVE_LLM_ENABLED and hasattr(llm, "speculator"):
+            llm.speculator = Speculator(llm, self.speculation_stats)
+            speculate = [SpeculationTap(llm.speculator, session.context)]
+        # Structured frame logging after STT and after the LLM
+        log_stt = [FrameLogger(self.frame_log, call_sid, "stt")] if FRAME_LOG_ENABLED else []
+        log_llm = [FrameLogger(self.frame_log, call_sid, "llm")] if FRAME_LOG_ENABLED else []
 
-        # Build the pipeline with debug processors inserted
-        pipeline = Pipeline([
+        # Build the pipeline with logging processors inserted
+        processors = [
             transport.input(),             # Receives audio from Twilio
+            *record_in,                    # Copies caller audio into the recording
+            probes[PROBE_INPUT],           # Timestamps end of user speech (VAD)
             stt,                           # STT transcribes audio to text
-            DebugUserLogger(),             # Logs what the user said
+            probes[PROBE_STT],             # Timestamps the final transcript
+            *log_stt,                      # Logs what the user said
+            *speculate,                    # Drafts a reply from interim transcripts
             context_aggregator.user(),     # Packages user messages for the LLM
+            TranscriptTap(transcript),     # Records the user's turn
+            compactor,                     # Keeps the context within its token budget
             llm,                           # LLM processes user messages
-            DebugAssistantLogger(),        # Logs what the assistant replied
+            probes[PROBE_LLM],             # Timestamps the first LLM token
+            *log_llm,                      # Logs what the assistant replied
             tts,                           # TTS converts the LLM response to audio
+            probes[PROBE_TTS],             # Timestamps the first TTS audio
             transport.output(),            # Sends audio back to Twilio
+            *record_out,                   # Copies agent audio into the recording
+            probes[PROBE_OUTPUT],          # Timestamps the first outbound media frame
             context_aggregator.assistant(),# Updates conversation context with the assistant message
-        ])
+            TranscriptTap(transcript),     # Records the assistant's turn
+        ]
+        pipeline = Pipeline(processors)
 
         # Create and run the pipeline task
         task = PipelineTask(pipeline, params=PipelineParams(allow_interruptions=True))
@@ -165,21 +235,51 @@ class CallBot:
         transport.event_handler("on_client_connected")(on_client_connected)
         transport.event_handler("on_client_disconnected")(on_client_disconnected)
         
-        await runner.run(task)
+        self.pipelines[call_sid] = processors
+        try:
+            await runner.run(task)
+        finally:
+            self.pipelines.pop(call_sid, None)
+            transcript.close(messages)
+            if recording:
+                self.recorder.finish(recording)
+            # The context may have been compacted; score the whole conversation
+            self.record_quality(call_sid, trace, transcript.conversation())
 
         # After the pipeline run ends, return the conversation messages
         return messages
 
-    async def end_call(self, function_name, tool_call_id, args, llm, context, result_callback):
+    def record_quality(self, call_sid: str, trace, messages: list):
+        """Compute the call's quality metrics from its speech timeline and transcript, and store them."""
+        try:
+            activity = CallActivity(call_sid, list(messages), list(trace.timeline), trace.elapsed())
+            self.transcripts.set_quality(call_sid, compute_call_metrics([activity])[0])
+        except Exception as e:
+            print(f"Error computing quality metrics for call {call_sid}: {e}")
+
+    async def end_call(self, call_sid: str, llm):
         """Called from the LLM to end the call."""
-        print("Ending call per LLM request.")
+        print(f"Ending call {call_sid} per LLM request.")
+        trace = self.latency_tracker.get(call_sid)
+        if trace:
+            trace.mark_timeline(END_CALL)
+        await self.hangup(call_sid)
+        await llm.push_frame(EndTaskFrame(), FrameDirection.UPSTREAM)
+
+    async def hangup(self, call_sid: str) -> bool:
+        """
+        Hang up a call, whichever worker owns its media stream: Twilio closes
+        the stream and the owning worker's pipeline ends.
+        """
         try:
-            self.twilio_client.calls(args.get("call_sid")).update(
-                twiml="<Response><Hangup/></Response>"
-            )
+            await self.twilio.hangup(call_sid)
         except Exception as e:
             print(f"Error ending call: {e}")
-        await llm.push_frame(EndTaskFrame(), FrameDirection.UPSTREAM)
+            return False
+        record = await self.registry.get(call_sid)
+        if record and record.state == CALL_DIALING:
+            await self.registry.ended(call_sid, "canceled")
+        return True
 
     async def handle_websocket(self, websocket: WebSocket):
         """
@@ -191,9 +291,9 @@ class CallBot:
             # Wait for messages until a "start" event is received
             while True:
                 message = await websocket.receive_text()
-                print(f"WebSocket message received: {message}")
                 data = json.loads(message)
                 event = data.get("event")
+                self.frame_log.emit("twilio_message", call_sid=call_sid, twilio_event=event, message=loggable(message))
                 
                 if event == "connected":
                     print("Received connected event, waiting for start event")
@@ -203,6 +303,7 @@ class CallBot:
                     start_data = data.get("start", {})
                     call_sid = start_data.get("callSid") or start_data.get("call_sid")
                     stream_sid = start_data.get("streamSid") or start_data.get("stream_sid")
+                    agent_id = (start_data.get("customParameters") or {}).get("agent_id")
                     
                     if call_sid is None:
                         print(f"Start event received but no call SID found; keys: {list(data.keys())}")
@@ -211,16 +312,25 @@ class CallBot:
                         return
                         
                     print(f"Call started with SID: {call_sid}, Stream SID: {stream_sid}")
+                    # A call dialed by a sibling worker already holds a slot there; never shed it
+                    known = await self.registry.get(call_sid)
+                    dialed = known is not None and known.state == CALL_DIALING
+                    if not self.admission.open_session(call_sid, dialed):
+                        await self.shed_stream(websocket, call_sid)
+                        return
                     self.active_calls[call_sid] = {
                         "websocket": websocket,
                         "stream_sid": stream_sid
                     }
+                    await self.registry.stream_started(call_sid, stream_sid)
+                    if call_sid in self.call_events:
+                        self.call_events[call_sid]["started"].set()
                     break
                 else:
                     print(f"Received unexpected event '{event}', ignoring")
             
             # Run the pipecat pipeline with this websocket and call_sid
-            await self.run_pipeline(websocket, call_sid or stream_sid)
+            await self.run_pipeline(websocket, call_sid or stream_sid, agent_id, stream_sid)
             
         except WebSocketDisconnect:
             print("WebSocket disconnected")
@@ -231,19 +341,126 @@ class CallBot:
         finally:
             if call_sid and call_sid in self.active_calls:
                 del self.active_calls[call_sid]
+                await self.registry.ended(call_sid)
+            if call_sid and call_sid in self.call_events:
+                self.call_events[call_sid]["ended"].set()
+            if call_sid:
+                await self.admission.close_session(call_sid)
 
-    async def make_call(self, to_number: str) -> str:
-        """Initiate an outbound call using Twilio."""
+    async def shed_stream(self, websocket: WebSocket, call_sid: str):
+        """Turn away a media stream this worker has no room for and hang the call up."""
+        print(f"Shedding call {call_sid}: {len(self.admission.sessions)} sessions already running")
+        await self.registry.ended(call_sid, "shed")
+        try:
+            await self.twilio.hangup(call_sid)
+        except Exception as e:
+            print(f"Error hanging up shed call {call_sid}: {e}")
+        # 1013: try again later
+        await websocket.close(code=1013)
+
+    async def wait_for_call(self, call_sid: str, connect_timeout: float, call_timeout: float) -> bool:
+        """
+        Wait for a dialed call to connect its media stream and then finish.
+        Returns False if the stream never connected within connect_timeout.
+        The stream may connect to any worker; other workers are seen through the registry.
+        """
+        events = self.call_events.setdefault(
+            call_sid, {"started": asyncio.Event(), "ended": asyncio.Event()}
+        )
+        if not await self._wait_for_stream(call_sid, events["started"], connect_timeout):
+            self.call_events.pop(call_sid, None)
+            await self.admission.release(call_sid)
+            await self.registry.ended(call_sid, "no-stream")
+            return False
+        if call_sid not in self.active_calls:
+            # The stream landed on another worker, so the session warmed here is
+            # unused and the slot reserved here can go
+            await self.warm_pool.discard(call_sid)
+            await self.admission.release(call_sid)
+        try:
+            await asyncio.wait_for(self._wait_for_end(call_sid, events["ended"]), timeout=call_timeout)
+        except asyncio.TimeoutError:
+            print(f"Call {call_sid} still running after {call_timeout}s, releasing its slot")
+        self.call_events.pop(call_sid, None)
+        return True
+
+    async def _wait_for_stream(self, call_sid: str, started: asyncio.Event, timeout: float) -> bool:
+        """Wait for the media stream, giving up early once Twilio reports the call as over."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        next_status_check = loop.time() + CALL_STATUS_POLL_INTERVAL
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(started.wait(), timeout=min(remaining, CALL_REGISTRY_POLL_INTERVAL))
+                return True
+            except asyncio.TimeoutError:
+                pass
+            record = await self.registry.get(call_sid)
+            if record and record.stream_sid:
+                return True
+            if loop.time() < next_status_check:
+                continue
+            next_status_check = loop.time() + CALL_STATUS_POLL_INTERVAL
+            try:
+                status = await self.twilio.fetch_status(call_sid)
+            except Exception as e:
+                print(f"Error fetching status for call {call_sid}: {e}")
+                continue
+            if status in TERMINAL_STATUSES and not started.is_set():
+                print(f"Call {call_sid} ended with status '{status}' before streaming")
+                await self.warm_pool.discard(call_sid)
+                return False
+
+    async def _wait_for_end(self, call_sid: str, ended: asyncio.Event):
+        """Wait for the call's stream to end on this worker or, per the registry, on any other."""
+        while True:
+            try:
+                await asyncio.wait_for(ended.wait(), timeout=CALL_REGISTRY_POLL_INTERVAL)
+                return
+            except asyncio.TimeoutError:
+                pass
+            record = await self.registry.get(call_sid)
+            if record is None or record.state == CALL_ENDED:
+                return
+
+    async def make_call(self, to_number: str, record: Optional[bool] = None,
+                        agent_id: Optional[str] = None) -> str:
+        """
+        Initiate an outbound call using Twilio.
+        `record` switches audio recording on or off for this call; None leaves it to sampling.
+        `agent_id` (an agent ID or name) picks the agent; None uses the default agent.
+        Waits for capacity when this worker is saturated, and raises
+        AdmissionRejected if none frees up in time.
+        """
+        held = None  # the ticket, then the call SID, holding this dial's reservation
         try:
-            call = self.twilio_client.calls.create(
+            compiled = await self.compiled_agent(agent_id)
+            if compiled is None:
+                print(f"Not calling {to_number}: unknown agent {agent_id}")
+                return None
+            held = ticket = await self.admission.admit_dial()
+            call_sid = await self.twilio.create_call(
                 to=to_number,
                 from_=self.twilio_number,
-                twiml=self.generate_twiml()
+                twiml=self.generate_twiml(compiled.agent.agent_id)
             )
-            print(f"Call initiated to {to_number} with SID: {call.sid}")
-            return call.sid
+            self.admission.assign(ticket, call_sid)
+            held = call_sid
+            print(f"Call initiated to {to_number} with SID: {call_sid}")
+            await self.registry.dialed(call_sid, to_number, record)
+            # Open provider connections while the callee's phone rings
+            self.warm_pool.prepare(call_sid, lambda: self.build_session(call_sid, compiled))
+            return call_sid
+        except AdmissionRejected as e:
+            print(f"Not calling {to_number}: {e}")
+            raise
         except Exception as e:
             print(f"Error making call: {e}")
             import traceback
             traceback.print_exc()
+            if held is not None:
+                await self.admission.release(held)
             return None
\ No newline at end of file
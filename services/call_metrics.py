@@ -0,0 +1,238 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to the Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from config import QUALITY_SILENCE_GAP_SECONDS, QUALITY_GOODBYE_PATTERN
+from services.stats import summarize
+from services.tracing import USER_STARTED, USER_STOPPED, BOT_STARTED, BOT_STOPPED, END_CALL
+
+# Timeline events as small integer codes for the array computations.
+EVENT_CODES = {USER_STARTED: 0, USER_STOPPED: 1, BOT_STARTED: 2, BOT_STOPPED: 3, END_CALL: 4}
+
+GOODBYE = re.compile(QUALITY_GOODBYE_PATTERN, re.IGNORECASE)
+
+@dataclass
+class CallActivity:
+    """
+    What happened on one call, as input to the quality metrics.
+
+    Attributes:
+        call_sid (str): The call.
+        messages (list): The conversation (user, assistant and tool messages).
+        timeline (list): (seconds since the call started, event) pairs from its CallTrace.
+        duration (float): Length of the call in seconds. Defaults to the last timeline event.
+        expected (list): Scripted user utterances the transcript should match, if any.
+    """
+    call_sid: Optional[str] = None
+    messages: List[dict] = field(default_factory=list)
+    timeline: List[Tuple[float, str]] = field(default_factory=list)
+    duration: Optional[float] = None
+    expected: Optional[List[str]] = None
+
+def words(text: str) -> List[str]:
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+def word_error_rate(reference: List[str], hypothesis: List[str]) -> float:
+    """
+    Word-level edit distance over the reference length. Each row of the
+    dynamic program is computed at once over the hypothesis; insertions
+    are a running minimum along the row.
+    """
+    if not reference:
+        return 0.0 if not hypothesis else 1.0
+    vocabulary: Dict[str, int] = {}
+    ref = np.array([vocabulary.setdefault(word, len(vocabulary)) for word in reference])
+    hyp = np.array([vocabulary.setdefault(word, len(vocabulary)) for word in hypothesis], dtype=np.int64)
+    positions = np.arange(len(hyp) + 1)
+    row = positions.copy()
+    for i, word in enumerate(ref, start=1):
+        current = np.empty_like(row)
+        current[0] = i
+        # Substitution (or match) from the diagonal, deletion from above.
+        current[1:] = np.minimum(row[:-1] + (hyp != word), row[1:] + 1)
+        # Insertion: current[j] = min(current[j], current[j - 1] + 1).
+        row = np.minimum.accumulate(current - positions) + positions
+    return float(row[-1]) / len(ref)
+
+def ended_by_agent(messages: List[dict]) -> bool:
+    for message in messages:
+        for call in message.get("tool_calls") or []:
+            if (call.get("function") or {}).get("name") == "end_call":
+                return True
+        content = message.get("content")
+        if message.get("role") == "assistant" and isinstance(content, str) and '"end_call"' in content:
+            return True  # tool calls read back from the transcript store are stored as JSON
+    return False
+
+def said_goodbye(messages: List[dict]) -> bool:
+    return any(
+        message.get("role") == "user" and isinstance(message.get("content"), str)
+        and GOODBYE.search(message["content"])
+        for message in messages
+    )
+
+def _intervals(keys: np.ndarray, codes: np.ndarray, start: int, stop: int, call_end: np.ndarray,
+               calls: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Speaking intervals of one side: each start runs to the next stop, or
+    to the next start or the end of the call if no stop comes first.
+    Returns (call index, start key, end key), sorted by start.
+    """
+    starts = keys[codes == start]
+    stops = keys[codes == stop]
+    owner = calls[codes == start]
+    next_stop = np.append(stops, np.inf)[np.searchsorted(stops, starts, side="left")]
+    next_start = np.append(starts[1:], np.inf)
+    ends = np.minimum(np.minimum(next_stop, next_start), call_end[owner])
+    return owner, starts, ends
+
+def _inside(points: np.ndarray, point_calls: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+            interval_calls: np.ndarray) -> np.ndarray:
+    """Which points fall strictly inside one of the (non-overlapping, sorted) intervals of their call."""
+    if not len(starts):
+        return np.zeros(len(points), dtype=bool)
+    index = np.searchsorted(starts, points, side="right") - 1
+    found = index >= 0
+    index = np.maximum(index, 0)
+    return found & (interval_calls[index] == point_calls) & (points > starts[index]) & (points < ends[index])
+
+def compute_call_metrics(calls: List[CallActivity],
+                         silence_gap: float = QUALITY_SILENCE_GAP_SECONDS) -> List[dict]:
+    """
+    Quality metrics for a batch of calls, computed from their speech
+    timelines and transcripts without any model calls.
+
+    The timelines of the whole batch are laid end to end on one time axis
+    (each call shifted past the end of the one before), so intervals,
+    overlaps and gaps for every call are found with a handful of array
+    operations rather than a loop per call.
+    """
+    count = len(calls)
+    durations = np.array([
+        call.duration if call.duration is not None else max((t for t, _ in call.timeline), default=0.0)
+        for call in calls
+    ], dtype=float)
+    offsets = np.concatenate([[0.0], np.cumsum(durations + 1.0)[:-1]]) if count else np.zeros(0)
+    call_end = offsets + durations
+
+    events = [
+        (index, t, EVENT_CODES[event])
+        for index, call in enumerate(calls) for t, event in call.timeline if event in EVENT_CODES
+    ]
+    call_index = np.array([index for index, _, _ in events], dtype=np.int64)
+    times = np.array([t for _, t, _ in events], dtype=float)
+    codes = np.array([code for _, _, code in events], dtype=np.int64)
+    keys = offsets[call_index] + np.clip(times, 0.0, durations[call_index])
+    order = np.argsort(keys, kind="stable")
+    keys, codes, call_index = keys[order], codes[order], call_index[order]
+
+    user_calls, user_starts, user_ends = _intervals(keys, codes, 0, 1, call_end, call_index)
+    bot_calls, bot_starts, bot_ends = _intervals(keys, codes, 2, 3, call_end, call_index)
+    user_talk = np.bincount(user_calls, weights=user_ends - user_starts, minlength=count)
+    bot_talk = np.bincount(bot_calls, weights=bot_ends - bot_starts, minlength=count)
+
+    # Response latency: end of each user turn to the agent's next start,
+    # unless the caller starts speaking again first.
+    stops = user_ends[user_ends < call_end[user_calls]]
+    stop_calls = user_calls[user_ends < call_end[user_calls]]
+    reply = np.searchsorted(bot_starts, stops, side="left")
+    next_user = np.searchsorted(user_starts, stops, side="left")
+    reply_at = np.append(bot_starts, np.inf)[reply]
+    answered = (
+        (reply < len(bot_starts))
+        & (np.append(bot_calls, -1)[reply] == stop_calls)
+        & (reply_at < np.append(user_starts, np.inf)[next_user])
+    )
+    latencies = (reply_at - stops)[answered] * 1000.0
+    # stop_calls is sorted (keys are), so each call's latencies are one slice.
+    per_call_latencies = np.split(latencies, np.searchsorted(stop_calls[answered], np.arange(1, count)))
+
+    # Barge-ins: the caller starts while the agent is speaking; the agent
+    # interrupting is the reverse.
+    barge_ins = np.bincount(
+        user_calls[_inside(user_starts, user_calls, bot_starts, bot_ends, bot_calls)], minlength=count
+    )
+    interruptions = np.bincount(
+        bot_calls[_inside(bot_starts, bot_calls, user_starts, user_ends, user_calls)], minlength=count
+    )
+
+    # Silence: gaps between the union of both sides' speech.
+    starts = np.concatenate([user_starts, bot_starts])
+    ends = np.concatenate([user_ends, bot_ends])
+    owners = np.concatenate([user_calls, bot_calls])
+    order = np.argsort(starts, kind="stable")
+    starts, ends, owners = starts[order], ends[order], owners[order]
+    covered = np.maximum.accumulate(ends) if len(ends) else ends
+    same_call = owners[1:] == owners[:-1]
+    gaps = (starts[1:] - covered[:-1])[same_call]
+    gap_calls = owners[1:][same_call]
+    long_gaps = np.bincount(gap_calls[gaps > silence_gap], minlength=count)
+    longest_gap = np.zeros(count)
+    np.maximum.at(longest_gap, gap_calls, np.maximum(gaps, 0.0))
+
+    end_call_events = np.bincount(call_index[codes == EVENT_CODES[END_CALL]], minlength=count)
+
+    results = []
+    for index, call in enumerate(calls):
+        call_latencies = per_call_latencies[index]
+        ended = bool(end_call_events[index]) or ended_by_agent(call.messages)
+        wer = None
+        if call.expected is not None:
+            heard = " ".join(
+                m["content"] for m in call.messages if m.get("role") == "user" and isinstance(m.get("content"), str)
+            )
+            wer = round(word_error_rate(words(" ".join(call.expected)), words(heard)), 4)
+        results.append({
+            "call_sid": call.call_sid,
+            "duration_s": round(float(durations[index]), 3),
+            "response_latency_ms": {
+                "count": int(len(call_latencies)),
+                "mean": round(float(call_latencies.mean()), 1) if len(call_latencies) else None,
+                "max": round(float(call_latencies.max()), 1) if len(call_latencies) else None,
+            },
+            "response_latencies_ms": [round(float(value), 1) for value in call_latencies],
+            "barge_ins": int(barge_ins[index]),
+            "agent_interruptions": int(interruptions[index]),
+            "user_talk_s": round(float(user_talk[index]), 3),
+            "agent_talk_s": round(float(bot_talk[index]), 3),
+            "talk_listen_ratio": round(float(bot_talk[index] / user_talk[index]), 3) if user_talk[index] else None,
+            "silence_gaps": int(long_gaps[index]),
+            "longest_silence_s": round(float(longest_gap[index]), 3),
+            "ended_by_agent": ended,
+            "missed_end_call": not ended and said_goodbye(call.messages),
+            "wer": wer,
+        })
+    return results
+
+def summarize_call_metrics(results: List[dict]) -> dict:
+    """Totals and distributions over a batch of per-call metrics."""
+    ratios = [r["talk_listen_ratio"] for r in results if r["talk_listen_ratio"] is not None]
+    wers = [r["wer"] for r in results if r["wer"] is not None]
+    return {
+        "calls": len(results),
+        "response_latency": summarize({"ms": [v for r in results for v in r["response_latencies_ms"]]})["ms"],
+        "barge_ins": sum(r["barge_ins"] for r in results),
+        "agent_interruptions": sum(r["agent_interruptions"] for r in results),
+        "talk_listen_ratio_mean": round(float(np.mean(ratios)), 3) if ratios else None,
+        "silence_gaps": sum(r["silence_gaps"] for r in results),
+        "missed_end_call": sum(r["missed_end_call"] for r in results),
+        "wer_mean": round(float(np.mean(wers)), 4) if wers else None,
+    }
+
+def needs_review(metrics: dict, max_latency_ms: float, max_wer: float) -> bool:
+    """Whether a call's cheap checks flag it for a closer (LLM) look."""
+    latency = metrics["response_latency_ms"]["max"]
+    return bool(
+        metrics["missed_end_call"]
+        or metrics["silence_gaps"]
+        or (latency is not None and latency > max_latency_ms)
+        or (metrics["wer"] is not None and metrics["wer"] > max_wer)
+    )
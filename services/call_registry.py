@@ -0,0 +1,203 @@
+import asyncio
+from abc import ABC, abstractmethod
+import os
+import socket
+import sqlite3
+import threading
+import time
+from dataclasses import fields
+from typing import Dict, List, Optional
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from config import CALL_REGISTRY_BACKEND, CALL_REGISTRY_PATH, CALL_REGISTRY_RETENTION
+from models.call import CallRecord, CALL_DIALING, CALL_STREAMING, CALL_ENDED
+
+def current_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def _worker_alive(worker_id: str) -> bool:
+    """Whether a worker on this host is still running. Workers on other hosts are assumed alive."""
+    host, _, pid = worker_id.rpartition(":")
+    if host != socket.gethostname():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, ValueError):
+        return True
+    return True
+
+class CallRegistry(ABC):
+    """
+    Where calls are tracked: who dialed them, which worker owns their media
+    stream, and whether they are still live.
+
+    CallBot updates the registry when it dials, when a media stream starts and
+    when it ends. With several uvicorn workers, the stream for a call dialed
+    by one worker can land on another; the shared backend lets the dialing
+    worker see that and lets any worker list or hang up any call.
+
+    Attributes:
+        worker_id (str): This process, as "host:pid".
+    """
+
+    def __init__(self, worker_id: Optional[str] = None):
+        self.worker_id = worker_id or current_worker_id()
+
+    @abstractmethod
+    async def dialed(self, call_sid: str, to_number: Optional[str] = None, record: Optional[bool] = None):
+        """A call was placed by this worker. `record` is its recording override, if any."""
+
+    @abstractmethod
+    async def stream_started(self, call_sid: str, stream_sid: Optional[str]):
+        """The call's media stream connected to this worker."""
+
+    @abstractmethod
+    async def ended(self, call_sid: str, status: str = "completed"):
+        """The call is over; `status` says how it ended."""
+
+    @abstractmethod
+    async def get(self, call_sid: str) -> Optional[CallRecord]:
+        """The call's record, or None if it is not (or no longer) tracked."""
+
+    @abstractmethod
+    async def active(self) -> List[CallRecord]:
+        """Calls that have not ended, on any worker."""
+
+    @abstractmethod
+    async def reap(self):
+        """End calls owned by workers that died, and drop old finished calls."""
+
+class MemoryCallRegistry(CallRegistry):
+    """In-process registry. Only correct with a single worker."""
+
+    def __init__(self, worker_id: Optional[str] = None):
+        super().__init__(worker_id)
+        self._calls: Dict[str, CallRecord] = {}
+
+    async def dialed(self, call_sid: str, to_number: Optional[str] = None, record: Optional[bool] = None):
+        self._calls.setdefault(
+            call_sid, CallRecord(call_sid, dialed_by=self.worker_id, to_number=to_number, record=record)
+        )
+
+    async def stream_started(self, call_sid: str, stream_sid: Optional[str]):
+        record = self._calls.setdefault(call_sid, CallRecord(call_sid))
+        record.state = CALL_STREAMING
+        record.owner = self.worker_id
+        record.stream_sid = stream_sid
+        record.updated_at = time.time()
+
+    async def ended(self, call_sid: str, status: str = "completed"):
+        record = self._calls.get(call_sid)
+        if record and record.state != CALL_ENDED:
+            record.state = CALL_ENDED
+            record.status = status
+            record.updated_at = time.time()
+
+    async def get(self, call_sid: str) -> Optional[CallRecord]:
+        return self._calls.get(call_sid)
+
+    async def active(self) -> List[CallRecord]:
+        return [record for record in self._calls.values() if record.state != CALL_ENDED]
+
+    async def reap(self):
+        cutoff = time.time() - CALL_REGISTRY_RETENTION
+        for call_sid in [sid for sid, r in self._calls.items() if r.state == CALL_ENDED and r.updated_at < cutoff]:
+            del self._calls[call_sid]
+
+class SQLiteCallRegistry(CallRegistry):
+    """
+    Registry in a SQLite file shared by every worker on the host.
+
+    Each statement is a single short transaction in WAL mode, run in a
+    thread so a busy database never blocks the event loop.
+    """
+
+    COLUMNS = [f.name for f in fields(CallRecord)]
+
+    def __init__(self, path: str = CALL_REGISTRY_PATH, worker_id: Optional[str] = None):
+        super().__init__(worker_id)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS calls ("
+            "call_sid TEXT PRIMARY KEY, state TEXT NOT NULL, owner TEXT, stream_sid TEXT, dialed_by TEXT, "
+            "to_number TEXT, record INTEGER, status TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        if "record" not in [row[1] for row in self._db.execute("PRAGMA table_info(calls)")]:
+            self._db.execute("ALTER TABLE calls ADD COLUMN record INTEGER")  # databases from before overrides
+        self._db.execute("CREATE INDEX IF NOT EXISTS calls_by_state ON calls (state, updated_at)")
+
+    def _execute(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    async def _run(self, sql: str, params: tuple = ()) -> List[tuple]:
+        return await asyncio.to_thread(self._execute, sql, params)
+
+    def _record(self, row: tuple) -> CallRecord:
+        record = CallRecord(**dict(zip(self.COLUMNS, row)))
+        if record.record is not None:
+            record.record = bool(record.record)
+        return record
+
+    async def dialed(self, call_sid: str, to_number: Optional[str] = None, record: Optional[bool] = None):
+        now = time.time()
+        await self._run(
+            "INSERT OR IGNORE INTO calls (call_sid, state, dialed_by, to_number, record, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (call_sid, CALL_DIALING, self.worker_id, to_number, record, now, now),
+        )
+
+    async def stream_started(self, call_sid: str, stream_sid: Optional[str]):
+        now = time.time()
+        await self._run(
+            "INSERT INTO calls (call_sid, state, owner, stream_sid, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (call_sid) DO UPDATE SET state = excluded.state, owner = excluded.owner, "
+            "stream_sid = excluded.stream_sid, updated_at = excluded.updated_at",
+            (call_sid, CALL_STREAMING, self.worker_id, stream_sid, now, now),
+        )
+
+    async def ended(self, call_sid: str, status: str = "completed"):
+        await self._run(
+            "UPDATE calls SET state = ?, status = ?, updated_at = ? WHERE call_sid = ? AND state != ?",
+            (CALL_ENDED, status, time.time(), call_sid, CALL_ENDED),
+        )
+
+    async def get(self, call_sid: str) -> Optional[CallRecord]:
+        rows = await self._run(f"SELECT {', '.join(self.COLUMNS)} FROM calls WHERE call_sid = ?", (call_sid,))
+        return self._record(rows[0]) if rows else None
+
+    async def active(self) -> List[CallRecord]:
+        rows = await self._run(
+            f"SELECT {', '.join(self.COLUMNS)} FROM calls WHERE state != ? ORDER BY created_at", (CALL_ENDED,)
+        )
+        return [self._record(row) for row in rows]
+
+    async def reap(self):
+        for record in await self.active():
+            worker = record.owner or record.dialed_by
+            if worker and not _worker_alive(worker):
+                print(f"Call {record.call_sid} belonged to worker {worker}, which is gone; marking it ended")
+                await self.ended(record.call_sid, "worker-exited")
+        await self._run(
+            "DELETE FROM calls WHERE state = ? AND updated_at < ?",
+            (CALL_ENDED, time.time() - CALL_REGISTRY_RETENTION),
+        )
+
+def create_call_registry(backend: str = CALL_REGISTRY_BACKEND) -> CallRegistry:
+    """Build the registry configured by CALL_REGISTRY_BACKEND ("sqlite" or "memory")."""
+    if backend == "memory":
+        return MemoryCallRegistry()
+    if backend == "sqlite":
+        return SQLiteCallRegistry()
+    raise ValueError(f"Unknown call registry backend: {backend}")
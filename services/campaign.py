@@ -0,0 +1,163 @@
+import asyncio
+import random
+import time
+from typing import Dict, List, Optional
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from config import (
+    MAX_RETRIES, RETRY_BACKOFF_SECONDS, CAMPAIGN_MAX_CONCURRENCY,
+    CAMPAIGN_CALLS_PER_SECOND, CAMPAIGN_CONNECT_TIMEOUT, CAMPAIGN_CALL_TIMEOUT, CAMPAIGN_MAX_DEFERRALS
+)
+from models.campaign import (
+    Campaign, CampaignJob, JOB_CANCELLED, JOB_COMPLETED, JOB_DIALING,
+    JOB_FAILED, JOB_IN_PROGRESS, JOB_RETRYING
+)
+from services.admission import AdmissionRejected
+
+class RateLimiter:
+    """Spaces out acquisitions so that at most `rate` happen per second."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        # Sleep outside the lock so other waiters can reserve their slots.
+        delay = slot - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+class CampaignScheduler:
+    """
+    Dials campaign jobs with bounded concurrency, a calls-per-second limit
+    and retries with exponential backoff.
+
+    A job holds one of the `max_concurrency` slots from its first dial until
+    its call ends, so the limit bounds live calls rather than just API
+    requests. The rate limiter is shared by every campaign because Twilio
+    enforces calls-per-second per account.
+
+    Attributes:
+        bot (CallBot): The bot used to place and track calls.
+        max_concurrency (int): Maximum number of jobs in flight across campaigns.
+        max_retries (int): Retries after the first failed attempt. Defaults to MAX_RETRIES.
+        backoff (float): Base backoff in seconds, doubled on each retry.
+        max_deferrals (int): Dials rejected by admission control before a job
+            fails. These do not use up retries. Defaults to CAMPAIGN_MAX_DEFERRALS.
+    """
+
+    def __init__(self, bot, max_concurrency: int = CAMPAIGN_MAX_CONCURRENCY,
+                 calls_per_second: float = CAMPAIGN_CALLS_PER_SECOND,
+                 max_retries: int = MAX_RETRIES, backoff: float = RETRY_BACKOFF_SECONDS,
+                 connect_timeout: float = CAMPAIGN_CONNECT_TIMEOUT,
+                 call_timeout: float = CAMPAIGN_CALL_TIMEOUT,
+                 max_deferrals: int = CAMPAIGN_MAX_DEFERRALS):
+        self.bot = bot
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.connect_timeout = connect_timeout
+        self.call_timeout = call_timeout
+        self.max_deferrals = max_deferrals
+        self.rate_limiter = RateLimiter(calls_per_second)
+        self.campaigns: Dict[str, Campaign] = {}
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def submit(self, jobs: List[CampaignJob]) -> Campaign:
+        """Register a campaign and start dialing it in the background."""
+        campaign = Campaign(jobs=jobs)
+        self.campaigns[campaign.campaign_id] = campaign
+        self._tasks[campaign.campaign_id] = asyncio.create_task(self._run(campaign))
+        return campaign
+
+    def get(self, campaign_id: str) -> Optional[Campaign]:
+        return self.campaigns.get(campaign_id)
+
+    def cancel(self, campaign_id: str) -> bool:
+        """Stop dialing new jobs for a campaign. Calls already live are left to finish."""
+        campaign = self.campaigns.get(campaign_id)
+        if campaign is None:
+            return False
+        campaign.cancelled = True
+        return True
+
+    async def _run(self, campaign: Campaign):
+        try:
+            await asyncio.gather(*(self._run_job(campaign, job) for job in campaign.jobs))
+        finally:
+            campaign.finished_at = time.time()
+            self._tasks.pop(campaign.campaign_id, None)
+            print(f"Campaign {campaign.campaign_id} finished: {campaign.progress()['counts']}")
+
+    async def _run_job(self, campaign: Campaign, job: CampaignJob):
+        async with self._slots:
+            job.started_at = time.time()
+            try:
+                await self._dial_job(campaign, job)
+            except Exception as e:
+                # e.g. the call registry could not be read: fail this job, not the campaign
+                print(f"Campaign {campaign.campaign_id} job for {job.phone_number} failed: {e}")
+                job.status = JOB_FAILED
+                job.error = str(e)
+            job.finished_at = time.time()
+
+    async def _dial_job(self, campaign: Campaign, job: CampaignJob):
+        """Dial the job until it completes, fails or the campaign is cancelled."""
+        while True:
+            if campaign.cancelled:
+                job.status = JOB_CANCELLED
+                break
+
+            await self.rate_limiter.acquire()
+            job.status = JOB_DIALING
+            job.attempts += 1
+            try:
+                call_sid = await self.bot.make_call(job.phone_number, agent_id=job.agent)
+            except AdmissionRejected as e:
+                # The server is saturated: wait and dial again without using up a
+                # retry, but only so many times.
+                job.attempts -= 1
+                job.deferrals += 1
+                job.error = str(e)
+                if job.deferrals > self.max_deferrals:
+                    job.status = JOB_FAILED
+                    break
+                job.status = JOB_RETRYING
+                await asyncio.sleep(e.retry_after + random.uniform(0, self.backoff))
+                continue
+
+            if call_sid:
+                job.call_sid = call_sid
+                job.status = JOB_IN_PROGRESS
+                connected = await self.bot.wait_for_call(
+                    call_sid, self.connect_timeout, self.call_timeout
+                )
+                if connected:
+                    job.status = JOB_COMPLETED
+                    job.error = None
+                    break
+                job.error = "call never connected a media stream"
+                # It may still be ringing or be answered late: end it before dialing again.
+                await self.bot.hangup(call_sid)
+            else:
+                job.error = "dial failed"
+
+            if job.attempts > self.max_retries:
+                job.status = JOB_FAILED
+                break
+
+            job.status = JOB_RETRYING
+            delay = self.backoff * (2 ** (job.attempts - 1))
+            await asyncio.sleep(delay + random.uniform(0, self.backoff))
@@ -0,0 +1,36 @@
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from pipecat.frames.frames import CancelFrame
+from pipecat.services.cartesia import CartesiaTTSService
+
+class WarmCartesiaTTSService(CartesiaTTSService):
+    """CartesiaTTSService whose websocket can be opened before the pipeline starts."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._prewarmed = False
+
+    async def prewarm(self):
+        await super()._connect()
+        self._prewarmed = self._websocket is not None
+        if not self._prewarmed:
+            # Stop the receive task so the pipeline's own connect starts clean.
+            if self._receive_task:
+                self._receive_task.cancel()
+                self._receive_task = None
+            raise ConnectionError("Cartesia websocket did not connect")
+
+    async def _connect(self):
+        if self._prewarmed:
+            self._prewarmed = False
+            return
+        await super()._connect()
+
+    async def release(self):
+        await self.cancel(CancelFrame())
+        await self.cleanup()
@@ -0,0 +1,187 @@
+import asyncio
+import json
+from typing import TYPE_CHECKING, Awaitable, Callable, List, Optional, Tuple
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from config import (
+    OPENAI_API_KEY, CONTEXT_KEEP_TURNS, CONTEXT_SUMMARY_TRIGGER,
+    CONTEXT_SUMMARY_MODEL, CONTEXT_SUMMARY_MAX_TOKENS
+)
+
+from pipecat.frames.frames import Frame
+from pipecat.processors.frame_processor import FrameProcessor, FrameDirection
+
+if TYPE_CHECKING:
+    # Both load the OpenAI SDK, which is imported only once a call needs it
+    from openai import AsyncOpenAI
+    from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext
+
+SUMMARY_PREFIX = "Summary of the earlier part of this call: "
+
+SUMMARY_INSTRUCTIONS = (
+    "You keep a running summary of a phone call for the assistant taking it. "
+    "Fold the new part of the conversation into the existing summary. Keep every fact the caller "
+    "gave (names, numbers, dates, choices), what was agreed or done, and anything still open. "
+    "Write it as short plain sentences, no more than a short paragraph."
+)
+
+def _content(message: dict) -> str:
+    content = message.get("content")
+    if isinstance(content, str):
+        return content
+    return json.dumps(message.get("tool_calls") or content)
+
+def estimate_tokens(messages: List[dict]) -> int:
+    """Rough token count of chat messages: about four characters a token plus per-message overhead."""
+    return sum(4 + len(_content(message)) // 4 for message in messages)
+
+def split_turns(messages: List[dict]) -> List[List[dict]]:
+    """Group messages into turns, each starting at a user message, so tool calls stay with their results."""
+    turns = []
+    for message in messages:
+        if not turns or message.get("role") == "user":
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+def pinned_count(messages: List[dict]) -> int:
+    """Number of leading system messages, which are never compacted."""
+    count = 0
+    while count < len(messages) and messages[count].get("role") == "system":
+        count += 1
+    return count
+
+class ContextSummarizer:
+    """
+    Folds conversation turns into a running summary with a small OpenAI model.
+
+    One instance is shared by every call; the client is created on first use.
+
+    Attributes:
+        model (str): Chat model that writes summaries. Defaults to CONTEXT_SUMMARY_MODEL.
+    """
+
+    def __init__(self, model: str = CONTEXT_SUMMARY_MODEL, client: Optional["AsyncOpenAI"] = None,
+                 max_tokens: int = CONTEXT_SUMMARY_MAX_TOKENS):
+        self.model = model
+        self.max_tokens = max_tokens
+        self.client = client
+
+    async def __call__(self, summary: Optional[str], messages: List[dict]) -> str:
+        if self.client is None:
+            from openai import AsyncOpenAI
+            self.client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+        transcript = "\n".join(f"{message['role']}: {_content(message)}" for message in messages)
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            max_tokens=self.max_tokens,
+            temperature=0,
+            messages=[
+                {"role": "system", "content": SUMMARY_INSTRUCTIONS},
+                {"role": "user", "content": f"Summary so far:\n{summary or '(none)'}\n\nNew conversation:\n{transcript}"},
+            ],
+        )
+        return response.choices[0].message.content.strip()
+
+class ContextCompactor(FrameProcessor):
+    """
+    Keeps a call's LLM context within a token budget. Place it between the
+    user context aggregator and the LLM.
+
+    The leading system messages are pinned and the last `keep_turns` turns
+    are always kept verbatim. Once the context passes `trigger` of the
+    budget, the older turns are summarized in a background task; the
+    summary replaces them (as a system message after the pinned ones) on
+    the next turn, so no turn waits for it. If the context goes over the
+    budget before a summary is ready, the oldest turns are dropped straight
+    away and folded into the next summary.
+
+    The context's message list is edited in place, so the assistant
+    aggregator and the transcript writer keep working on the same list.
+
+    Attributes:
+        budget (int): Token budget for the whole context.
+        keep_turns (int): Most recent turns never summarized. Defaults to CONTEXT_KEEP_TURNS.
+        trigger (float): Share of the budget at which summarizing starts. Defaults to CONTEXT_SUMMARY_TRIGGER.
+        stats (dict): Summaries applied, turns dropped before they could be summarized, and summarizer errors.
+    """
+
+    def __init__(self, budget: int, summarizer: Callable[[Optional[str], List[dict]], Awaitable[str]],
+                 keep_turns: int = CONTEXT_KEEP_TURNS, trigger: float = CONTEXT_SUMMARY_TRIGGER, **kwargs):
+        super().__init__(**kwargs)
+        # Imported per call rather than with this module: it loads the OpenAI SDK
+        from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContextFrame
+        self._context_frame = OpenAILLMContextFrame
+        self.budget = budget
+        self.summarizer = summarizer
+        self.keep_turns = keep_turns
+        self.trigger = trigger
+        self.summary: Optional[str] = None
+        self._summary_message: Optional[dict] = None
+        self._pending: List[dict] = []  # dropped from the context, not yet in the summary
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"summaries": 0, "dropped_turns": 0, "errors": 0}
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, self._context_frame) and direction == FrameDirection.DOWNSTREAM:
+            self.compact(frame.context)
+        await self.push_frame(frame, direction)
+
+    def compact(self, context: "OpenAILLMContext"):
+        self._apply_summary(context)
+        messages = context.messages
+        pinned = pinned_count(messages)
+        turns = split_turns(messages[pinned:])
+        total = estimate_tokens(messages)
+
+        dropped = []
+        while len(turns) > self.keep_turns and total > self.budget:
+            turn = turns.pop(0)
+            dropped.extend(turn)
+            total -= estimate_tokens(turn)
+            self.stats["dropped_turns"] += 1
+        if dropped:
+            context.set_messages(messages[:pinned] + [message for turn in turns for message in turn])
+            self._pending.extend(dropped)
+
+        older = [message for turn in turns[:max(0, len(turns) - self.keep_turns)] for message in turn]
+        if self._task is None and total > self.trigger * self.budget and (older or self._pending):
+            self._task = asyncio.create_task(self._summarize(self._pending + older))
+
+    async def _summarize(self, messages: List[dict]) -> Tuple[str, List[dict]]:
+        return await self.summarizer(self.summary, messages), messages
+
+    def _apply_summary(self, context: "OpenAILLMContext"):
+        """Swap the turns covered by a finished summary for the summary itself."""
+        if self._task is None or not self._task.done():
+            return
+        task, self._task = self._task, None
+        try:
+            summary, covered = task.result()
+        except Exception as e:
+            print(f"Error summarizing call context: {e}")
+            self.stats["errors"] += 1
+            return
+        covered_ids = {id(message) for message in covered}
+        self._pending = [message for message in self._pending if id(message) not in covered_ids]
+        kept = [
+            message for message in context.messages
+            if id(message) not in covered_ids and message is not self._summary_message
+        ]
+        self.summary = summary
+        self._summary_message = {"role": "system", "content": SUMMARY_PREFIX + summary}
+        kept.insert(pinned_count(kept), self._summary_message)
+        context.set_messages(kept)
+        self.stats["summaries"] += 1
+
+    async def cleanup(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await super().cleanup()
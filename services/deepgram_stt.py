@@ -0,0 +1,33 @@
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from pipecat.frames.frames import CancelFrame
+from pipecat.services.deepgram import DeepgramSTTService
+
+class WarmDeepgramSTTService(DeepgramSTTService):
+    """DeepgramSTTService whose websocket can be opened before the pipeline starts."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._prewarmed = False
+
+    async def prewarm(self):
+        await super()._connect()
+        self._prewarmed = await self._connection.is_connected()
+        if not self._prewarmed:
+            raise ConnectionError("Deepgram websocket did not connect")
+
+    async def _connect(self):
+        # The pipeline's StartFrame reuses the prewarmed connection once.
+        if self._prewarmed:
+            self._prewarmed = False
+            return
+        await super()._connect()
+
+    async def release(self):
+        await self.cancel(CancelFrame())
+        await self.cleanup()
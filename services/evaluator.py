@@ -1,28 +1,185 @@
-from typing import List
-from openai import OpenAI
-from ..models.conversation import Conversation
-from ..config import OPENAI_API_KEY
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+import sys
+from pathlib import Path
 
-class ConversationEvaluator:
-    def __init__(self):
-        self.client = OpenAI(api_key=OPENAI_API_KEY)
-    
-    async def evaluate(self, conversation: Conversation, criteria: List[str]) -> dict:
-        # Evaluate conversation against criteria
-        try:
-            response = await self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "Evaluate this conversation against the given criteria."},
-                    {"role": "user", "content": f"Conversation: {conversation.transcript}\nCriteria: {criteria}"}
-                ]
+# Add the project root to the Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from config import OPENAI_API_KEY, EVALUATION_MODEL, EVALUATION_MAX_CONCURRENCY, EVALUATION_CACHE_PATH
+from models.conversation import Conversation
+from models.evaluation import CriterionVerdict, EvaluationResult
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+SYSTEM_PROMPT = (
+    "You evaluate phone conversations between an AI voice agent (assistant) and a caller (user). "
+    "For each numbered criterion, decide whether the agent's behaviour in the transcript meets it. "
+    "Judge every criterion independently and give a one-sentence reason."
+)
+
+# Structured output schema: one verdict per criterion, referenced by index.
+VERDICT_SCHEMA = {
+    "name": "criteria_verdicts",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "verdicts": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "index": {"type": "integer"},
+                        "passed": {"type": "boolean"},
+                        "reason": {"type": "string"},
+                    },
+                    "required": ["index", "passed", "reason"],
+                    "additionalProperties": False,
+                },
+            },
+        },
+        "required": ["verdicts"],
+        "additionalProperties": False,
+    },
+}
+
+def verdict_key(transcript: str, criterion: str, model: str) -> str:
+    """Cache key for one criterion on one transcript under one model."""
+    payload = json.dumps([transcript, criterion, model], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class VerdictCache:
+    """
+    SQLite-backed store of criterion verdicts keyed by verdict_key.
+
+    Verdicts are cached per criterion rather than per criteria list, so
+    editing or adding one criterion only re-evaluates that criterion.
+    """
+
+    def __init__(self, path: str = EVALUATION_CACHE_PATH):
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS verdicts ("
+            "key TEXT PRIMARY KEY, passed INTEGER NOT NULL, reason TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def get_many(self, keys: List[str]) -> Dict[str, Tuple[bool, str]]:
+        if not keys:
+            return {}
+        with self._lock:
+            placeholders = ",".join("?" * len(keys))
+            rows = self._db.execute(
+                f"SELECT key, passed, reason FROM verdicts WHERE key IN ({placeholders})", keys
+            ).fetchall()
+        return {key: (bool(passed), reason) for key, passed, reason in rows}
+
+    def put_many(self, entries: Dict[str, Tuple[bool, str]]):
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO verdicts (key, passed, reason, created_at) VALUES (?, ?, ?, ?)",
+                [(key, int(passed), reason, now) for key, (passed, reason) in entries.items()],
             )
-            return {
-                "passed": True,
-                "feedback": response.choices[0].message.content
-            }
-        except Exception as e:
-            return {
-                "passed": False,
-                "error": str(e)
-            }
\ No newline at end of file
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+class ConversationEvaluator:
+    """
+    Scores conversations against criteria with an LLM judge.
+
+    Each conversation costs at most one request, covering only the criteria
+    without a cached verdict, and requests run concurrently up to
+    `max_concurrency`. The model answers with a JSON schema so every
+    criterion gets its own pass/fail verdict.
+
+    Attributes:
+        model (str): The judging model. Defaults to EVALUATION_MODEL.
+        max_concurrency (int): Evaluation requests in flight at once.
+        cache (VerdictCache): Verdicts from earlier runs.
+    """
+
+    def __init__(self, model: str = EVALUATION_MODEL, max_concurrency: int = EVALUATION_MAX_CONCURRENCY,
+                 cache: Optional[VerdictCache] = None, client: Optional["AsyncOpenAI"] = None):
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.cache = cache or VerdictCache()
+        if client is None:
+            from openai import AsyncOpenAI  # the SDK loads only once an evaluation is run
+            client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+        self.client = client
+        self.stats = {"requests": 0, "cached_verdicts": 0, "fresh_verdicts": 0, "errors": 0}
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+    async def evaluate_many(self, conversations: List[Conversation], criteria: List[str]) -> List[EvaluationResult]:
+        """Evaluate every conversation concurrently; results keep the input order."""
+        return await asyncio.gather(*(self.evaluate(c, criteria) for c in conversations))
+
+    async def evaluate(self, conversation: Conversation, criteria: List[str]) -> EvaluationResult:
+        transcript = conversation.transcript
+        keys = [verdict_key(transcript, criterion, self.model) for criterion in criteria]
+        cached = await asyncio.to_thread(self.cache.get_many, keys)
+
+        verdicts: List[Optional[CriterionVerdict]] = []
+        missing = []
+        for i, (criterion, key) in enumerate(zip(criteria, keys)):
+            if key in cached:
+                passed, reason = cached[key]
+                verdicts.append(CriterionVerdict(criterion, passed, reason, cached=True))
+            else:
+                verdicts.append(None)
+                missing.append(i)
+        self.stats["cached_verdicts"] += len(criteria) - len(missing)
+
+        if missing:
+            try:
+                async with self._slots:
+                    judged = await self._judge(transcript, [criteria[i] for i in missing])
+            except Exception as e:
+                self.stats["errors"] += 1
+                print(f"Error evaluating conversation {conversation.call_sid}: {e}")
+                return EvaluationResult(call_sid=conversation.call_sid, error=str(e))
+
+            fresh = {}
+            for i, (passed, reason) in zip(missing, judged):
+                verdicts[i] = CriterionVerdict(criteria[i], passed, reason)
+                fresh[keys[i]] = (passed, reason)
+            await asyncio.to_thread(self.cache.put_many, fresh)
+            self.stats["fresh_verdicts"] += len(fresh)
+
+        return EvaluationResult(verdicts=verdicts, call_sid=conversation.call_sid)
+
+    async def _judge(self, transcript: str, criteria: List[str]) -> List[Tuple[bool, str]]:
+        """Ask the model for one verdict per criterion, in the order given."""
+        numbered = "\n".join(f"{i}. {criterion}" for i, criterion in enumerate(criteria))
+        self.stats["requests"] += 1
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            temperature=0,
+            response_format={"type": "json_schema", "json_schema": VERDICT_SCHEMA},
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": f"Transcript:\n{transcript}\n\nCriteria:\n{numbered}"},
+            ],
+        )
+        by_index = {
+            verdict["index"]: (bool(verdict["passed"]), verdict["reason"])
+            for verdict in json.loads(response.choices[0].message.content)["verdicts"]
+        }
+        if set(by_index) != set(range(len(criteria))):
+            raise ValueError(f"judge returned verdicts for {sorted(by_index)}, expected 0..{len(criteria) - 1}")
+        return [by_index[i] for i in range(len(criteria))]
@@ -0,0 +1,156 @@
+import json
+import queue
+import random
+import sys
+import threading
+import time
+from typing import Dict, Optional, TextIO
+from pathlib import Path
+
+# Add the project root to the Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from config import (
+    FRAME_LOG_PATH, FRAME_LOG_SAMPLE_RATES, FRAME_LOG_MAX_FIELD_CHARS,
+    FRAME_LOG_QUEUE_SIZE, FRAME_LOG_FLUSH_INTERVAL
+)
+
+from pipecat.frames.frames import Frame
+from pipecat.processors.frame_processor import FrameProcessor, FrameDirection
+
+# Frame fields that identify the frame object rather than describe it.
+SKIPPED_FIELDS = ("id", "name", "pts")
+
+def loggable(value, max_chars: int = FRAME_LOG_MAX_FIELD_CHARS):
+    """A JSON-safe, bounded form of a field: byte payloads become their length, long text is cut."""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {"bytes": len(value)}
+    text = value if isinstance(value, str) else repr(value)
+    if len(text) > max_chars:
+        return f"{text[:max_chars]}...(+{len(text) - max_chars} chars)"
+    return text
+
+class FrameLog:
+    """
+    Structured log events, written as JSON lines by a background thread.
+
+    `emit` only builds a dict and puts it on a bounded queue, so logging
+    never waits on the console or disk. If the writer falls behind and the
+    queue fills, further events are dropped and counted instead of slowing
+    the pipeline down.
+
+    Attributes:
+        path (str): File the events are appended to. Defaults to FRAME_LOG_PATH (stdout if unset).
+        stats (dict): Events written and dropped.
+    """
+
+    def __init__(self, path: Optional[str] = FRAME_LOG_PATH, queue_size: int = FRAME_LOG_QUEUE_SIZE,
+                 flush_interval: float = FRAME_LOG_FLUSH_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[dict]" = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"written": 0, "dropped": 0}
+
+    def emit(self, kind: str, **fields):
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait({"ts": round(time.time(), 6), "event": kind, **fields})
+        except queue.Full:
+            self.stats["dropped"] += 1
+
+    def flush(self, timeout: float = 5.0):
+        """Wait until every queued event has been written (for tests and shutdown)."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._write_loop, name="frame-log", daemon=True)
+                self._thread.start()
+
+    def _open(self) -> TextIO:
+        if self.path is None:
+            return sys.stdout
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        return open(self.path, "a", encoding="utf-8")
+
+    def _write_loop(self):
+        out = self._open()
+        while True:
+            events = [self._queue.get()]
+            # Take whatever else is queued so one write covers the whole batch.
+            while True:
+                try:
+                    events.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                out.write("".join(json.dumps(event, default=str) + "\n" for event in events))
+                out.flush()
+                self.stats["written"] += len(events)
+            except Exception as e:
+                print(f"Error writing frame log: {e}")
+            for _ in events:
+                self._queue.task_done()
+            time.sleep(self.flush_interval)
+
+class FrameLogger(FrameProcessor):
+    """
+    Pass-through processor that logs the frames going by as structured events.
+
+    Which frames are logged, and how often, is set per frame type by
+    `sample_rates`: a frame uses the rate of its class or the nearest base
+    class listed, and types not listed at all are not logged. The decision
+    is cached per type, so unlogged frames (raw audio, mostly) cost one
+    dict lookup.
+
+    Attributes:
+        log (FrameLog): Where events go.
+        call_sid (str): Call the pipeline belongs to, added to every event.
+        stage (str): Where in the pipeline this logger sits (e.g. "stt", "llm").
+        sample_rates (dict): Frame class name -> share of those frames logged (0 to 1).
+    """
+
+    def __init__(self, log: FrameLog, call_sid: str, stage: str,
+                 sample_rates: Dict[str, float] = FRAME_LOG_SAMPLE_RATES,
+                 max_field_chars: int = FRAME_LOG_MAX_FIELD_CHARS, **kwargs):
+        super().__init__(**kwargs)
+        self.log = log
+        self.call_sid = call_sid
+        self.stage = stage
+        self.sample_rates = sample_rates
+        self.max_field_chars = max_field_chars
+        self._rates: Dict[type, float] = {}
+
+    def _rate(self, frame_type: type) -> float:
+        rate = self._rates.get(frame_type)
+        if rate is None:
+            rate = next(
+                (self.sample_rates[cls.__name__] for cls in frame_type.__mro__ if cls.__name__ in self.sample_rates),
+                0.0,
+            )
+            self._rates[frame_type] = rate
+        return rate
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        rate = self._rate(type(frame))
+        if rate >= 1.0 or (rate > 0.0 and random.random() < rate):
+            fields = {
+                key: loggable(value, self.max_field_chars)
+                for key, value in vars(frame).items()
+                if key not in SKIPPED_FIELDS and not key.startswith("_")
+            }
+            self.log.emit(
+                "frame", call_sid=self.call_sid, stage=self.stage, frame=type(frame).__name__,
+                direction=direction.name.lower(), sample_rate=rate, fields=fields,
+            )
+        await self.push_frame(frame, direction)
@@ -0,0 +1,66 @@
+import asyncio
+import time
+from collections import deque
+from typing import Optional
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from config import LOOP_LAG_INTERVAL, LOOP_LAG_WINDOW
+from services.stats import percentile
+
+class LoopLagMonitor:
+    """
+    Measures event loop lag: how late a periodic timer wakes up.
+
+    Anything that blocks the loop (synchronous I/O, heavy CPU work in a
+    coroutine) shows up as lag, and on this server lag delays the media
+    frames of every live call.
+
+    Attributes:
+        interval (float): Seconds between samples. Defaults to LOOP_LAG_INTERVAL.
+        window (int): Number of recent samples kept. Defaults to LOOP_LAG_WINDOW.
+    """
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL, window: int = LOOP_LAG_WINDOW):
+        self.interval = interval
+        self.samples = deque(maxlen=window)  # lag in ms
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def reset(self):
+        self.samples.clear()
+
+    async def _run(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - expected) * 1000.0)
+
+    @property
+    def current(self) -> float:
+        return self.samples[-1] if self.samples else 0.0
+
+    def stats(self) -> dict:
+        ordered = sorted(self.samples)
+        return {
+            "samples": len(ordered),
+            "p50_ms": round(percentile(ordered, 50), 2),
+            "p99_ms": round(percentile(ordered, 99), 2),
+            "max_ms": round(ordered[-1], 2) if ordered else 0.0,
+        }
@@ -0,0 +1,354 @@
+import asyncio
+import audioop
+from typing import Awaitable, Callable, List, Optional
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from config import (
+    SAMPLE_RATE, LOOPBACK_MAX_TURNS, LOOPBACK_TIMEOUT, LOOPBACK_MAX_CONCURRENCY, LOOPBACK_TESTER_PROMPT
+)
+from models.agent import Agent
+from models.loopback import (
+    LoopbackScenario, LoopbackResult, ENDED_BY_AGENT, ENDED_BY_TESTER, ENDED_MAX_TURNS, ENDED_TIMEOUT
+)
+from services.agent_registry import compile_agent
+from services.call_metrics import CallActivity
+from services.tracing import CallTrace, USER_STARTED, USER_STOPPED, BOT_STARTED, BOT_STOPPED, END_CALL
+
+from pipecat.frames.frames import (
+    CancelFrame,
+    EndFrame,
+    Frame,
+    InputAudioRawFrame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    StartFrame,
+    TextFrame,
+    TranscriptionFrame,
+    TTSAudioRawFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineParams, PipelineTask
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.utils.time import time_now_iso8601
+
+# Seconds a finished conversation gets to flush its last frames before it is cancelled.
+DRAIN_TIMEOUT = 5.0
+
+# Items queued on a LoopbackInput
+_TEXT, _START, _AUDIO, _STOP = range(4)
+
+class LoopbackInput(FrameProcessor):
+    """
+    Stands in for the transport input of one side of a loopback conversation:
+    what the other side says is pushed into this side's pipeline as if a
+    caller had said it. With text_only, each utterance arrives as a
+    transcription between user started/stopped speaking frames, so no STT is
+    needed; otherwise its audio is resampled to SAMPLE_RATE for this side's
+    STT. Utterance boundaries are exact, so no VAD runs either.
+    """
+
+    def __init__(self, trace: Optional[CallTrace] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.trace = trace  # Marks the speech timeline, for the agent's side
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self._ratecv_state = None
+
+    def say(self, text: str):
+        self._queue.put_nowait((_TEXT, text))
+
+    def start_utterance(self):
+        self._queue.put_nowait((_START, None))
+
+    def audio(self, audio: bytes, sample_rate: int):
+        self._queue.put_nowait((_AUDIO, (audio, sample_rate)))
+
+    def stop_utterance(self):
+        self._queue.put_nowait((_STOP, None))
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        await self.push_frame(frame, direction)
+        if isinstance(frame, StartFrame) and self._task is None:
+            # Utterances said before the pipeline started wait in the queue
+            self._task = asyncio.create_task(self._deliver())
+        elif isinstance(frame, (EndFrame, CancelFrame)) and self._task:
+            self._task.cancel()
+
+    async def _deliver(self):
+        while True:
+            kind, value = await self._queue.get()
+            if kind in (_TEXT, _START):
+                self._mark(USER_STARTED)
+                await self.push_frame(UserStartedSpeakingFrame())
+                self._ratecv_state = None
+            if kind == _TEXT:
+                await self.push_frame(TranscriptionFrame(value, "loopback", time_now_iso8601()))
+            elif kind == _AUDIO:
+                audio, sample_rate = value
+                if sample_rate != SAMPLE_RATE:
+                    audio, self._ratecv_state = audioop.ratecv(
+                        audio, 2, 1, sample_rate, SAMPLE_RATE, self._ratecv_state
+                    )
+                await self.push_frame(InputAudioRawFrame(audio, SAMPLE_RATE, 1))
+            if kind in (_TEXT, _STOP):
+                self._mark(USER_STOPPED)
+                await self.push_frame(UserStoppedSpeakingFrame())
+
+    def _mark(self, event: str):
+        if self.trace:
+            self.trace.mark_timeline(event)
+
+    async def cleanup(self):
+        if self._task:
+            self._task.cancel()
+        await super().cleanup()
+
+class LoopbackOutput(FrameProcessor):
+    """
+    Stands in for the transport output of one side: each complete reply
+    (everything between the LLM's response start and end frames, which TTS
+    services forward after the reply's audio) goes to the other side's
+    LoopbackInput, as text or, unless text_only, as TTS audio forwarded as it
+    is produced rather than at playback speed. on_reply(text) is awaited
+    before the reply is handed over; returning False holds it back (the
+    conversation is over).
+    """
+
+    def __init__(self, peer: LoopbackInput, on_reply: Callable[[str], Awaitable[bool]],
+                 text_only: bool = True, trace: Optional[CallTrace] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.peer = peer
+        self.on_reply = on_reply
+        self.text_only = text_only
+        self.trace = trace  # Marks the speech timeline, for the agent's side
+        self._reply: Optional[List[str]] = None
+        self._speaking = False
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if direction == FrameDirection.DOWNSTREAM:
+            if isinstance(frame, LLMFullResponseStartFrame):
+                self._reply = []
+                self._speaking = False
+            elif self._reply is not None and isinstance(frame, TextFrame) and not isinstance(frame, TranscriptionFrame):
+                self._reply.append(frame.text)
+                if self.text_only:
+                    # Like a TTS service, hand the assistant aggregator the whole reply at the end
+                    self._begin()
+                    return
+            elif self._reply is not None and isinstance(frame, TTSAudioRawFrame) and not self.text_only:
+                if self._begin():
+                    self.peer.start_utterance()
+                self.peer.audio(frame.audio, frame.sample_rate)
+            elif isinstance(frame, LLMFullResponseEndFrame) and self._reply is not None:
+                text = "".join(self._reply).strip()
+                if self.text_only and text:
+                    await self.push_frame(TextFrame(text))
+                await self._finish(text)
+        await self.push_frame(frame, direction)
+
+    def _begin(self) -> bool:
+        """Mark the reply as started; True the first time."""
+        if self._speaking:
+            return False
+        self._speaking = True
+        if self.trace:
+            self.trace.mark_timeline(BOT_STARTED)
+        return True
+
+    async def _finish(self, text: str):
+        spoke = self._speaking
+        self._reply = None
+        self._speaking = False
+        if spoke and self.trace:
+            self.trace.mark_timeline(BOT_STOPPED)
+        if not text and not spoke:
+            return  # The LLM only called a function
+        deliver = await self.on_reply(text)
+        if self.text_only:
+            if deliver:
+                self.peer.say(text)
+        elif spoke:
+            self.peer.stop_utterance()
+
+class LoopbackConversation:
+    """
+    A tester persona and the agent under test talking in process.
+
+    Both sides are call sessions built by CallBot.build_session (the same
+    providers, system messages and tools as a phone call), joined by a
+    LoopbackOutput/LoopbackInput pair in each direction instead of Twilio.
+    Either side can end the conversation with end_call; it is also cut off
+    after max_turns agent replies or `timeout` seconds. The agent's side
+    keeps a CallTrace speech timeline, so the usual call quality metrics
+    apply to the result.
+
+    Attributes:
+        result (LoopbackResult): Filled in as the conversation runs.
+        trace (CallTrace): The agent's speech timeline.
+        text_only (bool): Exchange text instead of audio, skipping STT and TTS.
+    """
+
+    def __init__(self, bot, scenario: LoopbackScenario, agent, text_only: bool = True,
+                 timeout: float = LOOPBACK_TIMEOUT):
+        self.result = LoopbackResult(scenario)
+        self.trace = CallTrace(self.result.call_sid)
+        self.text_only = text_only
+        self.timeout = timeout
+        self.max_turns = scenario.max_turns or LOOPBACK_MAX_TURNS
+        self._done = asyncio.Event()
+
+        call_sid = self.result.call_sid
+        tester = compile_agent(Agent(
+            name=f"tester:{scenario.name or 'scenario'}",
+            prompt=f"{LOOPBACK_TESTER_PROMPT}\n\n{scenario.persona}",
+            agent_id=f"tester-{call_sid}",
+        ))
+        self.agent_session = bot.build_session(call_sid, agent, on_end_call=self._end_call(ENDED_BY_AGENT))
+        self.tester_session = bot.build_session(call_sid, tester, on_end_call=self._end_call(ENDED_BY_TESTER))
+        self.agent_input = LoopbackInput(self.trace)
+        self.tester_input = LoopbackInput()
+        agent_output = LoopbackOutput(self.tester_input, self._agent_replied, text_only, self.trace)
+        tester_output = LoopbackOutput(self.agent_input, self._tester_said, text_only)
+        self.agent_task = self._task(self.agent_session, self.agent_input, agent_output)
+        self.tester_task = self._task(self.tester_session, self.tester_input, tester_output)
+
+    def _task(self, session, input: LoopbackInput, output: LoopbackOutput) -> PipelineTask:
+        aggregator = session.context_aggregator
+        if self.text_only:
+            stages = [input, aggregator.user(), session.llm, output, aggregator.assistant()]
+        else:
+            stages = [input, session.stt, aggregator.user(), session.llm, session.tts, output, aggregator.assistant()]
+        # Turns never overlap, so there is nothing to interrupt
+        return PipelineTask(Pipeline(stages), params=PipelineParams(allow_interruptions=False))
+
+    def _end_call(self, reason: str):
+        async def end_call(call_sid: str, llm):
+            if reason == ENDED_BY_AGENT:
+                self.trace.mark_timeline(END_CALL)
+            self._finish(reason)
+        return end_call
+
+    def _finish(self, reason: str):
+        if not self._done.is_set():
+            self.result.ended_by = reason
+            self._done.set()
+
+    async def _agent_replied(self, text: str) -> bool:
+        if self._done.is_set():
+            return False
+        self.result.turns += 1
+        if self.result.turns >= self.max_turns:
+            self._finish(ENDED_MAX_TURNS)
+        return not self._done.is_set()
+
+    async def _tester_said(self, text: str) -> bool:
+        if self._done.is_set():
+            return False
+        self.result.said.append(text)
+        return True
+
+    async def _release_unused(self):
+        """Text-only conversations never start their STT and TTS services."""
+        for session in (self.agent_session, self.tester_session):
+            for service in (session.stt, session.tts):
+                try:
+                    await service.release()
+                except Exception as e:
+                    print(f"Error releasing {service}: {e}")
+
+    async def run(self) -> LoopbackResult:
+        runners = [
+            asyncio.create_task(PipelineRunner(handle_sigint=False).run(task))
+            for task in (self.agent_task, self.tester_task)
+        ]
+        try:
+            opening = self.result.scenario.opening
+            if opening:
+                self.tester_session.messages.append({"role": "assistant", "content": opening})
+                self.result.said.append(opening)
+                # Even with audio, the scripted line reaches the agent as text: no TTS has spoken it
+                self.agent_input.say(opening)
+            else:
+                # The tester's LLM opens the conversation from its persona
+                from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContextFrame
+                await self.tester_task.queue_frame(OpenAILLMContextFrame(self.tester_session.context))
+            try:
+                await asyncio.wait_for(self._done.wait(), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                self._finish(ENDED_TIMEOUT)
+        finally:
+            # Both sides drain, so the agent's last reply lands in its context
+            tasks = (self.agent_task, self.tester_task)
+            for task in tasks:
+                await task.queue_frame(EndFrame())
+            await asyncio.wait(runners, timeout=DRAIN_TIMEOUT)
+            for task, runner in zip(tasks, runners):
+                if not runner.done():
+                    await task.cancel()
+            await asyncio.wait(runners, timeout=DRAIN_TIMEOUT)
+            self.result.duration = self.trace.elapsed()
+            if self.text_only:
+                await self._release_unused()
+            self.result.messages = list(self.agent_session.messages)
+            self.result.timeline = list(self.trace.timeline)
+        return self.result
+
+class LoopbackRunner:
+    """
+    Runs a suite of loopback conversations, many at once.
+
+    Attributes:
+        bot (CallBot): Builds both sides' sessions and resolves the agent under test.
+        text_only (bool): Exchange text instead of audio, skipping STT and TTS. Defaults to True.
+        max_concurrency (int): Conversations running at once. Defaults to LOOPBACK_MAX_CONCURRENCY.
+        timeout (float): Wall-clock limit per conversation, in seconds. Defaults to LOOPBACK_TIMEOUT.
+    """
+
+    def __init__(self, bot, text_only: bool = True, max_concurrency: int = LOOPBACK_MAX_CONCURRENCY,
+                 timeout: float = LOOPBACK_TIMEOUT):
+        self.bot = bot
+        self.text_only = text_only
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+
+    async def run(self, scenarios: List[LoopbackScenario]) -> List[LoopbackResult]:
+        """Run every scenario; results are in scenario order."""
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+
+        async def run_one(scenario: LoopbackScenario) -> LoopbackResult:
+            async with semaphore:
+                return await self.run_scenario(scenario)
+
+        return await asyncio.gather(*(run_one(scenario) for scenario in scenarios))
+
+    async def run_scenario(self, scenario: LoopbackScenario) -> LoopbackResult:
+        agent = await self.bot.compiled_agent(scenario.agent)
+        if agent is None:
+            return LoopbackResult(scenario, error=f"unknown agent: {scenario.agent}")
+        try:
+            conversation = LoopbackConversation(self.bot, scenario, agent, self.text_only, self.timeout)
+            return await conversation.run()
+        except Exception as e:
+            print(f"Error running loopback scenario {scenario.name}: {e}")
+            return LoopbackResult(scenario, error=str(e))
+
+def loopback_activity(result: LoopbackResult, score_transcript: bool = False) -> CallActivity:
+    """
+    The result as input to the call quality metrics. With score_transcript
+    (audio conversations), the agent's transcript is scored against what
+    the tester actually said.
+    """
+    return CallActivity(
+        result.call_sid, result.messages, result.timeline, result.duration,
+        list(result.said) if score_transcript else None,
+    )
@@ -0,0 +1,40 @@
+from typing import Optional
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from pipecat.frames.frames import CancelFrame
+from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext
+from pipecat.services.openai import OpenAILLMService
+
+from services.speculation import Speculator
+
+class WarmOpenAILLMService(OpenAILLMService):
+    """OpenAILLMService that opens its pooled HTTPS connection ahead of the first completion."""
+
+    async def prewarm(self):
+        # A cheap metadata request leaves a keep-alive connection in the
+        # client's pool for the first chat completion to reuse.
+        await self._client.with_options(max_retries=0).models.retrieve(self.model_name)
+
+    async def release(self):
+        await self.cancel(CancelFrame())
+        await self.cleanup()
+        await self._client.close()
+
+class SpeculativeOpenAILLMService(WarmOpenAILLMService):
+    """WarmOpenAILLMService that answers from a speculative draft when one matches the context."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.speculator: Optional[Speculator] = None
+
+    async def _stream_chat_completions(self, context: OpenAILLMContext):
+        if self.speculator is not None:
+            stream = self.speculator.claim(context)
+            if stream is not None:
+                return stream
+        return await super()._stream_chat_completions(context)
@@ -0,0 +1,135 @@
+import importlib
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from config import (
+    OPENAI_API_KEY, DEEPGRAM_API_KEY, CARTESIA_API_KEY,
+    STT_PROVIDER, LLM_PROVIDER, TTS_PROVIDER, VAD_PROVIDER
+)
+
+PROVIDER_KINDS = ("stt", "llm", "tts", "vad")
+
+@dataclass
+class ProviderSpec:
+    """
+    Where a provider backend lives and how it is built.
+
+    Attributes:
+        target (str): "module:attribute" of the service class (or any factory).
+        options (dict): Keyword arguments for every instance, e.g. API keys.
+        warmup (str): Optional "module:function" run by ProviderRegistry.warmup(),
+            e.g. to load a model or open a cache before the first call.
+    """
+    target: str
+    options: dict = field(default_factory=dict)
+    warmup: Optional[str] = None
+
+def load_attribute(target: str):
+    """Import "module:attribute" and return the attribute."""
+    module_name, _, attribute = target.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+DEFAULT_PROVIDERS: Dict[str, Dict[str, ProviderSpec]] = {
+    "stt": {
+        "deepgram": ProviderSpec("services.deepgram_stt:WarmDeepgramSTTService", {"api_key": DEEPGRAM_API_KEY}),
+    },
+    "llm": {
+        "openai": ProviderSpec(
+            "services.openai_llm:SpeculativeOpenAILLMService", {"api_key": OPENAI_API_KEY, "model": "gpt-4o"}
+        ),
+    },
+    "tts": {
+        "cartesia": ProviderSpec(
+            "services.tts_cache:CachingCartesiaTTSService", {"api_key": CARTESIA_API_KEY},
+            warmup="services.tts_cache:get_tts_cache",
+        ),
+    },
+    "vad": {
+        "silero": ProviderSpec("services.vad:SharedSileroVADAnalyzer", warmup="services.vad:get_shared_vad_model"),
+    },
+}
+
+class ProviderRegistry:
+    """
+    STT, LLM, TTS and VAD backends by name, imported on first use.
+
+    Vendor SDKs are slow to import, so nothing is imported when the
+    registry is built: a backend's module is loaded the first time a call
+    (or warmup()) needs it, and only the selected backend of each kind is
+    ever loaded. Import and warmup times are kept for /startup.
+
+    Attributes:
+        selected (dict): Backend name per kind. Defaults to the *_PROVIDER settings.
+        specs (dict): kind -> name -> ProviderSpec. Defaults to DEFAULT_PROVIDERS.
+    """
+
+    def __init__(self, selected: Optional[Dict[str, str]] = None,
+                 specs: Optional[Dict[str, Dict[str, ProviderSpec]]] = None):
+        self.specs = {kind: dict(backends) for kind, backends in (specs or DEFAULT_PROVIDERS).items()}
+        defaults = {"stt": STT_PROVIDER, "llm": LLM_PROVIDER, "tts": TTS_PROVIDER, "vad": VAD_PROVIDER}
+        self.selected = {kind: name for kind, name in defaults.items() if kind in self.specs}
+        self.selected.update(selected or {})
+        for kind in self.selected:
+            self.spec(kind)  # an unknown name fails here, not on the first call
+        self.timings = {kind: {} for kind in self.selected}  # kind -> {"import_ms", "warmup_ms"}
+        self._loaded = {}
+
+    def register(self, kind: str, name: str, spec: ProviderSpec):
+        """Add (or replace) a backend. It is still imported only when selected and used."""
+        self.specs.setdefault(kind, {})[name] = spec
+
+    def select(self, kind: str, name: str):
+        self.spec(kind, name)
+        self.selected[kind] = name
+        self._loaded.pop(kind, None)
+        self.timings[kind] = {}
+
+    def spec(self, kind: str, name: Optional[str] = None) -> ProviderSpec:
+        name = name or self.selected.get(kind)
+        try:
+            return self.specs[kind][name]
+        except KeyError:
+            raise ValueError(f"unknown {kind} provider: {name}") from None
+
+    def load(self, kind: str):
+        """The selected backend's class for `kind`, importing its module the first time."""
+        loaded = self._loaded.get(kind)
+        if loaded is None:
+            start = time.perf_counter()
+            loaded = load_attribute(self.spec(kind).target)
+            self.timings[kind].setdefault("import_ms", round((time.perf_counter() - start) * 1000, 1))
+            self._loaded[kind] = loaded
+        return loaded
+
+    def create(self, kind: str, **options):
+        """A new instance of the selected backend, with its spec's options overridden by `options`."""
+        return self.load(kind)(**{**self.spec(kind).options, **options})
+
+    def warmup(self, kinds: Iterable[str] = PROVIDER_KINDS) -> dict:
+        """
+        Import every selected backend and run its warmup hook. This blocks,
+        so servers run it on a thread once they are accepting connections.
+        """
+        for kind in kinds:
+            if kind not in self.selected:
+                continue
+            self.load(kind)
+            spec = self.spec(kind)
+            if spec.warmup and "warmup_ms" not in self.timings[kind]:
+                start = time.perf_counter()
+                load_attribute(spec.warmup)()
+                self.timings[kind]["warmup_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return self.stats()
+
+    def stats(self) -> dict:
+        return {
+            kind: {"name": name, "loaded": kind in self._loaded, **self.timings[kind]}
+            for kind, name in self.selected.items()
+        }
@@ -0,0 +1,287 @@
+import audioop
+import random
+import threading
+import time
+import wave
+from typing import Callable, Dict, List, Optional
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to the Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from config import (
+    RECORDING_DIR, RECORDING_SAMPLE_FRACTION, RECORDING_AUDIO_RATE,
+    RECORDING_BUFFER_SECONDS, RECORDING_FLUSH_INTERVAL
+)
+
+from pipecat.frames.frames import Frame, InputAudioRawFrame, OutputAudioRawFrame
+from pipecat.processors.frame_processor import FrameProcessor, FrameDirection
+
+# Recording channels: left is the caller, right is the agent.
+CHANNEL_IN = 0
+CHANNEL_OUT = 1
+
+# A frame arriving this late after the previous one starts after a stretch of silence.
+GAP_SECONDS = 0.1
+# How far behind real time the writer stays, so slightly late frames still land in place.
+WRITER_LAG_SECONDS = 0.5
+
+class AudioRing:
+    """
+    Fixed-size int16 ring buffer with absolute read/write positions.
+
+    Positions count samples since the start of the call, so the writer can
+    line the two legs up by time. If the writer falls more than `capacity`
+    behind, the oldest audio is overwritten and counted in `overruns`.
+    """
+
+    def __init__(self, sample_rate: int, seconds: float, start: int = 0):
+        self.sample_rate = sample_rate
+        self.capacity = int(sample_rate * seconds)
+        self.buffer = np.zeros(self.capacity, dtype=np.int16)
+        self.written = start
+        self.read = start
+        self.overruns = 0
+
+    def write(self, samples: np.ndarray):
+        count = len(samples)
+        if count > self.capacity:
+            samples = samples[-self.capacity:]
+            self.written += count - self.capacity
+            count = self.capacity
+        start = self.written % self.capacity
+        first = min(count, self.capacity - start)
+        self.buffer[start:start + first] = samples[:first]
+        if first < count:
+            self.buffer[:count - first] = samples[first:]
+        self.written += count
+
+    def pad_to(self, position: int):
+        """Write silence up to `position` (only the part that still fits in the ring is zeroed)."""
+        missing = position - self.written
+        if missing <= 0:
+            return
+        if missing > self.capacity:
+            self.written = position - self.capacity
+            missing = self.capacity
+        self.write(np.zeros(missing, dtype=np.int16))
+
+    def take(self, position: int) -> np.ndarray:
+        """Copy out everything from the read position up to `position`."""
+        if self.written - self.read > self.capacity:
+            self.overruns += self.written - self.read - self.capacity
+            self.read = self.written - self.capacity
+        position = min(position, self.written)
+        count = max(0, position - self.read)
+        start = self.read % self.capacity
+        first = min(count, self.capacity - start)
+        out = np.empty(count, dtype=np.int16)
+        out[:first] = self.buffer[start:start + first]
+        out[first:] = self.buffer[:count - first]
+        self.read += count
+        return out
+
+class CallRecording:
+    """
+    One call's two audio legs, buffered for the background writer.
+
+    The pipeline side only copies each frame's samples into the channel's
+    ring (allocated once, on the channel's first frame, at its native rate).
+    Resampling, interleaving and file I/O all happen on the writer thread.
+
+    Attributes:
+        call_sid (str): The call being recorded.
+        path (Path): The stereo WAV file being written.
+    """
+
+    def __init__(self, call_sid: str, path: Path, audio_rate: int = RECORDING_AUDIO_RATE,
+                 buffer_seconds: float = RECORDING_BUFFER_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.call_sid = call_sid
+        self.path = path
+        self.audio_rate = audio_rate
+        self.buffer_seconds = buffer_seconds
+        self.clock = clock
+        self.started = clock()
+        self.stopped = False
+        self._rings: List[Optional[AudioRing]] = [None, None]
+        self._lock = threading.Lock()
+        self._wav: Optional[wave.Wave_write] = None
+        self._ratecv_state = [None, None]
+        self._pending = [np.empty(0, dtype=np.int16), np.empty(0, dtype=np.int16)]
+        self._seconds_taken = 0.0
+
+    def feed(self, channel: int, audio: bytes, sample_rate: int):
+        samples = np.frombuffer(audio, dtype=np.int16)
+        with self._lock:
+            ring = self._rings[channel]
+            if ring is None:
+                # Start where the writer is; earlier time was already written as silence.
+                start = int(self._seconds_taken * sample_rate)
+                ring = self._rings[channel] = AudioRing(sample_rate, self.buffer_seconds, start)
+            position = int((self.clock() - self.started) * ring.sample_rate)
+            if position - ring.written > GAP_SECONDS * ring.sample_rate:
+                ring.pad_to(position)
+            ring.write(samples)
+
+    def stop(self):
+        self.stopped = True
+
+    def drain(self, final: bool = False) -> bool:
+        """Move buffered audio into the WAV file. Returns True once the recording is finished."""
+        if final:
+            with self._lock:
+                until = max(
+                    (ring.written / ring.sample_rate for ring in self._rings if ring), default=0.0
+                )
+        else:
+            until = self.clock() - self.started - WRITER_LAG_SECONDS
+        if until > self._seconds_taken:
+            chunks = []
+            with self._lock:
+                for ring in self._rings:
+                    if ring is None:
+                        chunks.append(None)
+                        continue
+                    position = int(until * ring.sample_rate)
+                    ring.pad_to(position)
+                    chunks.append((ring.take(position), ring.sample_rate))
+                silence = int(until * self.audio_rate) - int(self._seconds_taken * self.audio_rate)
+                self._seconds_taken = until
+            self._write(chunks, silence)
+        if final:
+            self._close()
+        return final
+
+    def _write(self, chunks, silence: int):
+        for channel, chunk in enumerate(chunks):
+            if chunk is None:
+                # This leg has not produced audio yet: it is silent.
+                samples = np.zeros(silence, dtype=np.int16)
+            else:
+                samples, rate = chunk
+                if rate != self.audio_rate:
+                    converted, self._ratecv_state[channel] = audioop.ratecv(
+                        samples.tobytes(), 2, 1, rate, self.audio_rate, self._ratecv_state[channel]
+                    )
+                    samples = np.frombuffer(converted, dtype=np.int16)
+            self._pending[channel] = np.concatenate([self._pending[channel], samples])
+
+        count = min(len(self._pending[CHANNEL_IN]), len(self._pending[CHANNEL_OUT]))
+        if count == 0:
+            return
+        stereo = np.empty((count, 2), dtype=np.int16)
+        stereo[:, CHANNEL_IN] = self._pending[CHANNEL_IN][:count]
+        stereo[:, CHANNEL_OUT] = self._pending[CHANNEL_OUT][:count]
+        self._pending = [pending[count:] for pending in self._pending]
+        if self._wav is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._wav = wave.open(str(self.path), "wb")
+            self._wav.setnchannels(2)
+            self._wav.setsampwidth(2)
+            self._wav.setframerate(self.audio_rate)
+        self._wav.writeframes(stereo.tobytes())
+
+    def _close(self):
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
+
+    @property
+    def overruns(self) -> int:
+        return sum(ring.overruns for ring in self._rings if ring)
+
+class CallRecorder:
+    """
+    Decides which calls to record and runs the thread that writes them.
+
+    A call is recorded if it was explicitly switched on when it was started,
+    or otherwise with probability `sample_fraction`. Unrecorded calls get no
+    recorder taps at all.
+
+    Attributes:
+        directory (Path): Where WAV files are written, one per call SID.
+        sample_fraction (float): Share of calls recorded by default. Defaults to RECORDING_SAMPLE_FRACTION.
+    """
+
+    def __init__(self, directory: str = RECORDING_DIR, sample_fraction: float = RECORDING_SAMPLE_FRACTION,
+                 flush_interval: float = RECORDING_FLUSH_INTERVAL):
+        self.directory = Path(directory)
+        self.sample_fraction = sample_fraction
+        self.flush_interval = flush_interval
+        self._active: Dict[str, CallRecording] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"recorded": 0, "skipped": 0, "overruns": 0}
+
+    def should_record(self, enabled: Optional[bool] = None) -> bool:
+        """`enabled` overrides sampling; None samples."""
+        if enabled is None:
+            enabled = random.random() < self.sample_fraction
+        return enabled
+
+    def start(self, call_sid: str, enabled: Optional[bool] = None) -> Optional[CallRecording]:
+        """
+        Begin recording the call if it is selected; returns None otherwise.
+        `enabled` switches recording on or off for this call, overriding sampling.
+        """
+        if not self.should_record(enabled):
+            self.stats["skipped"] += 1
+            return None
+        recording = CallRecording(call_sid, self.recording_path(call_sid))
+        with self._lock:
+            self._active[call_sid] = recording
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._write_loop, name="recorder", daemon=True)
+                self._thread.start()
+        self.stats["recorded"] += 1
+        return recording
+
+    def finish(self, recording: CallRecording):
+        recording.stop()
+        self._wakeup.set()
+
+    def recording_path(self, call_sid: str) -> Path:
+        return self.directory / f"{call_sid}.wav"
+
+    def _write_loop(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            with self._lock:
+                recordings = list(self._active.values())
+            for recording in recordings:
+                try:
+                    finished = recording.drain(final=recording.stopped)
+                except Exception as e:
+                    print(f"Error writing recording for {recording.call_sid}: {e}")
+                    finished = recording.stopped
+                if finished:
+                    self.stats["overruns"] += recording.overruns
+                    with self._lock:
+                        self._active.pop(recording.call_sid, None)
+
+class AudioRecorderTap(FrameProcessor):
+    """
+    Pass-through processor that feeds one leg of the call into a CallRecording.
+
+    Place the CHANNEL_IN tap after transport.input() and the CHANNEL_OUT tap
+    after transport.output(), which forwards audio as it is sent.
+    """
+
+    def __init__(self, recording: CallRecording, channel: int, **kwargs):
+        super().__init__(**kwargs)
+        self._recording = recording
+        self._channel = channel
+        self._frame_type = InputAudioRawFrame if channel == CHANNEL_IN else OutputAudioRawFrame
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, self._frame_type):
+            self._recording.feed(self._channel, frame.audio, frame.sample_rate)
+        await self.push_frame(frame, direction)
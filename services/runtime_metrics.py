@@ -0,0 +1,124 @@
+import asyncio
+import os
+import resource
+import time
+from typing import Optional
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from config import METRICS_CACHE_SECONDS
+
+# Stages reported as providers, with the stage latencies from the LatencyTracker.
+PROVIDER_STAGES = ("stt", "llm", "tts")
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+def process_memory() -> dict:
+    """Resident and peak resident memory of this process, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_bytes = peak if sys.platform == "darwin" else peak * 1024  # bytes on macOS, KB elsewhere
+    try:
+        with open("/proc/self/statm") as f:
+            rss_bytes = int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        rss_bytes = None  # no procfs (macOS): only the peak is known
+    return {
+        "rss_mb": round(rss_bytes / 2**20, 1) if rss_bytes is not None else None,
+        "peak_rss_mb": round(max(peak_bytes, rss_bytes or 0) / 2**20, 1),
+    }
+
+def queue_depth(processor) -> int:
+    """Frames waiting in a pipecat processor's input queue (0 if it has none)."""
+    # pipecat keeps the queue name-mangled and offers no accessor for it
+    queue = getattr(processor, "_FrameProcessor__input_queue", None)
+    return queue.qsize() if queue is not None else 0
+
+class RuntimeMetrics:
+    """
+    Health and capacity figures for one worker process, served by /metrics.
+
+    Nothing is recorded on the media path for this: every figure is read
+    from state the bot already keeps (live calls, running pipelines, the
+    loop lag monitor, latency traces with their error counts) when a
+    snapshot is taken, and a snapshot is reused for `cache_seconds` so
+    frequent scrapes cost next to nothing.
+
+    Attributes:
+        bot (CallBot): The bot whose calls and pipelines are reported.
+        cache_seconds (float): How long a snapshot is reused. Defaults to METRICS_CACHE_SECONDS.
+    """
+
+    def __init__(self, bot, cache_seconds: float = METRICS_CACHE_SECONDS):
+        self.bot = bot
+        self.cache_seconds = cache_seconds
+        self.started_at = time.time()
+        self._snapshot: Optional[dict] = None
+        self._taken_at = 0.0
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        if self._snapshot is None or now - self._taken_at >= self.cache_seconds:
+            self._snapshot = self._collect()
+            self._taken_at = now
+        return self._snapshot
+
+    def _collect(self) -> dict:
+        bot = self.bot
+        return {
+            "pid": os.getpid(),
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "cpu_s": round(time.process_time(), 2),
+            "memory": process_memory(),
+            "calls": {
+                "active": len(bot.active_calls),
+                "admission": bot.admission.gauges(),
+            },
+            "tasks": {
+                "asyncio": len(asyncio.all_tasks()),
+                "pipelines": len(bot.pipelines),
+            },
+            "frame_queues": self._frame_queues(),
+            "loop_lag_ms": bot.admission.monitor.stats(),
+            "providers": self._providers(),
+        }
+
+    def _frame_queues(self) -> dict:
+        """Frames waiting in the input queues of every running pipeline's processors."""
+        total = 0
+        deepest, deepest_at = 0, None
+        for call_sid, processors in list(self.bot.pipelines.items()):
+            for processor in processors:
+                depth = queue_depth(processor)
+                total += depth
+                if depth > deepest:
+                    deepest, deepest_at = depth, f"{call_sid}:{type(processor).__name__}"
+        return {"queued_frames": total, "max_depth": deepest, "max_depth_at": deepest_at}
+
+    def _providers(self) -> dict:
+        """
+        Per-stage latency percentiles and error rates over the most recent
+        calls. A failed request leaves no latency sample, so the rate is
+        errors over completed requests plus errors.
+        """
+        tracker = self.bot.latency_tracker
+        stages = tracker.summary()["stages"]
+        errors = tracker.error_counts()
+        providers = {}
+        for stage in PROVIDER_STAGES:
+            latency = stages[stage]
+            failed = errors.get(stage, 0)
+            attempts = latency["count"] + failed
+            providers[stage] = {
+                "requests": latency["count"],
+                "errors": failed,
+                "error_rate": round(failed / attempts, 4) if attempts else 0.0,
+                "latency_ms": latency,
+            }
+        providers["other_errors"] = {
+            stage: count for stage, count in errors.items() if stage not in PROVIDER_STAGES
+        }
+        return providers
@@ -0,0 +1,209 @@
+import asyncio
+import difflib
+import re
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from config import SPECULATION_MATCH_RATIO, SPECULATION_MAX_DRAFTS
+
+from pipecat.frames.frames import (
+    Frame,
+    InterimTranscriptionFrame,
+    TranscriptionFrame,
+    UserStartedSpeakingFrame,
+)
+from pipecat.processors.frame_processor import FrameProcessor, FrameDirection
+
+if TYPE_CHECKING:
+    from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext  # loads the OpenAI SDK
+
+def new_speculation_stats() -> dict:
+    return {
+        "drafts": 0,          # completions started on an interim transcript
+        "hits": 0,            # turns answered from a draft
+        "misses": 0,          # turns whose draft did not match the final transcript
+        "no_draft": 0,        # turns with no draft in flight
+        "tokens_reused": 0,   # draft tokens that became the reply
+        "tokens_wasted": 0,   # draft tokens thrown away
+    }
+
+def normalize(text: str) -> str:
+    return " ".join(re.sub(r"[^\w\s']", " ", text.lower()).split())
+
+def similar(a: str, b: str, ratio: float) -> bool:
+    a, b = normalize(a), normalize(b)
+    return a == b or difflib.SequenceMatcher(None, a, b).ratio() >= ratio
+
+class Draft:
+    """
+    A chat completion streaming in the background for a guessed user message.
+
+    Chunks are buffered as they arrive; `replay` yields the buffered ones
+    and then follows the live stream, so a claimed draft continues exactly
+    where the request is.
+    """
+
+    def __init__(self, llm, context: "OpenAILLMContext", text: str):
+        self.text = text
+        self.prefix = [id(message) for message in context.messages]
+        self.chunks: List[object] = []
+        self.tokens = 0
+        self._more = asyncio.Event()
+        messages = list(context.messages) + [{"role": "user", "content": text}]
+        self.task = asyncio.create_task(self._stream(llm, context, messages))
+
+    async def _stream(self, llm, context: "OpenAILLMContext", messages: List[dict]):
+        try:
+            async for chunk in await llm.get_chat_completions(context, messages):
+                self.chunks.append(chunk)
+                if chunk.choices and chunk.choices[0].delta and (
+                    chunk.choices[0].delta.content or chunk.choices[0].delta.tool_calls
+                ):
+                    self.tokens += 1
+                self._more.set()
+        finally:
+            self._more.set()
+
+    def failed(self) -> bool:
+        return self.task.done() and not self.task.cancelled() and self.task.exception() is not None
+
+    def cancel(self):
+        self.task.cancel()
+
+    async def replay(self) -> AsyncIterator[object]:
+        sent = 0
+        try:
+            while True:
+                while sent < len(self.chunks):
+                    yield self.chunks[sent]
+                    sent += 1
+                if self.task.done():
+                    if not self.task.cancelled() and self.task.exception() is not None:
+                        raise self.task.exception()
+                    return
+                self._more.clear()
+                await self._more.wait()
+        finally:
+            # The reply was interrupted: stop generating it.
+            self.task.cancel()
+
+class Speculator:
+    """
+    Starts the LLM on a stable interim transcript and hands the draft to
+    the real request if the final transcript turns out (nearly) the same.
+
+    At most `max_drafts` drafts are started per user turn; a draft for
+    different text cancels the previous one. Counters go into the `stats`
+    dict shared by every call, so the hit rate and wasted tokens can be
+    compared against turn latency.
+
+    Attributes:
+        llm: The call's SpeculativeOpenAILLMService.
+        stats (dict): Shared counters (see new_speculation_stats).
+        match_ratio (float): Minimum similarity of draft and final text. Defaults to SPECULATION_MATCH_RATIO.
+    """
+
+    def __init__(self, llm, stats: dict, match_ratio: float = SPECULATION_MATCH_RATIO,
+                 max_drafts: int = SPECULATION_MAX_DRAFTS):
+        self.llm = llm
+        self.stats = stats
+        self.match_ratio = match_ratio
+        self.max_drafts = max_drafts
+        self._draft: Optional[Draft] = None
+        self._drafts_this_turn = 0
+
+    def new_turn(self):
+        self.cancel()
+        self._drafts_this_turn = 0
+
+    def speculate(self, context: "OpenAILLMContext", text: str):
+        if not text.strip():
+            return
+        if self._draft is not None and normalize(self._draft.text) == normalize(text):
+            return
+        if self._drafts_this_turn >= self.max_drafts:
+            return
+        self.cancel()
+        self._draft = Draft(self.llm, context, text)
+        self._drafts_this_turn += 1
+        self.stats["drafts"] += 1
+
+    def claim(self, context: "OpenAILLMContext") -> Optional[AsyncIterator[object]]:
+        """
+        The draft's stream if it answers this context; otherwise cancel it and return None.
+        Completions that do not answer a new user turn (tool-call follow-ups) are left alone.
+        """
+        messages = context.messages
+        if not messages or messages[-1].get("role") != "user":
+            return None
+        draft, self._draft = self._draft, None
+        self._drafts_this_turn = 0
+        if draft is None:
+            self.stats["no_draft"] += 1
+            return None
+        if (
+            draft.prefix == [id(message) for message in messages[:-1]]
+            and similar(draft.text, messages[-1].get("content") or "", self.match_ratio)
+            and not draft.failed()
+        ):
+            self.stats["hits"] += 1
+            draft.task.add_done_callback(lambda _: self._count_reused(draft))
+            return draft.replay()
+        self.stats["misses"] += 1
+        self._discard(draft)
+        return None
+
+    def _count_reused(self, draft: Draft):
+        self.stats["tokens_reused"] += draft.tokens
+
+    def _discard(self, draft: Draft):
+        draft.cancel()
+        self.stats["tokens_wasted"] += draft.tokens
+
+    def cancel(self):
+        if self._draft is not None:
+            self._discard(self._draft)
+            self._draft = None
+
+class SpeculationTap(FrameProcessor):
+    """
+    Pass-through processor, placed before the user context aggregator, that
+    starts drafts from transcripts before the user turn is closed.
+
+    The guessed user message is the final transcript segments of the turn
+    so far plus the current interim text. A draft starts on each final
+    segment and whenever the same interim text arrives twice in a row
+    (the caller has paused), typically well before VAD ends the turn.
+    """
+
+    def __init__(self, speculator: Speculator, context: "OpenAILLMContext", **kwargs):
+        super().__init__(**kwargs)
+        self._speculator = speculator
+        self._context = context
+        self._finals: List[str] = []
+        self._interim = ""
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, UserStartedSpeakingFrame):
+            self._finals = []
+            self._interim = ""
+            self._speculator.new_turn()
+        elif isinstance(frame, TranscriptionFrame):
+            self._finals.append(frame.text)
+            self._interim = ""
+            self._speculator.speculate(self._context, " ".join(self._finals))
+        elif isinstance(frame, InterimTranscriptionFrame):
+            if frame.text == self._interim:
+                self._speculator.speculate(self._context, " ".join(self._finals + [frame.text]))
+            self._interim = frame.text
+        await self.push_frame(frame, direction)
+
+    async def cleanup(self):
+        self._speculator.cancel()
+        await super().cleanup()
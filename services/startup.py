@@ -0,0 +1,83 @@
+import asyncio
+import os
+import time
+from typing import Optional
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+def process_age() -> Optional[float]:
+    """Seconds since this process started, from procfs (None where there is none)."""
+    try:
+        with open("/proc/self/stat") as f:
+            # the command name may contain spaces; fields after it are fixed
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+    except (OSError, IndexError, ValueError):
+        return None
+    return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+
+class StartupTimings:
+    """
+    How long each part of a worker's cold start took, served by /startup.
+
+    Phases are marked in order while the app is imported, built and run
+    through its startup hooks; the port opens after the last of them. The
+    background warmup that follows (provider imports, VAD model load) is
+    timed separately, per provider, by the ProviderRegistry.
+
+    Attributes:
+        started (float): time.perf_counter() when the app module began importing.
+        interpreter_s (float): Process start until the app module began
+            importing (Python and uvicorn startup). None without procfs.
+        phases (dict): Phase name -> milliseconds, in the order marked.
+    """
+
+    def __init__(self, started: Optional[float] = None):
+        self.started = time.perf_counter() if started is None else started
+        self._last = self.started
+        age = process_age()
+        self.interpreter_s = max(0.0, age - (time.perf_counter() - self.started)) if age is not None else None
+        self.phases = {}
+        self.serving_s: Optional[float] = None
+        self.warmup_ms: Optional[float] = None
+        self.warmup_error: Optional[str] = None
+
+    def mark(self, phase: str):
+        """Record the time since the previous mark as `phase`."""
+        now = time.perf_counter()
+        self.phases[phase] = round((now - self._last) * 1000, 1)
+        self._last = now
+
+    def elapsed(self) -> float:
+        """Seconds since process start (or since the app began importing, without procfs)."""
+        return (self.interpreter_s or 0.0) + time.perf_counter() - self.started
+
+    def serving(self):
+        """The startup hooks are done; uvicorn opens the port next."""
+        self.mark("startup_hooks")
+        self.serving_s = round(self.elapsed(), 3)
+
+    async def warm_up(self, providers):
+        """Import the selected providers and run their warmup hooks, off the event loop."""
+        start = time.perf_counter()
+        try:
+            await asyncio.to_thread(providers.warmup)
+        except Exception as e:
+            self.warmup_error = str(e)
+            print(f"Startup warmup error: {e}")
+        self.warmup_ms = round((time.perf_counter() - start) * 1000, 1)
+
+    def summary(self) -> dict:
+        return {
+            "interpreter_s": round(self.interpreter_s, 3) if self.interpreter_s is not None else None,
+            "phases_ms": dict(self.phases),
+            "serving_s": self.serving_s,
+            "warm": self.warmup_ms is not None,
+            "warmup_ms": self.warmup_ms,
+            "warmup_error": self.warmup_error,
+        }
@@ -0,0 +1,24 @@
+from typing import Dict, List
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(samples: Dict[str, List[float]]) -> dict:
+    """Build percentile summaries (in ms) for each stage's list of samples."""
+    summary = {}
+    for stage, values in samples.items():
+        ordered = sorted(values)
+        stats = {"count": len(ordered)}
+        for pct in PERCENTILES:
+            stats[f"p{pct}"] = round(percentile(ordered, pct), 1)
+        stats["max"] = round(ordered[-1], 1) if ordered else 0.0
+        summary[stage] = stats
+    return summary
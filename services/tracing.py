@@ -0,0 +1,292 @@
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from config import LATENCY_TRACE_RETENTION
+from services.stats import summarize
+
+from pipecat.frames.frames import (
+    BotStartedSpeakingFrame,
+    BotStoppedSpeakingFrame,
+    ErrorFrame,
+    InterimTranscriptionFrame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    OutputAudioRawFrame,
+    TextFrame,
+    TranscriptionFrame,
+    TTSAudioRawFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.processors.frame_processor import FrameProcessor, FrameDirection
+
+# Pipeline positions a probe can be placed at, in pipeline order.
+PROBE_INPUT = "input"
+PROBE_STT = "stt"
+PROBE_LLM = "llm"
+PROBE_TTS = "tts"
+PROBE_OUTPUT = "output"
+
+# Turn events, in the order they happen during a turn.
+VAD_STOP = "vad_stop"
+STT_FINAL = "stt_final"
+LLM_FIRST_TOKEN = "llm_first_token"
+TTS_FIRST_AUDIO = "tts_first_audio"
+OUTPUT_FIRST_AUDIO = "output_first_audio"
+TURN_EVENTS = [VAD_STOP, STT_FINAL, LLM_FIRST_TOKEN, TTS_FIRST_AUDIO, OUTPUT_FIRST_AUDIO]
+
+# Speech timeline events, recorded for call quality metrics.
+USER_STARTED = "user_started"
+USER_STOPPED = "user_stopped"
+BOT_STARTED = "bot_started"
+BOT_STOPPED = "bot_stopped"
+END_CALL = "end_call"
+
+# Probe position -> the stage whose errors it sees first. Errors travel
+# upstream, so the first probe an error passes is the one just before the
+# processor that raised it.
+ERROR_SOURCES = {
+    PROBE_INPUT: "stt",
+    PROBE_STT: "llm",
+    PROBE_LLM: "tts",
+    PROBE_TTS: "transport",
+    PROBE_OUTPUT: "context",
+}
+ERRORS_IN_FLIGHT = 256  # error frames remembered between probes at most
+
+# Stage name -> (start event, end event). "total" is the mouth-to-ear latency
+# as seen by the server.
+STAGES = {
+    "stt": (VAD_STOP, STT_FINAL),
+    "llm": (STT_FINAL, LLM_FIRST_TOKEN),
+    "tts": (LLM_FIRST_TOKEN, TTS_FIRST_AUDIO),
+    "transport": (TTS_FIRST_AUDIO, OUTPUT_FIRST_AUDIO),
+    "total": (VAD_STOP, OUTPUT_FIRST_AUDIO),
+}
+
+class CallTrace:
+    """
+    Per-call record of turn timestamps.
+
+    A turn opens when VAD reports the end of user speech (or, without VAD, on
+    the final transcript) and completes when the first outbound media frame of
+    the reply leaves the transport. Every event is recorded once per turn.
+
+    Separately, the trace keeps the call's speech timeline: when each side
+    started and stopped speaking, and when the agent ended the call.
+
+    Attributes:
+        call_sid (str): The call this trace belongs to.
+        turns (list): Completed and in-flight turns as event -> timestamp dicts.
+        abandoned (int): Turns dropped because the user spoke again mid-reply.
+        timeline (list): (seconds since the call started, event) pairs.
+        errors (dict): Error frames per stage that raised them (see ERROR_SOURCES).
+    """
+
+    def __init__(self, call_sid: str):
+        self.call_sid = call_sid
+        self.started_at = time.time()
+        self.turns: List[Dict[str, float]] = []
+        self.abandoned = 0
+        self.timeline: List[Tuple[float, str]] = []
+        self.errors: Dict[str, int] = {}
+        self._errors_seen = set()  # frame.id of error frames counted but not yet past the input probe
+        self._origin = time.perf_counter()
+        self._current: Optional[Dict[str, float]] = None
+
+    def mark_timeline(self, event: str):
+        self.timeline.append((time.perf_counter() - self._origin, event))
+
+    def mark_error(self, frame, stage: str, outermost: bool = False):
+        """
+        Count an error frame once, against the first stage that sees it.
+        Frames are told apart by pipecat's unique frame.id; the input probe
+        is the last one an error passes, so it forgets the frame there.
+        """
+        if frame.id in self._errors_seen:
+            if outermost:
+                self._errors_seen.discard(frame.id)
+            return
+        self.errors[stage] = self.errors.get(stage, 0) + 1
+        if not outermost:
+            if len(self._errors_seen) >= ERRORS_IN_FLIGHT:
+                # An error stopped before the input probe; it will not come back.
+                self._errors_seen.clear()
+            self._errors_seen.add(frame.id)
+
+    def elapsed(self) -> float:
+        """Seconds since the call started."""
+        return time.perf_counter() - self._origin
+
+    def mark(self, event: str, timestamp: Optional[float] = None):
+        """Record a turn event, opening or closing turns as needed."""
+        timestamp = timestamp if timestamp is not None else time.perf_counter()
+
+        if event == VAD_STOP:
+            if self._current is not None and self._current.get(LLM_FIRST_TOKEN) is None:
+                # Either the user paused and kept talking or the transcript beat
+                # VAD; in both cases the reply is generated after this stop.
+                self._current[VAD_STOP] = timestamp
+                return
+            if self._current is not None:
+                self.abandoned += 1
+                self.turns.remove(self._current)
+            self._open(timestamp)
+            return
+
+        if self._current is None:
+            if event != STT_FINAL:
+                return
+            self._open(None)
+
+        if self._current.get(event) is None:
+            self._current[event] = timestamp
+
+        if event == OUTPUT_FIRST_AUDIO:
+            self._current = None
+
+    def _open(self, vad_stop: Optional[float]):
+        self._current = {event: None for event in TURN_EVENTS}
+        self._current[VAD_STOP] = vad_stop
+        self.turns.append(self._current)
+
+    def stage_samples(self) -> Dict[str, List[float]]:
+        """Return per-stage durations in ms for every turn that has both events."""
+        samples = {stage: [] for stage in STAGES}
+        for turn in self.turns:
+            for stage, (start, end) in STAGES.items():
+                if turn.get(start) is not None and turn.get(end) is not None:
+                    # A transcript can finalize before VAD fires; count that as 0.
+                    samples[stage].append(max(0.0, turn[end] - turn[start]) * 1000.0)
+        return samples
+
+    def summary(self) -> dict:
+        completed = sum(1 for turn in self.turns if turn.get(OUTPUT_FIRST_AUDIO) is not None)
+        return {
+            "call_sid": self.call_sid,
+            "started_at": self.started_at,
+            "turns": completed,
+            "abandoned_turns": self.abandoned,
+            "stages": summarize(self.stage_samples()),
+        }
+
+
+class LatencyProbe(FrameProcessor):
+    """
+    Pass-through processor that timestamps turn events at one pipeline position.
+
+    Place one after each of transport.input(), stt, llm, tts and
+    transport.output(). The probe never holds or copies frames. Error
+    frames on their way upstream are counted against the stage after the
+    probe.
+    """
+
+    def __init__(self, trace: CallTrace, position: str, **kwargs):
+        super().__init__(**kwargs)
+        self._trace = trace
+        self._position = position
+        self._llm_responding = False
+
+    async def process_frame(self, frame, direction):
+        await super().process_frame(frame, direction)
+        self._observe(frame, direction)
+        await self.push_frame(frame, direction)
+
+    def _observe(self, frame, direction):
+        position = self._position
+        if direction == FrameDirection.UPSTREAM:
+            if isinstance(frame, ErrorFrame):
+                self._trace.mark_error(frame, ERROR_SOURCES[position], outermost=position == PROBE_INPUT)
+            return
+        if position == PROBE_INPUT:
+            if isinstance(frame, UserStoppedSpeakingFrame):
+                self._trace.mark(VAD_STOP)
+                self._trace.mark_timeline(USER_STOPPED)
+            elif isinstance(frame, UserStartedSpeakingFrame):
+                self._trace.mark_timeline(USER_STARTED)
+        elif position == PROBE_STT:
+            if isinstance(frame, TranscriptionFrame):
+                self._trace.mark(STT_FINAL)
+        elif position == PROBE_LLM:
+            if isinstance(frame, LLMFullResponseStartFrame):
+                self._llm_responding = True
+            elif isinstance(frame, LLMFullResponseEndFrame):
+                self._llm_responding = False
+            elif (
+                self._llm_responding
+                and isinstance(frame, TextFrame)
+                and not isinstance(frame, (TranscriptionFrame, InterimTranscriptionFrame))
+            ):
+                self._llm_responding = False
+                self._trace.mark(LLM_FIRST_TOKEN)
+        elif position == PROBE_TTS:
+            if isinstance(frame, TTSAudioRawFrame):
+                self._trace.mark(TTS_FIRST_AUDIO)
+        elif position == PROBE_OUTPUT:
+            if isinstance(frame, (BotStartedSpeakingFrame, OutputAudioRawFrame)):
+                self._trace.mark(OUTPUT_FIRST_AUDIO)
+            if isinstance(frame, BotStartedSpeakingFrame):
+                self._trace.mark_timeline(BOT_STARTED)
+            elif isinstance(frame, BotStoppedSpeakingFrame):
+                self._trace.mark_timeline(BOT_STOPPED)
+
+
+class LatencyTracker:
+    """
+    Keeps the traces of the most recent calls and builds percentile summaries.
+
+    Attributes:
+        retention (int): Number of calls kept in memory. Defaults to LATENCY_TRACE_RETENTION.
+    """
+
+    def __init__(self, retention: int = LATENCY_TRACE_RETENTION):
+        self.retention = retention
+        self._traces: "OrderedDict[str, CallTrace]" = OrderedDict()
+
+    def start_call(self, call_sid: str) -> CallTrace:
+        trace = CallTrace(call_sid)
+        self._traces[call_sid] = trace
+        self._traces.move_to_end(call_sid)
+        while len(self._traces) > self.retention:
+            self._traces.popitem(last=False)
+        return trace
+
+    def probes(self, trace: CallTrace) -> Dict[str, LatencyProbe]:
+        """Create one probe per pipeline position for the given trace."""
+        return {
+            position: LatencyProbe(trace, position)
+            for position in (PROBE_INPUT, PROBE_STT, PROBE_LLM, PROBE_TTS, PROBE_OUTPUT)
+        }
+
+    def get(self, call_sid: str) -> Optional[CallTrace]:
+        return self._traces.get(call_sid)
+
+    def call_summary(self, call_sid: str) -> Optional[dict]:
+        trace = self._traces.get(call_sid)
+        return trace.summary() if trace else None
+
+    def error_counts(self) -> Dict[str, int]:
+        """Error frames per stage over every retained call."""
+        counts: Dict[str, int] = {}
+        for trace in self._traces.values():
+            for stage, count in trace.errors.items():
+                counts[stage] = counts.get(stage, 0) + count
+        return counts
+
+    def summary(self) -> dict:
+        """Percentiles over every turn of every retained call."""
+        samples = {stage: [] for stage in STAGES}
+        for trace in self._traces.values():
+            for stage, values in trace.stage_samples().items():
+                samples[stage].extend(values)
+        return {
+            "calls": len(self._traces),
+            "stages": summarize(samples),
+        }
@@ -0,0 +1,288 @@
+import json
+import queue
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from config import TRANSCRIPT_DB_PATH, TRANSCRIPT_BATCH_SIZE, TRANSCRIPT_PAGE_SIZE
+
+from pipecat.frames.frames import Frame
+from pipecat.processors.frame_processor import FrameProcessor, FrameDirection
+
+# Evaluation outcomes stored per call.
+EVALUATION_PASSED = "passed"
+EVALUATION_FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS calls (
+    call_sid TEXT PRIMARY KEY,
+    agent TEXT,
+    started_at REAL NOT NULL,
+    ended_at REAL,
+    turns INTEGER NOT NULL DEFAULT 0,
+    evaluation TEXT,
+    quality TEXT
+);
+CREATE TABLE IF NOT EXISTS turns (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    call_sid TEXT NOT NULL,
+    agent TEXT,
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS calls_by_time ON calls (started_at, call_sid);
+CREATE INDEX IF NOT EXISTS calls_by_agent ON calls (agent, started_at, call_sid);
+CREATE INDEX IF NOT EXISTS calls_by_evaluation ON calls (evaluation, started_at, call_sid);
+CREATE INDEX IF NOT EXISTS turns_by_call ON turns (call_sid, id);
+CREATE INDEX IF NOT EXISTS turns_by_agent ON turns (agent, id);
+CREATE INDEX IF NOT EXISTS turns_by_time ON turns (created_at, id);
+"""
+
+class TranscriptStore:
+    """
+    Append-only SQLite store of call turns.
+
+    Writes are queued and applied by one background thread in batched
+    transactions, so recording a turn never blocks the event loop. Reads
+    use their own connection (WAL mode lets them run alongside the writer)
+    and keyset pagination: a page costs one index range scan no matter
+    how deep it is, and no transcript is ever loaded whole.
+
+    Attributes:
+        path (str): The SQLite database file. Defaults to TRANSCRIPT_DB_PATH.
+        batch_size (int): Most writes applied per transaction.
+    """
+
+    def __init__(self, path: str = TRANSCRIPT_DB_PATH, batch_size: int = TRANSCRIPT_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        writer = self._connect()
+        writer.executescript(SCHEMA)
+        # Stores created before call quality metrics lack the column.
+        if "quality" not in {row[1] for row in writer.execute("PRAGMA table_info(calls)")}:
+            writer.execute("ALTER TABLE calls ADD COLUMN quality TEXT")
+        writer.commit()
+        self._reader = self._connect()
+        self._read_lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[Tuple[str, tuple]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._write_loop, args=(writer,), name="transcripts", daemon=True)
+        self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    # Writes (non-blocking; applied by the writer thread)
+
+    def start_call(self, call_sid: str, agent: Optional[str], started_at: Optional[float] = None):
+        self._queue.put((
+            "INSERT OR IGNORE INTO calls (call_sid, agent, started_at) VALUES (?, ?, ?)",
+            (call_sid, agent, started_at or time.time()),
+        ))
+
+    def append_turn(self, call_sid: str, agent: Optional[str], seq: int, role: str, content: str,
+                    created_at: Optional[float] = None):
+        self._queue.put((
+            "INSERT INTO turns (call_sid, agent, seq, role, content, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (call_sid, agent, seq, role, content, created_at or time.time()),
+        ))
+        self._queue.put(("UPDATE calls SET turns = turns + 1 WHERE call_sid = ?", (call_sid,)))
+
+    def end_call(self, call_sid: str, ended_at: Optional[float] = None):
+        self._queue.put(("UPDATE calls SET ended_at = ? WHERE call_sid = ?", (ended_at or time.time(), call_sid)))
+
+    def set_evaluation(self, call_sid: str, passed: bool):
+        outcome = EVALUATION_PASSED if passed else EVALUATION_FAILED
+        self._queue.put(("UPDATE calls SET evaluation = ? WHERE call_sid = ?", (outcome, call_sid)))
+
+    def set_quality(self, call_sid: str, metrics: dict):
+        self._queue.put(("UPDATE calls SET quality = ? WHERE call_sid = ?", (json.dumps(metrics), call_sid)))
+
+    def flush(self):
+        """Block until every queued write is committed."""
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+        self._reader.close()
+
+    def _write_loop(self, db: sqlite3.Connection):
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            while item is not None and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+            writes = [entry for entry in batch if entry is not None]
+            try:
+                with db:
+                    for sql, params in writes:
+                        db.execute(sql, params)
+            except Exception as e:
+                print(f"Error writing transcripts: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if len(writes) < len(batch):
+                db.close()
+                return
+
+    # Reads (blocking; call through asyncio.to_thread from async code)
+
+    def _query(self, sql: str, params: list) -> List[dict]:
+        with self._read_lock:
+            cursor = self._reader.execute(sql, params)
+            columns = [c[0] for c in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        for row in rows:
+            if row.get("quality") is not None:
+                row["quality"] = json.loads(row["quality"])
+        return rows
+
+    def get_call(self, call_sid: str) -> Optional[dict]:
+        rows = self._query("SELECT * FROM calls WHERE call_sid = ?", [call_sid])
+        return rows[0] if rows else None
+
+    def list_calls(self, agent: Optional[str] = None, evaluation: Optional[str] = None,
+                   since: Optional[float] = None, until: Optional[float] = None,
+                   limit: int = TRANSCRIPT_PAGE_SIZE, cursor: Optional[str] = None) -> dict:
+        """Calls newest first. Pass the returned `next_cursor` back to get the next page."""
+        where, params = [], []
+        if agent is not None:
+            where.append("agent = ?")
+            params.append(agent)
+        if evaluation is not None:
+            where.append("evaluation = ?")
+            params.append(evaluation)
+        if since is not None:
+            where.append("started_at >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("started_at < ?")
+            params.append(until)
+        if cursor:
+            started_at, call_sid = cursor.split(":", 1)
+            where.append("(started_at, call_sid) < (?, ?)")
+            params.extend([float(started_at), call_sid])
+        sql = "SELECT * FROM calls"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY started_at DESC, call_sid DESC LIMIT ?"
+        rows = self._query(sql, params + [limit])
+        next_cursor = None
+        if len(rows) == limit:
+            next_cursor = f"{rows[-1]['started_at']!r}:{rows[-1]['call_sid']}"
+        return {"calls": rows, "next_cursor": next_cursor}
+
+    def list_turns(self, call_sid: Optional[str] = None, agent: Optional[str] = None,
+                   role: Optional[str] = None, evaluation: Optional[str] = None,
+                   since: Optional[float] = None, until: Optional[float] = None,
+                   limit: int = TRANSCRIPT_PAGE_SIZE, cursor: Optional[str] = None) -> dict:
+        """
+        Turns matching every given filter. A single call's transcript is
+        returned oldest first; cross-call queries return newest first.
+        """
+        ascending = call_sid is not None
+        where, params = [], []
+        if call_sid is not None:
+            where.append("call_sid = ?")
+            params.append(call_sid)
+        if agent is not None:
+            where.append("agent = ?")
+            params.append(agent)
+        if role is not None:
+            where.append("role = ?")
+            params.append(role)
+        if evaluation is not None:
+            where.append("call_sid IN (SELECT call_sid FROM calls WHERE evaluation = ?)")
+            params.append(evaluation)
+        if since is not None:
+            where.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("created_at < ?")
+            params.append(until)
+        if cursor:
+            where.append("id > ?" if ascending else "id < ?")
+            params.append(int(cursor))
+        sql = "SELECT id, call_sid, agent, seq, role, content, created_at FROM turns"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY id {'ASC' if ascending else 'DESC'} LIMIT ?"
+        rows = self._query(sql, params + [limit])
+        next_cursor = str(rows[-1]["id"]) if len(rows) == limit else None
+        return {"turns": rows, "next_cursor": next_cursor}
+
+class CallTranscriptWriter:
+    """
+    Streams one call's conversation into a TranscriptStore.
+
+    `sync` is handed the LLM context's message list whenever it changes and
+    appends the messages it has not recorded yet. System prompts are not
+    recorded; tool calls are stored as JSON.
+    """
+
+    def __init__(self, store: TranscriptStore, call_sid: str, agent: Optional[str]):
+        self.store = store
+        self.call_sid = call_sid
+        self.agent = agent
+        self._recorded_ids = set()
+        self._recorded = []  # keeps recorded messages alive so their ids stay unique
+        self._seq = 0
+        store.start_call(call_sid, agent)
+
+    def sync(self, messages: List[dict]):
+        now = time.time()
+        for message in messages:
+            if id(message) in self._recorded_ids or message.get("role") == "system":
+                continue
+            self._recorded_ids.add(id(message))
+            self._recorded.append(message)
+            content = message.get("content")
+            if not isinstance(content, str):
+                content = json.dumps(message.get("tool_calls") or content)
+            self.store.append_turn(self.call_sid, self.agent, self._seq, message["role"], content, now)
+            self._seq += 1
+
+    def conversation(self) -> List[dict]:
+        """
+        Every message recorded so far, in order, including turns a
+        ContextCompactor has since dropped or summarized out of the context.
+        """
+        return list(self._recorded)
+
+    def close(self, messages: List[dict]):
+        self.sync(messages)
+        self.store.end_call(self.call_sid)
+
+class TranscriptTap(FrameProcessor):
+    """Pass-through processor that records new context messages as they are aggregated."""
+
+    def __init__(self, writer: CallTranscriptWriter, **kwargs):
+        super().__init__(**kwargs)
+        # Imported per call rather than with this module: it loads the OpenAI SDK
+        from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContextFrame
+        self._context_frame = OpenAILLMContextFrame
+        self._writer = writer
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, self._context_frame):
+            self._writer.sync(frame.context.messages)
+        await self.push_frame(frame, direction)
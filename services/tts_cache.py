@@ -0,0 +1,456 @@
+import asyncio
+import fcntl
+import hashlib
+import json
+import mmap
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Optional, Tuple
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from config import (
+    CARTESIA_API_KEY, TTS_CACHE_DIR, TTS_CACHE_MEMORY_BYTES, TTS_CACHE_DISK_BYTES,
+    TTS_CACHE_ADMIT_AFTER
+)
+
+import aiohttp
+
+from pipecat.audio.utils import ulaw_to_pcm
+from pipecat.frames.frames import (
+    LLMFullResponseEndFrame,
+    StartInterruptionFrame,
+    TextFrame,
+    TTSAudioRawFrame,
+    TTSStartedFrame,
+    TTSStoppedFrame,
+)
+
+from services.audio_codec import ulaw_decode
+from services.cartesia_tts import WarmCartesiaTTSService
+
+# Cached audio is stored exactly as Twilio plays it.
+CACHE_SAMPLE_RATE = 8000
+CACHE_ENCODING = "pcm_mulaw"
+
+# Data file of stores written before the index named its data file.
+DEFAULT_DATA_NAME = "audio.dat"
+
+def new_data_name() -> str:
+    return f"audio-{os.urandom(6).hex()}.dat"
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace and unicode variants so equivalent phrases share a key."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+def cache_key(voice_id: str, text: str) -> str:
+    return hashlib.sha1(f"{voice_id}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+class MemoryAudioLRU:
+    """In-memory LRU of audio blobs, bounded by total bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.evictions = 0
+        self._items: "OrderedDict[str, bytes]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key: str) -> Optional[bytes]:
+        audio = self._items.get(key)
+        if audio is not None:
+            self._items.move_to_end(key)
+        return audio
+
+    def put(self, key: str, audio: bytes):
+        if len(audio) > self.max_bytes:
+            return
+        previous = self._items.pop(key, None)
+        if previous is not None:
+            self.size -= len(previous)
+        self._items[key] = audio
+        self.size += len(audio)
+        while self.size > self.max_bytes:
+            _, evicted = self._items.popitem(last=False)
+            self.size -= len(evicted)
+            self.evictions += 1
+
+class DiskAudioStore:
+    """
+    Append-only, memory-mapped audio store shared by every worker process.
+
+    Audio is appended to a data file that readers memory-map, so a disk
+    hit is a slice of the mapping rather than a file read. An index file
+    names the current data file in its first record and then records
+    (key, offset, length) entries and deletions; each process tails it to
+    pick up entries written by its siblings. When live audio exceeds
+    `max_bytes` the least recently used entries are deleted, and once most
+    of the data file is dead the live entries are compacted into a new
+    data file under a new name, so offsets in an index always refer to the
+    data file that index names.
+
+    Writers serialize on a lock file that is never replaced; after taking
+    it they re-read the index, so a writer that waited through a sibling's
+    compaction appends to the new data file.
+
+    Attributes:
+        directory (Path): Where the data, index and lock files live.
+        max_bytes (int): Budget for live audio on disk.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._index_path = self.directory / "audio.idx"
+        self._lock_path = self.directory / "audio.lock"
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+        self._live_bytes = 0
+        self._index_pos = 0
+        self._index_inode = None
+        self._data_name = DEFAULT_DATA_NAME
+        self._mmap: Optional[mmap.mmap] = None
+        self._mapped_name = None
+        with self._lock:
+            self._refresh()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        return self._live_bytes
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Blocking: it may re-read the index and remap the data file, so call it off the event loop."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                # Another worker may have added it since we last looked.
+                self._refresh()
+                entry = self._entries.get(key)
+                if entry is None:
+                    return None
+            self._entries.move_to_end(key)
+            offset, length = entry
+            mapping = self._map(offset + length)
+            if mapping is None:
+                return None
+            return mapping[offset:offset + length]
+
+    def put(self, key: str, audio: bytes):
+        with self._lock, open(self._lock_path, "ab") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                # A sibling may have compacted while we waited: pick up its index and data file.
+                self._refresh()
+                if self._index_inode is None:
+                    self._data_name = new_data_name()
+                    self._append_index({"data": self._data_name})
+                with open(self.directory / self._data_name, "ab") as data_file:
+                    offset = data_file.seek(0, os.SEEK_END)
+                    data_file.write(audio)
+                self._append_index({"key": key, "offset": offset, "length": len(audio)})
+                self._refresh()
+                while self._live_bytes > self.max_bytes and len(self._entries) > 1:
+                    oldest = next(iter(self._entries))
+                    self._append_index({"key": oldest, "deleted": True})
+                    self._refresh()
+                    self.evictions += 1
+                if offset + len(audio) > 2 * max(self._live_bytes, self.max_bytes // 4):
+                    self._compact()
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _append_index(self, record: dict):
+        with open(self._index_path, "ab") as index_file:
+            index_file.write(json.dumps(record).encode("utf-8") + b"\n")
+
+    def _refresh(self):
+        """Apply index records written since the last refresh (by any process)."""
+        try:
+            stat = os.stat(self._index_path)
+        except FileNotFoundError:
+            return
+        if stat.st_ino != self._index_inode:
+            # First load, or the store was compacted: start over.
+            self._entries.clear()
+            self._live_bytes = 0
+            self._index_pos = 0
+            self._index_inode = stat.st_ino
+            self._data_name = DEFAULT_DATA_NAME
+        if stat.st_size <= self._index_pos:
+            return
+        with open(self._index_path, "rb") as index_file:
+            index_file.seek(self._index_pos)
+            chunk = index_file.read(stat.st_size - self._index_pos)
+        complete = chunk.rfind(b"\n") + 1
+        for line in chunk[:complete].splitlines():
+            record = json.loads(line)
+            if "data" in record:
+                self._data_name = record["data"]
+                continue
+            previous = self._entries.pop(record["key"], None)
+            if previous is not None:
+                self._live_bytes -= previous[1]
+            if not record.get("deleted"):
+                self._entries[record["key"]] = (record["offset"], record["length"])
+                self._live_bytes += record["length"]
+        self._index_pos += complete
+
+    def _map(self, required: int) -> Optional[mmap.mmap]:
+        """A mapping of the data file the current index names, at least `required` bytes long."""
+        if self._mmap is None or self._data_name != self._mapped_name or len(self._mmap) < required:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+            try:
+                with open(self.directory / self._data_name, "rb") as data_file:
+                    self._mmap = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except (FileNotFoundError, ValueError):
+                # Compacted away (or still empty): a newer index will name its replacement.
+                return None
+            self._mapped_name = self._data_name
+        if len(self._mmap) < required:
+            return None
+        return self._mmap
+
+    def _compact(self):
+        """Rewrite live entries into a new data file and index. Caller holds the lock file."""
+        mapping = self._map(0)
+        if mapping is None:
+            return
+        old_data = self.directory / self._data_name
+        data_name = new_data_name()
+        index_tmp = self._index_path.with_suffix(".idx.tmp")
+        with open(self.directory / data_name, "wb") as data_file, open(index_tmp, "wb") as index_file:
+            index_file.write(json.dumps({"data": data_name}).encode("utf-8") + b"\n")
+            for key, (offset, length) in self._entries.items():
+                new_offset = data_file.tell()
+                data_file.write(mapping[offset:offset + length])
+                record = {"key": key, "offset": new_offset, "length": length}
+                index_file.write(json.dumps(record).encode("utf-8") + b"\n")
+        # The index switches to the new data file in one step; readers still
+        # mapping the old one keep their mapping until they next refresh.
+        os.replace(index_tmp, self._index_path)
+        old_data.unlink(missing_ok=True)
+        self._refresh()
+
+class TTSAudioCache:
+    """
+    Two-tier cache of synthesized phrases keyed by (voice_id, normalized text).
+
+    Audio is kept as 8 kHz mu-law, the format Twilio plays, in an in-memory
+    LRU backed by a memory-mapped disk store. A phrase is only admitted
+    after it has been requested `admit_after` times, so one-off sentences
+    never cost an extra synthesis.
+
+    Attributes:
+        memory (MemoryAudioLRU): Hot tier.
+        disk (DiskAudioStore): Warm tier shared across worker processes.
+        admit_after (int): Misses before a phrase is synthesized into the cache.
+    """
+
+    def __init__(self, directory: str = TTS_CACHE_DIR, memory_bytes: int = TTS_CACHE_MEMORY_BYTES,
+                 disk_bytes: int = TTS_CACHE_DISK_BYTES, admit_after: int = TTS_CACHE_ADMIT_AFTER):
+        self.memory = MemoryAudioLRU(memory_bytes)
+        self.disk = DiskAudioStore(directory, disk_bytes)
+        self.admit_after = admit_after
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "fills": 0, "fill_errors": 0}
+        self._miss_counts: "OrderedDict[str, int]" = OrderedDict()
+        self._filling = set()
+
+    def get(self, voice_id: str, text: str) -> Optional[bytes]:
+        """Lookup in both tiers that blocks on the disk store; the pipeline uses lookup()."""
+        key = cache_key(voice_id, text)
+        audio = self.memory.get(key)
+        if audio is not None:
+            self.counters["memory_hits"] += 1
+            return audio
+        return self._disk_result(key, self.disk.get(key))
+
+    async def lookup(self, voice_id: str, text: str) -> Optional[bytes]:
+        """
+        Same as get(), but a memory miss is looked up on disk in a thread:
+        the disk store may wait on a sibling's write or compaction, re-read
+        the index or remap its data file, none of which may stall the loop.
+        """
+        key = cache_key(voice_id, text)
+        audio = self.memory.get(key)
+        if audio is not None:
+            self.counters["memory_hits"] += 1
+            return audio
+        return self._disk_result(key, await asyncio.to_thread(self.disk.get, key))
+
+    def _disk_result(self, key: str, audio: Optional[bytes]) -> Optional[bytes]:
+        if audio is None:
+            self.counters["misses"] += 1
+            return None
+        self.counters["disk_hits"] += 1
+        self.memory.put(key, audio)
+        return audio
+
+    def put(self, voice_id: str, text: str, audio: bytes):
+        key = cache_key(voice_id, text)
+        self.disk.put(key, audio)
+        self.memory.put(key, audio)
+
+    def should_admit(self, voice_id: str, text: str) -> bool:
+        """
+        Count a miss of a lookup that was made; True when the phrase is
+        popular enough to synthesize into the cache.
+        """
+        key = cache_key(voice_id, text)
+        if key in self._filling:
+            return False
+        count = self._miss_counts.pop(key, 0) + 1
+        if count >= self.admit_after:
+            self._filling.add(key)
+            return True
+        self._miss_counts[key] = count
+        while len(self._miss_counts) > 10000:
+            self._miss_counts.popitem(last=False)
+        return False
+
+    async def fill(self, voice_id: str, text: str, synthesizer: "CartesiaPhraseSynthesizer"):
+        """Synthesize a phrase straight to mu-law and store it, off the pipeline's path."""
+        key = cache_key(voice_id, text)
+        self._filling.add(key)
+        try:
+            audio = await synthesizer.synthesize(voice_id, text)
+            # The disk write runs in a thread; the memory tier is only touched on the loop.
+            await asyncio.to_thread(self.disk.put, key, audio)
+            self.memory.put(key, audio)
+            self.counters["fills"] += 1
+        except Exception as e:
+            self.counters["fill_errors"] += 1
+            print(f"Error caching TTS phrase: {e}")
+        finally:
+            self._filling.discard(key)
+
+    def stats(self) -> dict:
+        lookups = self.counters["memory_hits"] + self.counters["disk_hits"] + self.counters["misses"]
+        hits = lookups - self.counters["misses"]
+        return {
+            **self.counters,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "memory_entries": len(self.memory),
+            "memory_bytes": self.memory.size,
+            "memory_evictions": self.memory.evictions,
+            "disk_entries": len(self.disk),
+            "disk_bytes": self.disk.size,
+            "disk_evictions": self.disk.evictions,
+        }
+
+class CartesiaPhraseSynthesizer:
+    """Fetches whole phrases from Cartesia's REST API, already encoded as 8 kHz mu-law."""
+
+    def __init__(self, api_key: str = CARTESIA_API_KEY, model: str = "sonic-english",
+                 language: str = "en", base_url: str = "https://api.cartesia.ai",
+                 cartesia_version: str = "2024-06-10"):
+        self.api_key = api_key
+        self.model = model
+        self.language = language
+        self.url = f"{base_url}/tts/bytes"
+        self.cartesia_version = cartesia_version
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def synthesize(self, voice_id: str, text: str) -> bytes:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        payload = {
+            "model_id": self.model,
+            "transcript": text,
+            "voice": {"mode": "id", "id": voice_id},
+            "output_format": {
+                "container": "raw",
+                "encoding": CACHE_ENCODING,
+                "sample_rate": CACHE_SAMPLE_RATE,
+            },
+            "language": self.language,
+        }
+        headers = {"X-API-Key": self.api_key, "Cartesia-Version": self.cartesia_version}
+        async with self._session.post(self.url, json=payload, headers=headers) as response:
+            response.raise_for_status()
+            return await response.read()
+
+    async def close(self):
+        if self._session:
+            await self._session.close()
+
+_shared_cache: Optional[TTSAudioCache] = None
+_shared_synthesizer: Optional[CartesiaPhraseSynthesizer] = None
+
+def get_tts_cache() -> TTSAudioCache:
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = TTSAudioCache()
+    return _shared_cache
+
+def get_phrase_synthesizer() -> CartesiaPhraseSynthesizer:
+    global _shared_synthesizer
+    if _shared_synthesizer is None:
+        _shared_synthesizer = CartesiaPhraseSynthesizer()
+    return _shared_synthesizer
+
+class CachingCartesiaTTSService(WarmCartesiaTTSService):
+    """
+    Cartesia TTS that plays popular phrases from the TTSAudioCache.
+
+    A sentence is served from the cache only when no Cartesia context is in
+    flight, so cached audio can never overtake audio still streaming back
+    for an earlier sentence. Cache hits push their own text and end-of-
+    response frames, which Cartesia's word timestamps normally provide.
+    """
+
+    def __init__(self, *, cache: Optional[TTSAudioCache] = None,
+                 synthesizer: Optional[CartesiaPhraseSynthesizer] = None, **kwargs):
+        super().__init__(**kwargs)
+        self._cache = cache or get_tts_cache()
+        self._synthesizer = synthesizer or get_phrase_synthesizer()
+        self._provider_in_turn = False
+
+    async def run_tts(self, text: str):
+        audio = None
+        looked_up = self._context_id is None
+        if looked_up:
+            audio = await self._cache.lookup(self._voice_id, text)
+        if audio is None:
+            # A sentence skipped because a Cartesia context was in flight is not a miss.
+            if looked_up and self._cache.should_admit(self._voice_id, text):
+                asyncio.create_task(self._cache.fill(self._voice_id, text, self._synthesizer))
+            self._provider_in_turn = True
+            async for frame in super().run_tts(text):
+                yield frame
+            return
+
+        if self.sample_rate == CACHE_SAMPLE_RATE:
+            # Twilio's rate: decoded only, and re-encoded to the same bytes by the serializer
+            pcm = ulaw_decode(audio).tobytes()
+        else:
+            pcm = ulaw_to_pcm(audio, CACHE_SAMPLE_RATE, self.sample_rate)
+        yield TTSStartedFrame()
+        yield TTSAudioRawFrame(audio=pcm, sample_rate=self.sample_rate, num_channels=1)
+        yield TTSStoppedFrame()
+        yield TextFrame(text)
+
+    async def process_frame(self, frame, direction):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, LLMFullResponseEndFrame):
+            # Cartesia emits the end frame from its word timestamps; a turn
+            # served entirely from the cache has to emit its own.
+            if not self._provider_in_turn:
+                await self.push_frame(frame, direction)
+            self._provider_in_turn = False
+        elif isinstance(frame, StartInterruptionFrame):
+            self._provider_in_turn = False
@@ -0,0 +1,68 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from config import TWILIO_MAX_WORKERS, TWILIO_HTTP_TIMEOUT, TWILIO_RING_TIMEOUT
+
+from requests.adapters import HTTPAdapter
+from twilio.http.http_client import TwilioHttpClient
+from twilio.rest import Client
+
+# Call statuses after which a call will never connect a media stream.
+TERMINAL_STATUSES = ("completed", "busy", "failed", "no-answer", "canceled")
+
+class TwilioControlPlane:
+    """
+    Async wrapper around the Twilio REST client for call control.
+
+    The Twilio SDK is synchronous, so every request runs on a dedicated,
+    bounded thread pool instead of the event loop that moves live media.
+    All requests share one keep-alive `requests` session whose connection
+    pool is sized to the number of workers, so concurrent dials reuse TLS
+    connections instead of handshaking per request.
+
+    Attributes:
+        client (Client): The underlying Twilio REST client.
+        max_workers (int): Size of the thread pool and HTTP connection pool.
+    """
+
+    def __init__(self, account_sid: str, auth_token: str, max_workers: int = TWILIO_MAX_WORKERS,
+                 timeout: float = TWILIO_HTTP_TIMEOUT, client: Client = None):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="twilio")
+        if client is None:
+            http_client = TwilioHttpClient(pool_connections=True, timeout=timeout)
+            http_client.session.mount(
+                "https://", HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+            )
+            client = Client(account_sid, auth_token, http_client=http_client)
+        self.client = client
+
+    async def _run(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    async def create_call(self, to: str, from_: str, twiml: str, ring_timeout: int = TWILIO_RING_TIMEOUT) -> str:
+        """Place an outbound call that rings for at most `ring_timeout` seconds, and return its SID."""
+        call = await self._run(self.client.calls.create, to=to, from_=from_, twiml=twiml, timeout=ring_timeout)
+        return call.sid
+
+    async def hangup(self, call_sid: str):
+        """Hang up a live call."""
+        await self._run(
+            self.client.calls(call_sid).update, twiml="<Response><Hangup/></Response>"
+        )
+
+    async def fetch_status(self, call_sid: str) -> str:
+        """Return the call's current Twilio status (queued, ringing, in-progress, ...)."""
+        call = await self._run(self.client.calls(call_sid).fetch)
+        return call.status
+
+    def close(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,94 @@
+import copy
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from config import VAD_POOL_SIZE
+
+from pipecat.audio.vad.silero import SileroOnnxModel, SileroVADAnalyzer
+from pipecat.audio.vad.vad_analyzer import VADAnalyzer, VADParams
+
+def _silero_model_path() -> str:
+    """Locate the Silero ONNX model bundled with pipecat."""
+    model_name = "silero_vad.onnx"
+    package_path = "pipecat.audio.vad.data"
+    try:
+        import importlib_resources as impresources
+        return str(impresources.files(package_path).joinpath(model_name))
+    except Exception:
+        from importlib import resources as impresources
+        return str(impresources.files(package_path).joinpath(model_name))
+
+class _PooledStreamModel:
+    """
+    Per-call view of the shared model: owns only the recurrent state and
+    context window, and runs inference on the shared pool.
+    """
+
+    def __init__(self, model: SileroOnnxModel, pool: ThreadPoolExecutor):
+        self._model = model
+        self._pool = pool
+
+    def reset_states(self, batch_size=1):
+        self._model.reset_states(batch_size)
+
+    def __call__(self, x, sr: int):
+        return self._pool.submit(self._model, x, sr).result()
+
+class SharedSileroModel:
+    """
+    Silero VAD loaded once per process and shared by every call.
+
+    The ONNX session is created once; each stream gets a shallow copy that
+    shares the session but keeps its own state. Inference runs on a bounded
+    thread pool so VAD work for many concurrent calls is capped at
+    `pool_size` parallel runs instead of one per transport thread.
+
+    Attributes:
+        pool_size (int): Maximum concurrent inferences. Defaults to VAD_POOL_SIZE.
+        load_seconds (float): Time it took to load the model.
+    """
+
+    def __init__(self, pool_size: int = VAD_POOL_SIZE):
+        start = time.perf_counter()
+        self._base = SileroOnnxModel(_silero_model_path(), force_onnx_cpu=True)
+        self.load_seconds = time.perf_counter() - start
+        self.pool_size = pool_size
+        self._pool = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="vad")
+
+    def new_stream(self) -> _PooledStreamModel:
+        model = copy.copy(self._base)
+        model.reset_states()
+        return _PooledStreamModel(model, self._pool)
+
+_shared_model: Optional[SharedSileroModel] = None
+_shared_lock = threading.Lock()
+
+def get_shared_vad_model() -> SharedSileroModel:
+    """Return the process-wide model, loading it on first use."""
+    global _shared_model
+    if _shared_model is None:
+        with _shared_lock:
+            if _shared_model is None:
+                _shared_model = SharedSileroModel()
+                print(f"Loaded Silero VAD in {_shared_model.load_seconds * 1000:.0f} ms")
+    return _shared_model
+
+class SharedSileroVADAnalyzer(SileroVADAnalyzer):
+    """SileroVADAnalyzer that reuses the process-wide model instead of loading its own."""
+
+    def __init__(self, *, sample_rate: int = 16000, params: VADParams = VADParams(),
+                 shared_model: Optional[SharedSileroModel] = None):
+        # Skip SileroVADAnalyzer.__init__, which loads a fresh ONNX session.
+        VADAnalyzer.__init__(self, sample_rate=sample_rate, num_channels=1, params=params)
+        if sample_rate != 16000 and sample_rate != 8000:
+            raise ValueError("Silero VAD sample rate needs to be 16000 or 8000")
+        self._model = (shared_model or get_shared_vad_model()).new_stream()
+        self._last_reset_time = 0
@@ -0,0 +1,147 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from config import WARM_SESSION_TTL, WARM_SESSION_MAX, WARM_CLAIM_TIMEOUT
+from models.agent import Agent
+
+if TYPE_CHECKING:
+    from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext  # loads the OpenAI SDK
+
+@dataclass
+class WarmSession:
+    """
+    Provider services and LLM context built for one call.
+
+    Attributes:
+        stt, llm, tts: The provider services for the call's pipeline, each with
+            prewarm() and release() (see services.providers).
+        context (OpenAILLMContext): The initial conversation context.
+        context_aggregator: The user/assistant aggregator pair for `context`.
+        messages (list): The context's message list (returned after the call).
+        agent (Agent): The agent the session was built for.
+        warm (bool): True once provider connections were opened ahead of time.
+    """
+    stt: object
+    llm: object
+    tts: object
+    context: "OpenAILLMContext"
+    context_aggregator: object
+    messages: List[dict]
+    agent: Optional[Agent] = None
+    warm: bool = False
+    created_at: float = field(default_factory=time.time)
+
+    async def prewarm(self):
+        """Open every provider connection concurrently. Failures fall back to connecting at start."""
+        results = await asyncio.gather(
+            self.stt.prewarm(), self.tts.prewarm(), self.llm.prewarm(), return_exceptions=True
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        for error in errors:
+            print(f"Prewarm error: {error}")
+        self.warm = not errors
+
+    async def release(self):
+        """Tear down a session that never made it into a pipeline."""
+        for processor in (self.context_aggregator.user(), self.context_aggregator.assistant()):
+            await processor.cleanup()
+        for service in (self.stt, self.tts, self.llm):
+            try:
+                await service.release()
+            except Exception as e:
+                print(f"Error releasing {service}: {e}")
+
+class WarmSessionPool:
+    """
+    Sessions opened speculatively at dial time, keyed by call SID.
+
+    `prepare` starts building and prewarming a session as soon as the call
+    is placed. `claim` hands it to the pipeline when Twilio's media stream
+    connects. Sessions nobody claims within `ttl` seconds (the call was not
+    answered, or its stream landed elsewhere) are torn down.
+
+    Attributes:
+        ttl (float): Seconds an unclaimed session is kept. Defaults to WARM_SESSION_TTL.
+        max_sessions (int): Cap on sessions held at once. Defaults to WARM_SESSION_MAX.
+    """
+
+    def __init__(self, ttl: float = WARM_SESSION_TTL, max_sessions: int = WARM_SESSION_MAX,
+                 claim_timeout: float = WARM_CLAIM_TIMEOUT):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.claim_timeout = claim_timeout
+        self._pending: Dict[str, asyncio.Task] = {}
+        self._expiry: Dict[str, asyncio.TimerHandle] = {}
+        self.stats = {"prepared": 0, "claimed": 0, "expired": 0, "skipped": 0}
+
+    def __len__(self):
+        return len(self._pending)
+
+    def prepare(self, call_sid: str, build: Callable[[], WarmSession]):
+        """Start building a session for a call that was just dialed."""
+        if call_sid in self._pending:
+            return
+        if len(self._pending) >= self.max_sessions:
+            self.stats["skipped"] += 1
+            return
+        self._pending[call_sid] = asyncio.create_task(self._build(build))
+        self._expiry[call_sid] = asyncio.get_running_loop().call_later(
+            self.ttl, lambda: asyncio.create_task(self._expire(call_sid))
+        )
+        self.stats["prepared"] += 1
+
+    async def _build(self, build: Callable[[], WarmSession]) -> WarmSession:
+        session = build()
+        await session.prewarm()
+        return session
+
+    async def claim(self, call_sid: str) -> Optional[WarmSession]:
+        """Take the call's session, waiting briefly if it is still warming up."""
+        task = self._pending.pop(call_sid, None)
+        self._cancel_expiry(call_sid)
+        if task is None:
+            return None
+        try:
+            session = await asyncio.wait_for(asyncio.shield(task), timeout=self.claim_timeout)
+        except Exception as e:
+            print(f"Warm session for {call_sid} not usable, building cold: {e}")
+            task.add_done_callback(self._release_result)
+            return None
+        self.stats["claimed"] += 1
+        return session
+
+    async def discard(self, call_sid: str):
+        """Tear down the call's session if it was never claimed."""
+        task = self._pending.pop(call_sid, None)
+        self._cancel_expiry(call_sid)
+        if task is None:
+            return
+        try:
+            session = await task
+        except Exception:
+            return
+        await session.release()
+
+    async def _expire(self, call_sid: str):
+        if call_sid in self._pending:
+            self.stats["expired"] += 1
+            print(f"Warm session for {call_sid} expired unclaimed")
+            await self.discard(call_sid)
+
+    def _cancel_expiry(self, call_sid: str):
+        handle = self._expiry.pop(call_sid, None)
+        if handle:
+            handle.cancel()
+
+    @staticmethod
+    def _release_result(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is None:
+            asyncio.create_task(task.result().release())
@@ -0,0 +1,191 @@
+# tests/test_admission.py
+import asyncio
+import json
+import sys
+import tempfile
+from types import SimpleNamespace
+from pathlib import Path
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from models.agent import Agent
+from models.campaign import CampaignJob, JOB_COMPLETED
+from services.admission import AdmissionController, AdmissionRejected, REASON_LOOP_LAG, REASON_SESSIONS
+from services.agent_registry import AgentRegistry
+from services.bot import CallBot
+from services.call_registry import MemoryCallRegistry
+from services.campaign import CampaignScheduler
+from services.loop_lag import LoopLagMonitor
+
+def test_session_limit_defers_then_admits():
+    """A dial over the limit waits for a session to end, or is rejected after the defer timeout."""
+    async def scenario():
+        admission = AdmissionController(max_sessions=2, defer_timeout=0.2)
+        first = await admission.admit_dial()
+        admission.assign(first, "CA1")
+        assert admission.open_session("CA1")
+        second = await admission.admit_dial()  # reserved, not yet dialed
+        assert admission.saturation() == REASON_SESSIONS
+
+        try:
+            await admission.admit_dial()
+            assert False, "dial should have been rejected"
+        except AdmissionRejected as e:
+            assert e.reason == REASON_SESSIONS
+
+        admission.defer_timeout = 5
+        waiting = asyncio.create_task(admission.admit_dial())
+        await asyncio.sleep(0.05)
+        assert not waiting.done()
+        await admission.close_session("CA1")
+        await asyncio.wait_for(waiting, 1)
+        await admission.release(second)
+        assert admission.stats == {"admitted": 3, "deferred": 2, "rejected": 1, "shed": 0}
+        assert admission.gauges()["reserved_dials"] == 1
+        await admission.monitor.stop()
+
+    asyncio.run(scenario())
+
+def test_loop_lag_holds_back_dials_but_not_streams():
+    async def scenario():
+        monitor = LoopLagMonitor()
+        admission = AdmissionController(max_sessions=10, max_loop_lag_ms=50, defer_timeout=0, monitor=monitor)
+        monitor.samples.extend([200.0] * 40)
+        assert admission.saturation() == REASON_LOOP_LAG
+        try:
+            await admission.admit_dial()
+            assert False, "dial should have been rejected"
+        except AdmissionRejected as e:
+            assert e.reason == REASON_LOOP_LAG
+        # A stream that connects anyway is already answered: it is kept.
+        assert admission.open_session("CA1")
+        monitor.samples.extend([1.0] * 40)
+        assert admission.saturation() is None
+        await monitor.stop()
+
+    asyncio.run(scenario())
+
+def test_unreserved_streams_shed_when_full():
+    async def scenario():
+        admission = AdmissionController(max_sessions=1)
+        ticket = await admission.admit_dial()
+        admission.assign(ticket, "CA1")
+        assert not admission.open_session("CA2")  # nobody dialed it, no room here
+        assert admission.open_session("CA1")      # its slot was reserved at dial time
+        assert admission.stats["shed"] == 1
+        assert admission.gauges()["utilization"] == 1.0
+        assert admission.open_session("CA3", dialed=True)  # dialed by a sibling worker, admitted there
+        assert admission.stats["shed"] == 1 and admission.sessions == {"CA1", "CA3"}
+        await admission.monitor.stop()
+
+    asyncio.run(scenario())
+
+class SaturatedBot:
+    """Rejects the first dial as if the server were saturated."""
+
+    def __init__(self):
+        self.dials = 0
+
+    async def make_call(self, to_number, agent_id=None):
+        self.dials += 1
+        if self.dials == 1:
+            raise AdmissionRejected(REASON_SESSIONS, retry_after=0.01)
+        return f"CA{self.dials}"
+
+    async def wait_for_call(self, call_sid, connect_timeout, call_timeout):
+        return True
+
+def test_campaign_waits_out_rejections():
+    """A rejected dial is tried again without using up the job's retries."""
+    async def scenario():
+        scheduler = CampaignScheduler(SaturatedBot(), calls_per_second=1000, backoff=0.001, max_retries=0)
+        campaign = scheduler.submit([CampaignJob(phone_number="+15550000001")])
+        while not campaign.done:
+            await asyncio.sleep(0.005)
+        return campaign
+
+    campaign = asyncio.run(scenario())
+    assert campaign.jobs[0].status == JOB_COMPLETED
+    assert campaign.jobs[0].attempts == 1
+
+class FakeTwilio:
+    async def create_call(self, to, from_, twiml):
+        return "CA1"
+
+def make_bot(tmp: str) -> CallBot:
+    bot = CallBot(
+        Agent(agent_id="default", name="shop", prompt="You answer questions about the shop."),
+        "ACtest", "token", "+15550000000", "https://example.test",
+        registry=MemoryCallRegistry(), agents=AgentRegistry(f"{tmp}/agents.sqlite3"),
+    )
+    bot.twilio = FakeTwilio()
+    bot.admission.monitor = SimpleNamespace(start=lambda: None, samples=[], interval=0.05)
+    return bot
+
+def test_failed_dial_releases_the_call_sids_reservation():
+    """An error after the dial got its SID releases the slot now held under that SID."""
+    async def scenario(tmp):
+        bot = make_bot(tmp)
+        async def broken(call_sid, to_number=None, record=None):
+            raise RuntimeError("registry unavailable")
+        bot.registry.dialed = broken
+        assert await bot.make_call("+15550000001") is None
+        return bot.admission.reserved()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        assert asyncio.run(scenario(tmp)) == 0
+
+def test_stream_on_another_worker_releases_the_dialing_workers_slot():
+    """Once the registry shows the stream was claimed elsewhere, the dialing worker frees its slot."""
+    async def scenario(tmp):
+        bot = make_bot(tmp)
+        bot.admission.assign(bot.admission._admit(), "CA1")
+        await bot.registry.dialed("CA1", "+15550000001")
+        await bot.registry.stream_started("CA1", "MZ1")  # as another worker would
+        waiting = asyncio.create_task(bot.wait_for_call("CA1", connect_timeout=5, call_timeout=5))
+        await asyncio.sleep(1.2)  # the registry is polled every CALL_REGISTRY_POLL_INTERVAL
+        reserved = bot.admission.reserved()
+        await bot.registry.ended("CA1")
+        assert await waiting
+        return reserved
+
+    with tempfile.TemporaryDirectory() as tmp:
+        assert asyncio.run(scenario(tmp)) == 0
+
+def test_stream_dialed_by_a_sibling_worker_is_not_shed():
+    """A full worker still takes the stream of a call another worker dialed, but sheds unknown ones."""
+    async def scenario(tmp):
+        bot = make_bot(tmp)
+        bot.admission.max_sessions = 1
+        bot.admission.assign(bot.admission._admit(), "CA9")  # this worker's own dial fills it
+        sibling = MemoryCallRegistry(worker_id="host-b:2")
+        sibling._calls = bot.registry._calls  # the shared backend
+        await sibling.dialed("CA1", "+15550000001")
+        shed = []
+        async def shed_stream(websocket, call_sid):
+            shed.append(call_sid)
+        bot.shed_stream = shed_stream
+        started = []
+        async def run_pipeline(websocket, call_sid, agent_id=None, stream_sid=None):
+            started.append(call_sid)
+        bot.run_pipeline = run_pipeline
+
+        for call_sid in ("CA1", "CA2"):
+            start = {"event": "start", "start": {"callSid": call_sid, "streamSid": f"MZ{call_sid}"}}
+            await bot.handle_websocket(SimpleNamespace(receive_text=lambda m=json.dumps(start): asyncio.sleep(0, m)))
+        return started, shed
+
+    with tempfile.TemporaryDirectory() as tmp:
+        assert asyncio.run(scenario(tmp)) == (["CA1"], ["CA2"])
+
+if __name__ == "__main__":
+    test_session_limit_defers_then_admits()
+    test_loop_lag_holds_back_dials_but_not_streams()
+    test_unreserved_streams_shed_when_full()
+    test_campaign_waits_out_rejections()
+    test_failed_dial_releases_the_call_sids_reservation()
+    test_stream_on_another_worker_releases_the_dialing_workers_slot()
+    test_stream_dialed_by_a_sibling_worker_is_not_shed()
+    print("admission tests passed")
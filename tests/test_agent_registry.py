@@ -0,0 +1,72 @@
+# tests/test_agent_registry.py
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from models.agent import Agent
+from services.agent_registry import AgentRegistry
+
+def test_agents_shared_between_workers():
+    """An agent created or updated through one registry is seen by another on the same file."""
+    async def scenario(path):
+        first = AgentRegistry(path)
+        second = AgentRegistry(path)
+        created = await first.create(Agent(name="burger_bot", prompt="Sell burgers.", voice_id="v1"))
+
+        found = await second.find("burger_bot")
+        assert found.agent_id == created.agent_id and found.prompt == "Sell burgers."
+        assert (await second.get(created.agent_id)).version == 1
+
+        updated = await second.update(created.agent_id, prompt="Sell fries.")
+        assert updated.version == 2 and updated.voice_id == "v1"
+        assert (await first.get(created.agent_id)).prompt == "Sell fries."
+        assert [a.agent_id for a in await first.list()] == [created.agent_id]
+        assert await first.update("missing", prompt="x") is None
+
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(scenario(f"{directory}/agents.sqlite3"))
+
+def test_compiled_once_per_version():
+    async def scenario(path):
+        registry = AgentRegistry(path)
+        agent = await registry.create(Agent(name="support", prompt="Help the caller.", voice_id="v1"))
+
+        compiled = registry.compile(await registry.get(agent.agent_id))
+        assert registry.compile(await registry.get(agent.agent_id)) is compiled
+        assert compiled.messages[0] == {"role": "system", "content": "Help the caller."}
+        assert compiled.tts_options == {"voice_id": "v1"}
+
+        # Each call gets its own list, so one call's turns never leak into another's context.
+        messages = compiled.initial_messages()
+        messages.append({"role": "user", "content": "hi"})
+        assert len(compiled.initial_messages()) == len(compiled.messages)
+
+        await registry.update(agent.agent_id, voice_id="v2")
+        recompiled = registry.compile(await registry.get(agent.agent_id))
+        assert recompiled is not compiled and recompiled.tts_options == {"voice_id": "v2"}
+        assert registry.stats == {"compiled": 2, "reused": 1}
+
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(scenario(f"{directory}/agents.sqlite3"))
+
+def test_ensure_keeps_stored_agent():
+    async def scenario(path):
+        registry = AgentRegistry(path)
+        await registry.ensure(Agent(agent_id="default", name="ai agent", prompt="original"))
+        await registry.update("default", prompt="edited")
+        stored = await registry.ensure(Agent(agent_id="default", name="ai agent", prompt="original"))
+        assert stored.prompt == "edited"
+
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(scenario(f"{directory}/agents.sqlite3"))
+
+if __name__ == "__main__":
+    test_agents_shared_between_workers()
+    test_compiled_once_per_version()
+    test_ensure_keeps_stored_agent()
+    print("agent registry tests passed")
@@ -0,0 +1,75 @@
+# tests/test_audio_codec.py
+import audioop
+import base64
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from services.audio_codec import (
+    ULAW_DECODE, ULAW_ENCODE, InboundAudioConverter, OutboundAudioConverter, FastTwilioFrameSerializer
+)
+
+from pipecat.frames.frames import InputAudioRawFrame, OutputAudioRawFrame, StartInterruptionFrame
+
+def test_tables_match_audioop():
+    assert ULAW_DECODE.tobytes() == audioop.ulaw2lin(bytes(range(256)), 2)
+    every_sample = np.arange(-32768, 32768, dtype=np.int16).tobytes()
+    assert ULAW_ENCODE.tobytes() == audioop.lin2ulaw(every_sample, 2)
+
+def test_outbound_averages_and_carries_state():
+    rng = np.random.default_rng(0)
+    for rate in (8000, 16000, 24000):
+        factor = rate // 8000
+        samples = rng.integers(-32768, 32768, 4800 * factor, dtype=np.int16)
+        average = np.fix(samples.reshape(-1, factor).astype(np.int32).sum(axis=1) / factor).astype(np.int16)
+        expected = audioop.lin2ulaw(average.tobytes(), 2)
+        # Uneven chunks, so groups of samples straddle frame boundaries.
+        converter = OutboundAudioConverter(rate)
+        pcm = samples.tobytes()
+        out = b"".join(converter.convert(pcm[i:i + 962]) for i in range(0, len(pcm), 962))
+        assert out == expected, rate
+
+def test_inbound_is_continuous_across_frames():
+    rng = np.random.default_rng(1)
+    payload = rng.integers(0, 256, 800, dtype=np.uint8).tobytes()
+    whole = InboundAudioConverter(16000).convert(payload)
+    converter = InboundAudioConverter(16000)
+    frames = [converter.convert(payload[i:i + 160]) for i in range(0, len(payload), 160)]
+    assert all(len(frame) == 640 for frame in frames)
+    assert b"".join(frames) == whole
+    # Every other sample is the decoded input; the ones between interpolate.
+    pcm = np.frombuffer(whole, dtype=np.int16).astype(np.int32)
+    decoded = ULAW_DECODE[np.frombuffer(payload, dtype=np.uint8)].astype(np.int32)
+    assert (pcm[1::2] == decoded).all()
+    assert (np.abs(pcm[2::2] - (decoded[:-1] + decoded[1:]) / 2) <= 1).all()
+
+def test_serializer_round_trip():
+    serializer = FastTwilioFrameSerializer("MZ123")
+    tone = (np.sin(np.arange(480) * 2 * np.pi * 440 / 24000) * 8000).astype(np.int16)
+    message = json.loads(serializer.serialize(OutputAudioRawFrame(tone.tobytes(), 24000, 1)))
+    assert message["event"] == "media" and message["streamSid"] == "MZ123"
+    payload = message["media"]["payload"]
+    assert len(base64.b64decode(payload)) == 160
+
+    # Compact (as Twilio sends it) and spaced JSON both parse.
+    inbound = {"event": "media", "streamSid": "MZ123", "media": {"track": "inbound", "payload": payload}}
+    for data in (json.dumps(inbound, separators=(",", ":")), json.dumps(inbound)):
+        frame = serializer.deserialize(data)
+        assert isinstance(frame, InputAudioRawFrame)
+        assert frame.sample_rate == 16000 and len(frame.audio) == 640
+    assert serializer.deserialize(json.dumps({"event": "mark", "streamSid": "MZ123"})) is None
+    clear = json.loads(serializer.serialize(StartInterruptionFrame()))
+    assert clear == {"event": "clear", "streamSid": "MZ123"}
+
+if __name__ == "__main__":
+    test_tables_match_audioop()
+    test_outbound_averages_and_carries_state()
+    test_inbound_is_continuous_across_frames()
+    test_serializer_round_trip()
+    print("audio codec tests passed")
@@ -0,0 +1,124 @@
+# tests/test_call_metrics.py
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from services.call_metrics import (
+    CallActivity, compute_call_metrics, summarize_call_metrics, word_error_rate, needs_review
+)
+from services.tracing import USER_STARTED, USER_STOPPED, BOT_STARTED, BOT_STOPPED, END_CALL
+from services.context_compactor import ContextCompactor, SUMMARY_PREFIX
+from services.transcripts import CallTranscriptWriter, TranscriptStore
+
+from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext
+
+def scripted_call() -> CallActivity:
+    """Two caller turns; the caller barges in on the first reply and the second reply comes after a long pause."""
+    return CallActivity(
+        call_sid="CA1",
+        messages=[
+            {"role": "user", "content": "Hi, what time do you open?"},
+            {"role": "assistant", "content": "We open at nine."},
+            {"role": "user", "content": "OK, bye."},
+        ],
+        timeline=[
+            (1.0, USER_STARTED), (2.0, USER_STOPPED),
+            (2.8, BOT_STARTED), (4.0, USER_STARTED), (4.5, BOT_STOPPED), (5.0, USER_STOPPED),
+            (10.0, BOT_STARTED), (11.0, BOT_STOPPED),
+        ],
+        duration=12.0,
+        expected=["hi what time do you open", "okay bye"],
+    )
+
+def test_timeline_metrics():
+    metrics = compute_call_metrics([scripted_call()])[0]
+    assert metrics["response_latencies_ms"] == [800.0, 5000.0]
+    assert metrics["barge_ins"] == 1 and metrics["agent_interruptions"] == 0
+    assert metrics["user_talk_s"] == 2.0 and metrics["agent_talk_s"] == 2.7
+    assert metrics["talk_listen_ratio"] == 1.35
+    assert metrics["silence_gaps"] == 1 and metrics["longest_silence_s"] == 5.0
+    # The caller said goodbye and the agent never called end_call.
+    assert metrics["missed_end_call"] and not metrics["ended_by_agent"]
+    assert metrics["wer"] == 0.125  # "ok" for "okay", one word in eight
+    assert needs_review(metrics, max_latency_ms=3000, max_wer=0.3)
+
+def test_batch_matches_single_calls():
+    """A call's metrics do not depend on the rest of the batch."""
+    ended = CallActivity(
+        call_sid="CA2",
+        messages=[{"role": "assistant", "tool_calls": [{"function": {"name": "end_call", "arguments": "{}"}}]}],
+        timeline=[(0.5, BOT_STARTED), (0.7, USER_STARTED), (1.0, BOT_STOPPED), (1.2, END_CALL)],
+    )
+    unanswered = CallActivity(call_sid="CA3", timeline=[(0.2, USER_STARTED)], duration=3.0)
+    calls = [scripted_call(), ended, CallActivity(call_sid="CA4"), unanswered]
+    batch = compute_call_metrics(calls)
+    assert batch == [compute_call_metrics([call])[0] for call in calls]
+    assert batch[1]["ended_by_agent"] and batch[1]["barge_ins"] == 1
+    # A turn without a stop runs to the end of the call.
+    assert batch[3]["user_talk_s"] == 2.8 and batch[3]["response_latency_ms"]["count"] == 0
+
+    summary = summarize_call_metrics(batch)
+    assert summary["calls"] == 4 and summary["barge_ins"] == 2 and summary["missed_end_call"] == 1
+    assert summary["response_latency"]["count"] == 2
+
+def test_word_error_rate():
+    assert word_error_rate("a b c".split(), "a b c".split()) == 0.0
+    assert word_error_rate("a b c".split(), "a x c d".split()) == 2 / 3  # one substitution, one insertion
+    assert word_error_rate("a b c".split(), []) == 1.0
+
+def test_quality_stored_with_call():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TranscriptStore(f"{tmp}/transcripts.sqlite3")
+        store.start_call("CA1", "ai agent")
+        metrics = compute_call_metrics([scripted_call()])[0]
+        store.set_quality("CA1", metrics)
+        store.flush()
+        assert store.get_call("CA1")["quality"] == metrics
+        assert store.list_calls()["calls"][0]["quality"]["barge_ins"] == 1
+        store.close()
+
+def test_quality_of_compacted_call_uses_whole_conversation():
+    """Turns summarized out of the LLM context still count towards the call's metrics."""
+    async def summarize(summary, messages):
+        return "the caller asked about opening hours"
+
+    async def scenario(store):
+        context = OpenAILLMContext([{"role": "system", "content": "You run a shop."}])
+        writer = CallTranscriptWriter(store, "CA2", "ai agent")
+        compactor = ContextCompactor(budget=300, summarizer=summarize, keep_turns=2, trigger=0.5)
+        said = ["Bye for now, thanks." if i == 0 else f"question number {i} " + "x" * 100 for i in range(8)]
+        for line in said:
+            context.add_message({"role": "user", "content": line})
+            writer.sync(context.messages)  # the transcript tap runs before the compactor
+            compactor.compact(context)
+            context.add_message({"role": "assistant", "content": "answer " + "y" * 100})
+            writer.sync(context.messages)
+            await asyncio.sleep(0)
+        return context, writer, said
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TranscriptStore(f"{tmp}/transcripts.sqlite3")
+        context, writer, said = asyncio.run(scenario(store))
+        store.close()
+    assert any(m["content"].startswith(SUMMARY_PREFIX) for m in context.messages)
+
+    def metrics(messages):
+        return compute_call_metrics([CallActivity("CA2", messages, [], 60.0, expected=said)])[0]
+
+    compacted, whole = metrics(list(context.messages)), metrics(writer.conversation())
+    assert compacted["wer"] > 0.5 and not compacted["missed_end_call"]
+    assert whole["wer"] == 0.0 and whole["missed_end_call"]
+    assert len(writer.conversation()) == 16
+
+if __name__ == "__main__":
+    test_timeline_metrics()
+    test_batch_matches_single_calls()
+    test_word_error_rate()
+    test_quality_stored_with_call()
+    test_quality_of_compacted_call_uses_whole_conversation()
+    print("call metrics tests passed")
@@ -0,0 +1,79 @@
+# tests/test_call_registry.py
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from models.call import CALL_DIALING, CALL_ENDED, CALL_STREAMING
+from services.call_registry import MemoryCallRegistry, SQLiteCallRegistry, current_worker_id
+
+def test_stream_on_another_worker():
+    """A call dialed by one worker and streamed by another is visible to both."""
+    async def scenario(path):
+        dialer = SQLiteCallRegistry(path, worker_id="host-a:1")
+        streamer = SQLiteCallRegistry(path, worker_id="host-b:2")
+        await dialer.dialed("CA1", "+15550000000")
+        assert (await streamer.get("CA1")).state == CALL_DIALING
+
+        await streamer.stream_started("CA1", "MZ1")
+        record = await dialer.get("CA1")
+        assert record.state == CALL_STREAMING and record.owner == "host-b:2"
+        assert record.dialed_by == "host-a:1" and record.stream_sid == "MZ1"
+        assert [r.call_sid for r in await dialer.active()] == ["CA1"]
+
+        await streamer.ended("CA1")
+        assert (await dialer.get("CA1")).state == CALL_ENDED
+        assert await dialer.active() == []
+
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(scenario(f"{directory}/calls.sqlite3"))
+
+def test_recording_override_reaches_the_streaming_worker():
+    """`record` set at dial time is stored with the call, not in the dialing process."""
+    async def scenario(path):
+        dialer = SQLiteCallRegistry(path, worker_id="host-a:1")
+        streamer = SQLiteCallRegistry(path, worker_id="host-b:2")
+        await dialer.dialed("CA1", "+15550000000", record=True)
+        await dialer.dialed("CA2", "+15550000000", record=False)
+        await dialer.dialed("CA3", "+15550000000")
+        assert [(await streamer.get(sid)).record for sid in ("CA1", "CA2", "CA3")] == [True, False, None]
+
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(scenario(f"{directory}/calls.sqlite3"))
+
+def test_reap_ends_calls_of_dead_workers():
+    async def scenario(path):
+        host = current_worker_id().rpartition(":")[0]
+        dead = SQLiteCallRegistry(path, worker_id=f"{host}:999999999")
+        alive = SQLiteCallRegistry(path)
+        await dead.stream_started("CA1", "MZ1")
+        await alive.stream_started("CA2", "MZ2")
+        await alive.reap()
+        assert (await alive.get("CA1")).status == "worker-exited"
+        assert (await alive.get("CA2")).state == CALL_STREAMING
+
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(scenario(f"{directory}/calls.sqlite3"))
+
+def test_memory_registry():
+    async def scenario():
+        registry = MemoryCallRegistry()
+        await registry.dialed("CA1", record=True)
+        assert (await registry.get("CA1")).record is True
+        await registry.stream_started("CA1", "MZ1")
+        await registry.ended("CA1", "completed")
+        assert (await registry.get("CA1")).status == "completed"
+        assert await registry.active() == []
+
+    asyncio.run(scenario())
+
+if __name__ == "__main__":
+    test_stream_on_another_worker()
+    test_recording_override_reaches_the_streaming_worker()
+    test_reap_ends_calls_of_dead_workers()
+    test_memory_registry()
+    print("call registry tests passed")
@@ -0,0 +1,120 @@
+# tests/test_campaign.py
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from models.campaign import CampaignJob, JOB_COMPLETED, JOB_FAILED
+from services.admission import AdmissionRejected
+from services.campaign import CampaignScheduler
+
+class FakeBot:
+    """
+    Stands in for CallBot: fails the first `failures` dials of each number,
+    rejects every dial while `saturated`, and connects a media stream only
+    if `connects`.
+    """
+
+    def __init__(self, failures=0, saturated=False, connects=True):
+        self.failures = failures
+        self.saturated = saturated
+        self.connects = connects
+        self.dials = {}
+        self.hangups = []
+        self.live = 0
+        self.max_live = 0
+
+    async def make_call(self, to_number, agent_id=None):
+        if self.saturated:
+            raise AdmissionRejected("sessions", retry_after=0)
+        self.dials[to_number] = self.dials.get(to_number, 0) + 1
+        if self.dials[to_number] <= self.failures:
+            return None
+        return f"CA{to_number}{self.dials[to_number]}"
+
+    async def wait_for_call(self, call_sid, connect_timeout, call_timeout):
+        self.live += 1
+        self.max_live = max(self.max_live, self.live)
+        await asyncio.sleep(0.01)
+        self.live -= 1
+        return self.connects
+
+    async def hangup(self, call_sid):
+        self.hangups.append(call_sid)
+        return True
+
+async def _run_campaign(bot, jobs, **kwargs):
+    scheduler = CampaignScheduler(bot, calls_per_second=1000, backoff=0.001, **kwargs)
+    campaign = scheduler.submit(jobs)
+    while not campaign.done:
+        await asyncio.sleep(0.005)
+    return campaign
+
+def test_bounded_concurrency():
+    """No more than max_concurrency calls are live at once."""
+    bot = FakeBot()
+    jobs = [CampaignJob(phone_number=f"+1555000{i:04d}") for i in range(20)]
+    campaign = asyncio.run(_run_campaign(bot, jobs, max_concurrency=3))
+    assert bot.max_live <= 3
+    assert campaign.progress()["counts"] == {JOB_COMPLETED: 20}
+
+def test_retries_then_fails():
+    """Failed dials are retried up to max_retries and then marked failed."""
+    bot = FakeBot(failures=10)
+    jobs = [CampaignJob(phone_number="+15550000001")]
+    campaign = asyncio.run(_run_campaign(bot, jobs, max_retries=2))
+    assert campaign.jobs[0].status == JOB_FAILED
+    assert campaign.jobs[0].attempts == 3
+
+def test_retry_recovers():
+    """A dial that fails once succeeds on retry."""
+    bot = FakeBot(failures=1)
+    jobs = [CampaignJob(phone_number="+15550000002")]
+    campaign = asyncio.run(_run_campaign(bot, jobs))
+    assert campaign.jobs[0].status == JOB_COMPLETED
+    assert campaign.jobs[0].attempts == 2
+
+def test_call_without_stream_is_hung_up_before_retry():
+    """A dialed call that never streams is ended before the number is dialed again."""
+    bot = FakeBot(connects=False)
+    jobs = [CampaignJob(phone_number="+15550000003")]
+    campaign = asyncio.run(_run_campaign(bot, jobs, max_retries=1))
+    assert campaign.jobs[0].status == JOB_FAILED and campaign.jobs[0].attempts == 2
+    assert bot.hangups == ["CA+155500000031", "CA+155500000032"]
+
+def test_admission_rejections_are_capped():
+    """Dials held back by admission control do not use up retries, but a job still gives up."""
+    bot = FakeBot(saturated=True)
+    jobs = [CampaignJob(phone_number="+15550000004")]
+    campaign = asyncio.run(_run_campaign(bot, jobs, max_retries=0, max_deferrals=3))
+    job = campaign.jobs[0]
+    assert job.status == JOB_FAILED and job.attempts == 0 and job.deferrals == 4
+    assert job.error.startswith("server saturated")
+
+class BrokenRegistryBot(FakeBot):
+    """Waiting on one number's call fails, as when the call registry cannot be read."""
+
+    async def wait_for_call(self, call_sid, connect_timeout, call_timeout):
+        if call_sid.startswith("CA+15550000000"):
+            raise RuntimeError("database is locked")
+        return await super().wait_for_call(call_sid, connect_timeout, call_timeout)
+
+def test_job_error_fails_only_that_job():
+    bot = BrokenRegistryBot()
+    jobs = [CampaignJob(phone_number=f"+1555000{i:04d}") for i in range(3)]
+    campaign = asyncio.run(asyncio.wait_for(_run_campaign(bot, jobs), 5))
+    assert [job.status for job in jobs] == [JOB_FAILED, JOB_COMPLETED, JOB_COMPLETED]
+    assert jobs[0].error == "database is locked" and jobs[0].finished_at is not None
+    assert campaign.progress()["counts"] == {JOB_FAILED: 1, JOB_COMPLETED: 2}
+
+if __name__ == "__main__":
+    test_bounded_concurrency()
+    test_retries_then_fails()
+    test_retry_recovers()
+    test_call_without_stream_is_hung_up_before_retry()
+    test_admission_rejections_are_capped()
+    test_job_error_fails_only_that_job()
+    print("campaign tests passed")
@@ -0,0 +1,97 @@
+# tests/test_context_compactor.py
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from services.context_compactor import ContextCompactor, SUMMARY_PREFIX, estimate_tokens, split_turns
+
+from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext
+
+PROMPT = {"role": "system", "content": "You take pizza orders."}
+
+class FakeSummarizer:
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, summary, messages):
+        self.calls.append((summary, [m["content"] for m in messages]))
+        return f"{summary or ''}+{len(messages)}"
+
+def add_turn(context, i):
+    context.add_message({"role": "user", "content": f"user turn {i} " + "x" * 200})
+    context.add_message({"role": "assistant", "content": f"reply {i} " + "y" * 200})
+
+def test_split_turns_keeps_tool_calls_together():
+    messages = [
+        {"role": "assistant", "content": "Hi!"},
+        {"role": "user", "content": "bye"},
+        {"role": "assistant", "tool_calls": [{"id": "1"}]},
+        {"role": "tool", "content": "ok"},
+    ]
+    assert [len(turn) for turn in split_turns(messages)] == [1, 3]
+
+def test_older_turns_summarized_off_the_critical_path():
+    async def scenario():
+        messages = [PROMPT]
+        context = OpenAILLMContext(messages)
+        summarizer = FakeSummarizer()
+        compactor = ContextCompactor(budget=1000, summarizer=summarizer, keep_turns=3, trigger=0.5)
+        sizes = []
+        for i in range(40):
+            add_turn(context, i)
+            compactor.compact(context)
+            await asyncio.sleep(0)  # the summary finishes between turns
+            sizes.append(estimate_tokens(context.messages))
+
+        assert context.messages is messages  # edited in place
+        assert messages[0] is PROMPT
+        assert messages[1]["content"].startswith(SUMMARY_PREFIX)
+        assert messages[-2]["content"].startswith("user turn 39")
+        assert len(split_turns(messages[2:])) >= 3
+        assert max(sizes) <= 1000
+        assert compactor.stats["summaries"] > 1 and compactor.stats["errors"] == 0
+        # Each summary builds on the previous one.
+        assert summarizer.calls[1][0] == f"+{len(summarizer.calls[0][1])}"
+
+    asyncio.run(scenario())
+
+def test_over_budget_drops_turns_for_the_next_summary():
+    """Turns dropped while a summary is still running are folded into the next one."""
+    async def scenario():
+        context = OpenAILLMContext([PROMPT])
+        release = asyncio.Event()
+        seen = []
+
+        async def slow_summarizer(summary, messages):
+            seen.append([m["content"][:12] for m in messages])
+            await release.wait()
+            return "summary"
+
+        compactor = ContextCompactor(budget=600, summarizer=slow_summarizer, keep_turns=2, trigger=0.5)
+        for i in range(8):
+            add_turn(context, i)
+            compactor.compact(context)
+            await asyncio.sleep(0)
+            assert estimate_tokens(context.messages) <= 600
+        assert compactor.stats["dropped_turns"] > 0
+
+        release.set()
+        await asyncio.sleep(0)
+        add_turn(context, 8)
+        compactor.compact(context)
+        await asyncio.sleep(0)
+        # The second summary covers the turns dropped while the first was running.
+        assert len(seen) == 2 and any(c.startswith("user turn 4") for c in seen[1])
+        assert context.messages[1]["content"] == SUMMARY_PREFIX + "summary"
+
+    asyncio.run(scenario())
+
+if __name__ == "__main__":
+    test_split_turns_keeps_tool_calls_together()
+    test_older_turns_summarized_off_the_critical_path()
+    test_over_budget_drops_turns_for_the_next_summary()
+    print("context compactor tests passed")
@@ -0,0 +1,84 @@
+# tests/test_evaluator.py
+import asyncio
+import json
+import re
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from models.conversation import Conversation
+from services.evaluator import ConversationEvaluator, VerdictCache
+
+class FakeJudge:
+    """Stands in for AsyncOpenAI: passes every criterion containing "greet"."""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        prompt = kwargs["messages"][-1]["content"]
+        criteria = re.findall(r"^(\d+)\. (.*)$", prompt.split("Criteria:\n")[1], re.M)
+        verdicts = [{"index": int(i), "passed": "greet" in text, "reason": "fake"} for i, text in criteria]
+        message = SimpleNamespace(content=json.dumps({"verdicts": verdicts}))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+def conversation(i: int) -> Conversation:
+    return Conversation(
+        messages=[
+            {"role": "system", "content": "be nice"},
+            {"role": "assistant", "content": f"Hello caller {i}"},
+            {"role": "user", "content": "bye"},
+        ],
+        call_sid=f"CA{i}",
+    )
+
+def test_structured_verdicts_in_order():
+    judge = FakeJudge()
+    evaluator = ConversationEvaluator(cache=VerdictCache(":memory:"), client=judge)
+    result = asyncio.run(evaluator.evaluate(conversation(0), ["agent greets caller", "agent books a slot"]))
+    assert [v.passed for v in result.verdicts] == [True, False]
+    assert result.call_sid == "CA0" and not result.passed
+
+def test_bounded_concurrency():
+    judge = FakeJudge()
+    evaluator = ConversationEvaluator(max_concurrency=3, cache=VerdictCache(":memory:"), client=judge)
+    results = asyncio.run(evaluator.evaluate_many([conversation(i) for i in range(12)], ["agent greets caller"]))
+    assert len(results) == 12 and all(r.passed for r in results)
+    assert judge.calls == 12 and judge.peak == 3
+
+def test_only_changed_criteria_are_reevaluated():
+    judge = FakeJudge()
+    evaluator = ConversationEvaluator(cache=VerdictCache(":memory:"), client=judge)
+    conversations = [conversation(i) for i in range(4)]
+    asyncio.run(evaluator.evaluate_many(conversations, ["agent greets caller", "agent is brief"]))
+    assert evaluator.stats["fresh_verdicts"] == 8
+
+    # Tweak one criterion: only that one is judged again.
+    results = asyncio.run(evaluator.evaluate_many(conversations, ["agent greets caller", "agent is concise"]))
+    assert evaluator.stats["fresh_verdicts"] == 12
+    assert evaluator.stats["cached_verdicts"] == 4
+    assert all(r.verdicts[0].cached and not r.verdicts[1].cached for r in results)
+
+    # Nothing changed: no requests at all.
+    calls = judge.calls
+    asyncio.run(evaluator.evaluate_many(conversations, ["agent greets caller", "agent is concise"]))
+    assert judge.calls == calls
+
+if __name__ == "__main__":
+    test_structured_verdicts_in_order()
+    test_bounded_concurrency()
+    test_only_changed_criteria_are_reevaluated()
+    print("evaluator tests passed")
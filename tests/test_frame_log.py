@@ -0,0 +1,61 @@
+# tests/test_frame_log.py
+import asyncio
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from services.frame_log import FrameLog, FrameLogger, loggable
+
+from pipecat.frames.frames import InputAudioRawFrame, TextFrame, TranscriptionFrame
+from pipecat.processors.frame_processor import FrameDirection
+
+def test_loggable_truncates():
+    assert loggable(b"\x00" * 320) == {"bytes": 320}
+    assert loggable("x" * 10, max_chars=4) == "xxxx...(+6 chars)"
+    assert loggable(3) == 3 and loggable(None) is None
+
+def test_filtering_and_sampling():
+    """Listed types are logged at their rate, through base classes; unlisted types are not."""
+    async def scenario(path):
+        log = FrameLog(path, flush_interval=0)
+        logger = FrameLogger(log, "CA1", "stt", sample_rates={"TextFrame": 1.0, "AudioRawFrame": 0.0})
+        pushed = []
+
+        async def push_frame(frame, direction=FrameDirection.DOWNSTREAM):
+            pushed.append(frame)
+        logger.push_frame = push_frame
+
+        frames = [
+            TranscriptionFrame("hello", "caller", "2024-01-01T00:00:00"),
+            InputAudioRawFrame(b"\x00" * 320, 8000, 1),
+            TextFrame("y" * 500),
+        ]
+        for frame in frames:
+            await logger.process_frame(frame, FrameDirection.DOWNSTREAM)
+        assert pushed == frames
+        log.flush()
+        return [json.loads(line) for line in Path(path).read_text().splitlines()]
+
+    with tempfile.TemporaryDirectory() as directory:
+        events = asyncio.run(scenario(f"{directory}/frames.jsonl"))
+    assert [e["frame"] for e in events] == ["TranscriptionFrame", "TextFrame"]
+    assert events[0]["call_sid"] == "CA1" and events[0]["fields"]["text"] == "hello"
+    assert events[1]["fields"]["text"].endswith("(+300 chars)")
+
+def test_full_queue_drops():
+    log = FrameLog(None, queue_size=2)
+    log._thread = object()  # no writer, so the queue fills
+    for _ in range(5):
+        log.emit("frame")
+    assert log.stats["dropped"] == 3
+
+if __name__ == "__main__":
+    test_loggable_truncates()
+    test_filtering_and_sampling()
+    test_full_queue_drops()
+    print("frame log tests passed")
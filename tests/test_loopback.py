@@ -0,0 +1,98 @@
+# tests/test_loopback.py
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from bench.mock_providers import MockProviders, MockSTTService, MockTTSService, ScriptedLLMService
+from models.agent import Agent
+from models.loopback import LoopbackScenario, ENDED_BY_TESTER, ENDED_MAX_TURNS
+from services.agent_registry import AgentRegistry
+from services.bot import CallBot
+from services.call_metrics import compute_call_metrics
+from services.loopback import LoopbackRunner, loopback_activity
+from services.tracing import USER_STARTED, BOT_STARTED
+
+def make_bot(tmp: str, provider_factory) -> CallBot:
+    return CallBot(
+        Agent(agent_id="default", name="shop", prompt="You answer questions about the shop."),
+        "ACtest", "token", "+15550000000", "https://example.test",
+        provider_factory=provider_factory, agents=AgentRegistry(f"{tmp}/agents.sqlite3"),
+    )
+
+class ScriptedProviders:
+    """The tester asks two questions and hangs up; the agent answers from its own script."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def __call__(self, agent):
+        if agent.name.startswith("tester"):
+            replies = ["Hi, what time do you open?", "Great, bye."]
+        else:
+            replies = ["We open at nine.", "Goodbye!"]
+        return MockSTTService(0.0), ScriptedLLMService(replies, self.latency), MockTTSService(0.0)
+
+def test_text_conversation():
+    """The tester opens, the agent answers each line, and the tester's end_call ends it."""
+    async def scenario(tmp):
+        runner = LoopbackRunner(make_bot(tmp, ScriptedProviders()))
+        return (await runner.run([LoopbackScenario(persona="Ask when the shop opens.")]))[0]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        result = asyncio.run(scenario(tmp))
+    assert result.error is None and result.ended_by == ENDED_BY_TESTER
+    assert result.turns == 2 and result.said == ["Hi, what time do you open?", "Great, bye."]
+    assert [m["content"] for m in result.messages if m["role"] != "system"] == [
+        "Hi, what time do you open?", "We open at nine.", "Great, bye.", "Goodbye!"
+    ]
+    assert [event for _, event in result.timeline].count(USER_STARTED) == 2
+    assert [event for _, event in result.timeline].count(BOT_STARTED) == 2
+
+    metrics = compute_call_metrics([loopback_activity(result)])[0]
+    assert metrics["response_latency_ms"]["count"] == 2
+    # The tester said bye and the agent never called end_call.
+    assert metrics["missed_end_call"]
+
+def test_audio_conversation_cut_off_at_max_turns():
+    """Without text_only, replies go through TTS and the other side's STT, and the transcript is scored."""
+    async def scenario(tmp):
+        runner = LoopbackRunner(make_bot(tmp, MockProviders(0.0, 0.0, 0.0, 0.0)), text_only=False)
+        return (await runner.run([LoopbackScenario(persona="Chat.", opening="Hello there.", max_turns=3)]))[0]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        result = asyncio.run(scenario(tmp))
+    assert result.error is None and result.ended_by == ENDED_MAX_TURNS and result.turns == 3
+    assert len(result.said) == 3 and result.said[0] == "Hello there."
+    # The first line reaches the agent as text; later ones through the mock STT.
+    heard = [m["content"] for m in result.messages if m["role"] == "user"]
+    assert heard[0] == "Hello there." and heard[1].startswith("mock utterance")
+    assert compute_call_metrics([loopback_activity(result, score_transcript=True)])[0]["wer"] > 0
+
+def test_suite_runs_concurrently():
+    """Many conversations overlap, so a suite takes about as long as one conversation."""
+    async def scenario(tmp):
+        runner = LoopbackRunner(make_bot(tmp, ScriptedProviders(latency=0.2)), max_concurrency=50)
+        scenarios = [LoopbackScenario(persona="Ask when the shop opens.", name=f"s{i}") for i in range(50)]
+        scenarios.append(LoopbackScenario(persona="Anything.", agent="missing"))
+        started = time.perf_counter()
+        results = await runner.run(scenarios)
+        return results, time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results, elapsed = asyncio.run(scenario(tmp))
+    assert all(r.ended_by == ENDED_BY_TESTER and r.turns == 2 for r in results[:-1])
+    assert results[-1].error == "unknown agent: missing"
+    # Each conversation makes 5 LLM calls of 0.2 s; run one after another that would be 50 s.
+    assert elapsed < 10
+
+if __name__ == "__main__":
+    test_text_conversation()
+    test_audio_conversation_cut_off_at_max_turns()
+    test_suite_runs_concurrently()
+    print("loopback tests passed")
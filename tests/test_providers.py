@@ -0,0 +1,79 @@
+# tests/test_providers.py
+import asyncio
+import subprocess
+import sys
+from collections import OrderedDict
+from pathlib import Path
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from services.providers import ProviderRegistry, ProviderSpec
+from services.startup import StartupTimings
+
+def test_vendor_sdks_not_imported_until_used():
+    """Importing the bot loads no provider backend; creating one loads only that one."""
+    script = (
+        "import sys\n"
+        "from services.bot import CallBot\n"
+        "from services.providers import ProviderRegistry\n"
+        "vendors = ('pipecat.services.deepgram', 'pipecat.services.cartesia', 'pipecat.services.openai')\n"
+        "assert not [m for m in vendors if m in sys.modules], [m for m in vendors if m in sys.modules]\n"
+        "assert 'openai' not in sys.modules, 'OpenAI SDK imported with the bot'\n"
+        "ProviderRegistry().load('stt')\n"
+        "assert 'pipecat.services.deepgram' in sys.modules\n"
+        "assert 'pipecat.services.cartesia' not in sys.modules\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=root_dir, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr[-2000:]
+
+def test_registered_backend_created_and_warmed():
+    """A registered backend is selected by name, built with its options, and timed."""
+    registry = ProviderRegistry(selected={"stt": "fake", "llm": "fake", "tts": "fake", "vad": "fake"}, specs={
+        "stt": {"fake": ProviderSpec("collections:OrderedDict", {"language": "en"})},
+        "llm": {"fake": ProviderSpec("collections:OrderedDict")},
+        "tts": {"fake": ProviderSpec("collections:OrderedDict", {"voice_id": "a"}, warmup="gc:collect")},
+        "vad": {"fake": ProviderSpec("collections:OrderedDict")},
+    })
+    assert not any(stats["loaded"] for stats in registry.stats().values())
+
+    tts = registry.create("tts", voice_id="b")
+    assert isinstance(tts, OrderedDict) and tts == {"voice_id": "b"}
+    assert registry.create("stt") == {"language": "en"}
+
+    stats = registry.warmup()
+    assert all(stats[kind]["loaded"] and "import_ms" in stats[kind] for kind in stats)
+    assert "warmup_ms" in stats["tts"] and "warmup_ms" not in stats["stt"]
+
+    try:
+        ProviderRegistry(selected={"tts": "nope"})
+        assert False, "unknown provider accepted"
+    except ValueError as e:
+        assert str(e) == "unknown tts provider: nope"
+
+def test_startup_timings():
+    """Phases are recorded in order and the background warmup reports when done or failed."""
+    registry = ProviderRegistry(selected={"stt": "fake"}, specs={
+        "stt": {"fake": ProviderSpec("collections:OrderedDict"),
+                "missing": ProviderSpec("services.no_such_module:Nothing")},
+    })
+    timings = StartupTimings()
+    timings.mark("imports")
+    timings.mark("app")
+    timings.serving()
+    assert list(timings.phases) == ["imports", "app", "startup_hooks"]
+    assert timings.summary()["serving_s"] > 0 and not timings.summary()["warm"]
+
+    asyncio.run(timings.warm_up(registry))
+    assert timings.summary()["warm"] and timings.warmup_error is None
+
+    registry.select("stt", "missing")
+    asyncio.run(timings.warm_up(registry))
+    assert "no_such_module" in timings.warmup_error
+
+if __name__ == "__main__":
+    test_vendor_sdks_not_imported_until_used()
+    test_registered_backend_created_and_warmed()
+    test_startup_timings()
+    print("provider tests passed")
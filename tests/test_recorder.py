@@ -0,0 +1,73 @@
+# tests/test_recorder.py
+import sys
+import tempfile
+import wave
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from services.recorder import AudioRing, CallRecorder, CallRecording, CHANNEL_IN, CHANNEL_OUT
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+def tone(rate: int, seconds: float, value: int) -> bytes:
+    return np.full(int(rate * seconds), value, dtype=np.int16).tobytes()
+
+def test_ring_wraps_and_counts_overruns():
+    ring = AudioRing(sample_rate=10, seconds=1)
+    ring.write(np.arange(8, dtype=np.int16))
+    assert list(ring.take(5)) == [0, 1, 2, 3, 4]
+    ring.write(np.arange(8, 14, dtype=np.int16))
+    assert list(ring.take(14)) == list(range(5, 14))
+    ring.write(np.arange(25, dtype=np.int16))
+    assert len(ring.take(ring.written)) == 10 and ring.overruns == 15
+
+def test_stereo_wav_keeps_legs_aligned():
+    with tempfile.TemporaryDirectory() as directory:
+        clock = FakeClock()
+        recording = CallRecording("CA1", Path(directory) / "CA1.wav", clock=clock)
+        # Caller speaks for the first second (16 kHz), agent answers 0.5 s later (24 kHz).
+        for _ in range(50):
+            recording.feed(CHANNEL_IN, tone(16000, 0.02, 1000), 16000)
+            clock.now += 0.02
+        clock.now += 0.5
+        recording.drain()
+        for _ in range(50):
+            recording.feed(CHANNEL_OUT, tone(24000, 0.02, -1000), 24000)
+            clock.now += 0.02
+        recording.stop()
+        recording.drain(final=True)
+
+        with wave.open(str(recording.path), "rb") as wav:
+            assert wav.getnchannels() == 2 and wav.getframerate() == 8000
+            stereo = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16).reshape(-1, 2)
+        assert abs(len(stereo) - 2.5 * 8000) < 80
+        caller, agent = stereo[:, CHANNEL_IN], stereo[:, CHANNEL_OUT]
+        assert np.all(caller[100:7900] == 1000) and np.all(caller[8100:] == 0)
+        assert np.all(agent[:11900] == 0) and np.all(agent[12100:19900] == -1000)
+
+def test_sampling_and_overrides():
+    recorder = CallRecorder(sample_fraction=0.0)
+    assert recorder.should_record(True)
+    assert not recorder.should_record()
+    assert CallRecorder(sample_fraction=1.0).should_record()
+
+    # A call switched off is skipped even when every call is sampled, and nothing is kept for it
+    recorder = CallRecorder(sample_fraction=1.0)
+    assert recorder.start("CA5", enabled=False) is None
+    assert recorder.stats["skipped"] == 1 and not recorder._active and recorder._thread is None
+
+if __name__ == "__main__":
+    test_ring_wraps_and_counts_overruns()
+    test_stereo_wav_keeps_legs_aligned()
+    test_sampling_and_overrides()
+    print("recorder tests passed")
@@ -0,0 +1,74 @@
+# tests/test_runtime_metrics.py
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from services.admission import AdmissionController
+from services.runtime_metrics import RuntimeMetrics, process_memory, queue_depth
+from services.tracing import LatencyTracker, VAD_STOP, STT_FINAL, LLM_FIRST_TOKEN, PROBE_INPUT
+
+from pipecat.frames.frames import ErrorFrame, TextFrame
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+class StalledProcessor(FrameProcessor):
+    """Holds the first frame it gets until released, so later frames queue up."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = asyncio.Event()
+
+    async def process_frame(self, frame, direction):
+        await self.release.wait()
+
+class FakeBot:
+    def __init__(self):
+        self.active_calls = {"CA1": {}}
+        self.pipelines = {}
+        self.admission = AdmissionController()
+        self.latency_tracker = LatencyTracker()
+
+def test_snapshot():
+    async def scenario():
+        bot = FakeBot()
+        stalled = StalledProcessor()
+        for i in range(4):
+            await stalled.queue_frame(TextFrame(f"frame {i}"))
+        await asyncio.sleep(0.01)
+        bot.pipelines["CA1"] = [FrameProcessor(), stalled]
+
+        trace = bot.latency_tracker.start_call("CA1")
+        trace.mark(VAD_STOP, 1.0)
+        trace.mark(STT_FINAL, 1.2)
+        trace.mark(LLM_FIRST_TOKEN, 1.5)
+        bot.latency_tracker.probes(trace)[PROBE_INPUT]._observe(ErrorFrame("stt failed"), FrameDirection.UPSTREAM)
+
+        metrics = RuntimeMetrics(bot, cache_seconds=60)
+        snapshot = metrics.snapshot()
+        assert snapshot["calls"]["active"] == 1 and snapshot["tasks"]["pipelines"] == 1
+        assert snapshot["frame_queues"] == {"queued_frames": 3, "max_depth": 3, "max_depth_at": "CA1:StalledProcessor"}
+        assert snapshot["providers"]["stt"]["errors"] == 1 and snapshot["providers"]["stt"]["error_rate"] == 0.5
+        assert snapshot["providers"]["llm"]["latency_ms"]["p50"] == 300.0
+        # Scrapes within cache_seconds reuse the snapshot.
+        bot.active_calls.clear()
+        assert metrics.snapshot() is snapshot
+
+        stalled.release.set()
+        await asyncio.sleep(0.01)
+        assert queue_depth(stalled) == 0
+        await bot.admission.monitor.stop()
+
+    asyncio.run(scenario())
+
+def test_process_memory():
+    memory = process_memory()
+    assert memory["peak_rss_mb"] > 0
+    assert memory["rss_mb"] is None or 0 < memory["rss_mb"] <= memory["peak_rss_mb"]
+
+if __name__ == "__main__":
+    test_snapshot()
+    test_process_memory()
+    print("runtime metrics tests passed")
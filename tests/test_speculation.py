@@ -0,0 +1,150 @@
+# tests/test_speculation.py
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from services.openai_llm import SpeculativeOpenAILLMService
+from services.speculation import SpeculationTap, Speculator, new_speculation_stats, similar
+
+from pipecat.frames.frames import InterimTranscriptionFrame, TranscriptionFrame, UserStartedSpeakingFrame
+from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext
+from pipecat.processors.frame_processor import FrameDirection
+
+def chunk(text):
+    return SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=SimpleNamespace(content=text, tool_calls=None))])
+
+class FakeLLM(SpeculativeOpenAILLMService):
+    """Streams a reply echoing the last user message, one word every 10 ms."""
+
+    def __init__(self):
+        super().__init__(api_key="sk-test", model="fake")
+        self.requests = []
+
+    async def get_chat_completions(self, context, messages):
+        self.requests.append(messages[-1]["content"])
+
+        async def stream():
+            for word in f"you said {messages[-1]['content']}".split():
+                await asyncio.sleep(0.01)
+                yield chunk(word + " ")
+        return stream()
+
+async def reply(llm, context):
+    return "".join([c.choices[0].delta.content async for c in await llm._stream_chat_completions(context)])
+
+async def feed(tap, *frames):
+    for frame in frames:
+        await tap.process_frame(frame, FrameDirection.DOWNSTREAM)
+
+def make_call():
+    llm = FakeLLM()
+    stats = new_speculation_stats()
+    llm.speculator = Speculator(llm, stats)
+    context = OpenAILLMContext([{"role": "system", "content": "Answer briefly."}])
+    tap = SpeculationTap(llm.speculator, context)
+
+    async def push_frame(frame, direction=FrameDirection.DOWNSTREAM):
+        pass
+    tap.push_frame = push_frame
+    return llm, stats, context, tap
+
+def test_similar():
+    assert similar("What time do you open?", "what time do you open", 0.9)
+    assert not similar("book a table for two", "book a table for ten tonight", 0.9)
+
+def test_matching_final_uses_the_draft():
+    async def scenario():
+        llm, stats, context, tap = make_call()
+        await feed(
+            tap,
+            UserStartedSpeakingFrame(),
+            InterimTranscriptionFrame("what time do", "caller", "t"),
+            InterimTranscriptionFrame("what time do you open", "caller", "t"),
+            InterimTranscriptionFrame("what time do you open", "caller", "t"),  # stable: draft starts
+        )
+        await asyncio.sleep(0.03)  # the turn closes later, after VAD and the final transcript
+        context.add_message({"role": "user", "content": "What time do you open?"})
+        assert await reply(llm, context) == "you said what time do you open "
+        assert llm.requests == ["what time do you open"]
+        assert stats["drafts"] == 1 and stats["hits"] == 1 and stats["tokens_wasted"] == 0
+        await asyncio.sleep(0)
+        assert stats["tokens_reused"] == 7
+
+    asyncio.run(scenario())
+
+def test_changed_final_restarts():
+    async def scenario():
+        llm, stats, context, tap = make_call()
+        await feed(
+            tap,
+            UserStartedSpeakingFrame(),
+            InterimTranscriptionFrame("book a table", "caller", "t"),
+            InterimTranscriptionFrame("book a table", "caller", "t"),
+        )
+        await asyncio.sleep(0.025)
+        context.add_message({"role": "user", "content": "Book a table for four people tonight"})
+        assert await reply(llm, context) == "you said Book a table for four people tonight "
+        assert llm.requests == ["book a table", "Book a table for four people tonight"]
+        assert stats["misses"] == 1 and stats["tokens_wasted"] > 0
+
+    asyncio.run(scenario())
+
+def test_final_segments_replace_drafts():
+    async def scenario():
+        llm, stats, context, tap = make_call()
+        await feed(
+            tap,
+            UserStartedSpeakingFrame(),
+            TranscriptionFrame("I'd like a pizza.", "caller", "t"),
+            TranscriptionFrame("Large, please.", "caller", "t"),
+        )
+        assert stats["drafts"] == 2 and llm.speculator._draft.text == "I'd like a pizza. Large, please."
+        await feed(tap, UserStartedSpeakingFrame())  # caller kept talking: draft dropped
+        assert llm.speculator._draft is None
+        context.add_message({"role": "user", "content": "Actually, cancel that."})
+        assert await reply(llm, context) == "you said Actually, cancel that. "
+        assert stats["no_draft"] == 1
+
+    asyncio.run(scenario())
+
+def test_tool_follow_up_leaves_stats_alone():
+    """A completion after a tool call is the same user turn: it is neither a hit nor a miss."""
+    async def scenario():
+        llm, stats, context, tap = make_call()
+        await feed(
+            tap,
+            UserStartedSpeakingFrame(),
+            InterimTranscriptionFrame("are you open now", "caller", "t"),
+            InterimTranscriptionFrame("are you open now", "caller", "t"),
+        )
+        await asyncio.sleep(0.03)
+        context.add_message({"role": "user", "content": "Are you open now?"})
+        await reply(llm, context)
+        await asyncio.sleep(0)  # reused tokens are counted once the draft's task is done
+        # The caller talks over the tool call: a draft is in flight when the follow-up completes
+        await feed(tap, InterimTranscriptionFrame("hello", "caller", "t"), InterimTranscriptionFrame("hello", "caller", "t"))
+        counts, drafts_this_turn = dict(stats), llm.speculator._drafts_this_turn
+
+        context.add_message({"role": "assistant", "tool_calls": [
+            {"id": "call_1", "type": "function", "function": {"name": "opening_hours", "arguments": "{}"}}
+        ]})
+        context.add_message({"role": "tool", "tool_call_id": "call_1", "content": "9am to 5pm"})
+        assert await reply(llm, context) == "you said 9am to 5pm "
+        assert stats == counts and stats["hits"] == 1 and stats["no_draft"] == 0
+        assert llm.speculator._drafts_this_turn == drafts_this_turn == 1 and llm.speculator._draft is not None
+        llm.speculator.cancel()
+
+    asyncio.run(scenario())
+
+if __name__ == "__main__":
+    test_similar()
+    test_matching_final_uses_the_draft()
+    test_changed_final_restarts()
+    test_final_segments_replace_drafts()
+    test_tool_follow_up_leaves_stats_alone()
+    print("speculation tests passed")
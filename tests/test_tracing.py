@@ -0,0 +1,112 @@
+# tests/test_tracing.py
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from services.tracing import (
+    CallTrace, LatencyTracker, VAD_STOP, STT_FINAL, LLM_FIRST_TOKEN,
+    TTS_FIRST_AUDIO, OUTPUT_FIRST_AUDIO, PROBE_INPUT, PROBE_STT, PROBE_LLM, PROBE_OUTPUT,
+    USER_STARTED, USER_STOPPED, BOT_STARTED, BOT_STOPPED
+)
+
+from pipecat.frames.frames import (
+    BotStartedSpeakingFrame, BotStoppedSpeakingFrame, ErrorFrame, UserStartedSpeakingFrame, UserStoppedSpeakingFrame
+)
+from pipecat.processors.frame_processor import FrameDirection
+
+def test_turn_stage_latencies():
+    """A full turn produces one sample per stage."""
+    trace = CallTrace("CA_test")
+    trace.mark(VAD_STOP, 1.000)
+    trace.mark(STT_FINAL, 1.200)
+    trace.mark(LLM_FIRST_TOKEN, 1.500)
+    trace.mark(TTS_FIRST_AUDIO, 1.650)
+    trace.mark(OUTPUT_FIRST_AUDIO, 1.700)
+
+    summary = trace.summary()
+    assert summary["turns"] == 1
+    assert summary["stages"]["stt"]["p50"] == 200.0
+    assert summary["stages"]["llm"]["p50"] == 300.0
+    assert summary["stages"]["total"]["p50"] == 700.0
+
+def test_user_barge_in_abandons_turn():
+    """Speaking again after the LLM started replying drops the old turn."""
+    trace = CallTrace("CA_test")
+    trace.mark(VAD_STOP, 1.0)
+    trace.mark(STT_FINAL, 1.1)
+    trace.mark(LLM_FIRST_TOKEN, 1.4)
+    trace.mark(VAD_STOP, 2.0)
+    trace.mark(STT_FINAL, 2.1)
+
+    assert trace.abandoned == 1
+    assert len(trace.turns) == 1
+
+def test_tracker_retention():
+    """Only the most recent calls are kept."""
+    tracker = LatencyTracker(retention=2)
+    for sid in ("CA1", "CA2", "CA3"):
+        tracker.start_call(sid)
+    assert tracker.get("CA1") is None
+    assert tracker.summary()["calls"] == 2
+
+def test_probes_record_speech_timeline():
+    """Input and output probes record when each side starts and stops speaking."""
+    async def scenario():
+        tracker = LatencyTracker()
+        trace = tracker.start_call("CA_test")
+        probes = tracker.probes(trace)
+        for position, frame in [
+            (PROBE_INPUT, UserStartedSpeakingFrame()), (PROBE_INPUT, UserStoppedSpeakingFrame()),
+            (PROBE_OUTPUT, BotStartedSpeakingFrame()), (PROBE_OUTPUT, BotStoppedSpeakingFrame()),
+        ]:
+            probes[position]._observe(frame, FrameDirection.DOWNSTREAM)
+        return trace
+
+    trace = asyncio.run(scenario())
+    assert [event for _, event in trace.timeline] == [USER_STARTED, USER_STOPPED, BOT_STARTED, BOT_STOPPED]
+    times = [t for t, _ in trace.timeline]
+    assert times == sorted(times) and times[-1] <= trace.elapsed()
+
+def test_errors_counted_against_their_stage():
+    """An error frame travels upstream past several probes but counts once, for the stage that raised it."""
+    async def scenario():
+        tracker = LatencyTracker()
+        trace = tracker.start_call("CA_test")
+        probes = tracker.probes(trace)
+        tts_error, llm_error = ErrorFrame("tts failed"), ErrorFrame("llm failed")
+        for frame, path in [(tts_error, [PROBE_LLM, PROBE_STT, PROBE_INPUT]), (llm_error, [PROBE_STT, PROBE_INPUT])]:
+            for position in path:
+                probes[position]._observe(frame, FrameDirection.UPSTREAM)
+        probes[PROBE_LLM]._observe(ErrorFrame("tts failed again"), FrameDirection.UPSTREAM)
+        return tracker
+
+    tracker = asyncio.run(scenario())
+    assert tracker.error_counts() == {"tts": 2, "llm": 1}
+    # Frames that reached the input probe are forgotten; one still in flight is remembered.
+    assert len(tracker.get("CA_test")._errors_seen) == 1
+
+def test_distinct_error_frames_never_merged():
+    """Each error frame is counted even when an earlier one was freed and its memory reused."""
+    async def scenario():
+        tracker = LatencyTracker()
+        trace = tracker.start_call("CA_test")
+        probes = tracker.probes(trace)
+        for i in range(50):
+            # Nothing keeps the frame alive, so CPython may hand the next one the same id().
+            probes[PROBE_STT]._observe(ErrorFrame(f"llm failed {i}"), FrameDirection.UPSTREAM)
+        return tracker
+
+    assert asyncio.run(scenario()).error_counts() == {"llm": 50}
+
+if __name__ == "__main__":
+    test_turn_stage_latencies()
+    test_user_barge_in_abandons_turn()
+    test_tracker_retention()
+    test_probes_record_speech_timeline()
+    test_errors_counted_against_their_stage()
+    test_distinct_error_frames_never_merged()
+    print("tracing tests passed")
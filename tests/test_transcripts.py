@@ -0,0 +1,65 @@
+# tests/test_transcripts.py
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from services.transcripts import CallTranscriptWriter, TranscriptStore
+
+def populated_store(directory: str) -> TranscriptStore:
+    store = TranscriptStore(path=f"{directory}/transcripts.sqlite3", batch_size=50)
+    for i in range(5):
+        agent = "sales" if i % 2 == 0 else "support"
+        writer = CallTranscriptWriter(store, f"CA{i}", agent)
+        messages = [{"role": "system", "content": "prompt"}]
+        for turn in range(3):
+            messages.append({"role": "user", "content": f"question {turn}"})
+            writer.sync(messages)
+            messages.append({"role": "assistant", "content": f"answer {turn}"})
+            writer.sync(messages)
+        writer.close(messages)
+    store.set_evaluation("CA0", passed=True)
+    store.set_evaluation("CA1", passed=False)
+    store.flush()
+    return store
+
+def test_turns_are_recorded_once_in_order():
+    with tempfile.TemporaryDirectory() as directory:
+        store = populated_store(directory)
+        turns = store.list_turns(call_sid="CA3")["turns"]
+        assert [t["seq"] for t in turns] == list(range(6))
+        assert [t["role"] for t in turns[:2]] == ["user", "assistant"]
+        call = store.list_calls(agent="support")["calls"][0]
+        assert call["turns"] == 6 and call["ended_at"] is not None
+        store.close()
+
+def test_keyset_pagination_and_filters():
+    with tempfile.TemporaryDirectory() as directory:
+        store = populated_store(directory)
+        seen, cursor = [], None
+        while True:
+            page = store.list_turns(call_sid="CA2", limit=4, cursor=cursor)
+            seen.extend(t["content"] for t in page["turns"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert seen == ["question 0", "answer 0", "question 1", "answer 1", "question 2", "answer 2"]
+
+        first = store.list_calls(limit=2)
+        second = store.list_calls(limit=2, cursor=first["next_cursor"])
+        sids = [c["call_sid"] for c in first["calls"] + second["calls"]]
+        assert len(set(sids)) == 4
+
+        assert {c["call_sid"] for c in store.list_calls(agent="sales")["calls"]} == {"CA0", "CA2", "CA4"}
+        assert [c["call_sid"] for c in store.list_calls(evaluation="failed")["calls"]] == ["CA1"]
+        failed_turns = store.list_turns(evaluation="failed", role="user")["turns"]
+        assert len(failed_turns) == 3 and {t["call_sid"] for t in failed_turns} == {"CA1"}
+        store.close()
+
+if __name__ == "__main__":
+    test_turns_are_recorded_once_in_order()
+    test_keyset_pagination_and_filters()
+    print("transcript tests passed")
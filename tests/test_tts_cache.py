@@ -0,0 +1,139 @@
+# tests/test_tts_cache.py
+import asyncio
+import base64
+import fcntl
+import json
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from config import AUDIO_OUT_SAMPLE_RATE
+from services.audio_codec import FastTwilioFrameSerializer
+from services.tts_cache import (
+    CACHE_SAMPLE_RATE, CachingCartesiaTTSService, DiskAudioStore, MemoryAudioLRU, TTSAudioCache, cache_key
+)
+
+from pipecat.frames.frames import TTSAudioRawFrame
+
+def test_key_normalizes_whitespace():
+    assert cache_key("voice", "  Hello,   how can I help? ") == cache_key("voice", "Hello, how can I help?")
+    assert cache_key("voice", "Hello") != cache_key("other", "Hello")
+
+def test_memory_lru_evicts_by_size():
+    lru = MemoryAudioLRU(max_bytes=10)
+    lru.put("a", b"x" * 4)
+    lru.put("b", b"x" * 4)
+    lru.get("a")
+    lru.put("c", b"x" * 4)
+    assert lru.get("b") is None
+    assert lru.get("a") is not None and lru.get("c") is not None
+    assert lru.size == 8 and lru.evictions == 1
+
+def test_disk_store_is_shared_and_compacts():
+    with tempfile.TemporaryDirectory() as directory:
+        writer = DiskAudioStore(directory, max_bytes=100)
+        reader = DiskAudioStore(directory, max_bytes=100)
+        writer.put("greeting", b"\x01" * 40)
+        # A second process sees entries appended by the first.
+        assert reader.get("greeting") == b"\x01" * 40
+
+        for i in range(10):
+            writer.put(f"phrase-{i}", bytes([i]) * 40)
+        assert writer.size <= 100
+        assert writer.get("greeting") is None
+        assert writer.get("phrase-9") == bytes([9]) * 40
+        # Compaction rewrote the files; the reader reloads and stays consistent.
+        assert reader.get("phrase-9") == bytes([9]) * 40
+        assert reader.get("phrase-0") is None
+
+def test_cache_admission_and_counters():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = TTSAudioCache(directory=directory, memory_bytes=1024, disk_bytes=4096, admit_after=2)
+        assert cache.get("voice", "Goodbye!") is None
+        assert not cache.should_admit("voice", "Goodbye!")
+        assert cache.should_admit("voice", "Goodbye!")
+        cache.put("voice", "Goodbye!", b"\xff" * 160)
+
+        assert cache.get("voice", "Goodbye!") == b"\xff" * 160
+        fresh = TTSAudioCache(directory=directory, memory_bytes=1024, disk_bytes=4096)
+        assert fresh.get("voice", " Goodbye! ") == b"\xff" * 160
+        assert cache.stats()["memory_hits"] == 1
+        assert fresh.stats()["disk_hits"] == 1
+
+def test_writer_waiting_on_compaction_appends_to_new_data_file():
+    """A put that waited for a sibling's compaction writes to the data file the new index names."""
+    with tempfile.TemporaryDirectory() as directory:
+        compactor = DiskAudioStore(directory, max_bytes=1000)
+        waiter = DiskAudioStore(directory, max_bytes=1000)
+        for i in range(3):
+            compactor.put(f"old-{i}", bytes([i]) * 40)
+        compactor.put("old-0", b"\x07" * 40)  # leaves dead bytes for compaction
+        waiter.get("old-1")  # the waiter has mapped the current data file
+
+        with open(compactor._lock_path, "ab") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)  # the compactor holds the writer lock...
+            writer = threading.Thread(target=waiter.put, args=("new", b"\x09" * 40))
+            writer.start()  # ...so this put waits for it
+            compactor._compact()
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+        writer.join()
+
+        fresh = DiskAudioStore(directory, max_bytes=1000)
+        assert fresh.get("new") == b"\x09" * 40
+        assert fresh.get("old-0") == b"\x07" * 40 and fresh.get("old-2") == bytes([2]) * 40
+        assert waiter.get("old-1") == bytes([1]) * 40
+        assert len(list(Path(directory).glob("*.dat"))) == 1
+
+def test_disk_lookup_does_not_block_the_loop():
+    """A disk lookup that waits on the store's lock (a write or compaction) leaves the loop running."""
+    async def scenario(cache):
+        cache.disk._lock.acquire()  # as if a put were compacting
+        lookup = asyncio.create_task(cache.lookup("voice", "Hello"))
+        ticks = 0
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+            ticks += 1
+        assert not lookup.done() and ticks == 5
+        cache.disk._lock.release()
+        return await lookup
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = TTSAudioCache(directory=directory, memory_bytes=1024, disk_bytes=4096)
+        cache.disk.put(cache_key("voice", "Hello"), b"\x01" * 80)
+        assert asyncio.run(scenario(cache)) == b"\x01" * 80
+        assert cache.stats()["disk_hits"] == 1
+
+def test_hit_reaches_twilio_unchanged():
+    """A cached phrase is played at Twilio's rate: the serializer sends back the stored mu-law bytes."""
+    assert AUDIO_OUT_SAMPLE_RATE == CACHE_SAMPLE_RATE  # calls' TTS runs at the cache's rate
+    async def scenario(cache):
+        tts = CachingCartesiaTTSService(
+            api_key="test", voice_id="voice", sample_rate=CACHE_SAMPLE_RATE, cache=cache, synthesizer=object()
+        )
+        return [frame async for frame in tts.run_tts("Goodbye!")]
+
+    stored = bytes(range(256)) * 2
+    with tempfile.TemporaryDirectory() as directory:
+        cache = TTSAudioCache(directory=directory, memory_bytes=4096, disk_bytes=4096)
+        cache.put("voice", "Goodbye!", stored)
+        audio = [frame for frame in asyncio.run(scenario(cache)) if isinstance(frame, TTSAudioRawFrame)]
+    assert len(audio) == 1 and audio[0].sample_rate == CACHE_SAMPLE_RATE
+    message = json.loads(FastTwilioFrameSerializer("MZ1").serialize(audio[0]))
+    sent = base64.b64decode(message["media"]["payload"])
+    # mu-law has two zeros (0x7f and 0xff); every other byte survives exactly.
+    assert sent.replace(b"\x7f", b"\xff") == stored.replace(b"\x7f", b"\xff")
+
+if __name__ == "__main__":
+    test_key_normalizes_whitespace()
+    test_memory_lru_evicts_by_size()
+    test_disk_store_is_shared_and_compacts()
+    test_cache_admission_and_counters()
+    test_writer_waiting_on_compaction_appends_to_new_data_file()
+    test_disk_lookup_does_not_block_the_loop()
+    test_hit_reaches_twilio_unchanged()
+    print("tts cache tests passed")
@@ -0,0 +1,110 @@
+# tests/test_twilio_control.py
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from services.twilio_control import TwilioControlPlane
+
+class FakeCallContext:
+    def __init__(self, client, sid):
+        self._client = client
+        self._sid = sid
+
+    def update(self, **kwargs):
+        return self._client.request("update", sid=self._sid, **kwargs)
+
+    def fetch(self):
+        return self._client.request("fetch", sid=self._sid)
+
+class FakeCallList:
+    def __init__(self, client):
+        self._client = client
+
+    def __call__(self, sid):
+        return FakeCallContext(self._client, sid)
+
+    def create(self, **kwargs):
+        return self._client.request("create", **kwargs)
+
+class FakeTwilioClient:
+    """Blocks like the Twilio SDK and records the thread each request ran on."""
+
+    def __init__(self, rtt: float = 0.0, error: Exception = None):
+        self.rtt = rtt
+        self.error = error
+        self.calls = FakeCallList(self)
+        self.requests = []
+
+    def request(self, method: str, **kwargs):
+        self.requests.append((method, threading.current_thread().name, kwargs))
+        time.sleep(self.rtt)
+        if self.error is not None:
+            raise self.error
+        return SimpleNamespace(sid=kwargs.get("sid", "CA1"), status="in-progress")
+
+def test_requests_run_off_the_event_loop():
+    async def scenario():
+        client = FakeTwilioClient(rtt=0.1)
+        control_plane = TwilioControlPlane(None, None, max_workers=4, client=client)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        sids = await asyncio.gather(*(
+            control_plane.create_call("+15550000000", "+15550000001", "<Response/>", ring_timeout=30)
+            for _ in range(4)
+        ))
+        await control_plane.hangup("CA2")
+        assert await control_plane.fetch_status("CA2") == "in-progress"
+        elapsed = time.perf_counter() - started
+        ticking.cancel()
+        control_plane.close()
+
+        assert sids == ["CA1"] * 4
+        # The four dials overlapped on the pool and the loop kept running meanwhile
+        assert elapsed < 0.5 and ticks >= 10, (elapsed, ticks)
+        assert all(thread.startswith("twilio") for _, thread, _ in client.requests)
+        assert client.requests[0][2]["timeout"] == 30
+        assert client.requests[4][0] == "update" and "<Hangup/>" in client.requests[4][2]["twiml"]
+
+    asyncio.run(scenario())
+
+def test_errors_reach_the_caller():
+    async def scenario():
+        control_plane = TwilioControlPlane(None, None, client=FakeTwilioClient(error=ValueError("invalid To")))
+        for request in (control_plane.create_call("+1", "+15550000001", "<Response/>"),
+                        control_plane.hangup("CA1"), control_plane.fetch_status("CA1")):
+            try:
+                await request
+                assert False, "request error swallowed"
+            except ValueError as e:
+                assert str(e) == "invalid To"
+
+        # A closed pool refuses new requests instead of hanging them
+        control_plane = TwilioControlPlane(None, None, client=FakeTwilioClient())
+        control_plane.close()
+        try:
+            await control_plane.hangup("CA1")
+            assert False, "request on a closed pool accepted"
+        except RuntimeError:
+            pass
+
+    asyncio.run(scenario())
+
+if __name__ == "__main__":
+    test_requests_run_off_the_event_loop()
+    test_errors_reach_the_caller()
+    print("twilio control plane tests passed")
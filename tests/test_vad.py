@@ -0,0 +1,32 @@
+# tests/test_vad.py
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from services.vad import SharedSileroVADAnalyzer, get_shared_vad_model
+
+def test_analyzers_share_one_session():
+    """Every analyzer reuses the process-wide ONNX session but keeps its own state."""
+    shared = get_shared_vad_model()
+    first = SharedSileroVADAnalyzer(shared_model=shared)
+    second = SharedSileroVADAnalyzer(shared_model=shared)
+
+    assert first._model._model.session is second._model._model.session
+    assert first._model._model._state is not second._model._model._state
+
+def test_confidence_matches_per_stream():
+    """Two fresh streams fed the same audio report the same confidence."""
+    audio = (np.sin(np.arange(512) / 4.0) * 8000).astype(np.int16).tobytes()
+    first = SharedSileroVADAnalyzer()
+    second = SharedSileroVADAnalyzer()
+    assert abs(first.voice_confidence(audio) - second.voice_confidence(audio)) < 1e-6
+
+if __name__ == "__main__":
+    test_analyzers_share_one_session()
+    test_confidence_matches_per_stream()
+    print("vad tests passed")
@@ -0,0 +1,175 @@
+# tests/test_warm_pool.py
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to Python path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from services.warm_pool import WarmSession, WarmSessionPool
+
+class FakeService:
+    """A provider service whose prewarm can be held open or made to fail."""
+
+    def __init__(self, gate: asyncio.Event = None, error: Exception = None):
+        self.gate = gate
+        self.error = error
+        self.prewarmed = False
+        self.released = 0
+
+    async def prewarm(self):
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.error is not None:
+            raise self.error
+        self.prewarmed = True
+
+    async def release(self):
+        self.released += 1
+
+class FakeProcessor:
+    def __init__(self):
+        self.cleaned_up = 0
+
+    async def cleanup(self):
+        self.cleaned_up += 1
+
+def fake_session(gate: asyncio.Event = None, error: Exception = None) -> WarmSession:
+    user, assistant = FakeProcessor(), FakeProcessor()
+    aggregator = SimpleNamespace(user=lambda: user, assistant=lambda: assistant)
+    return WarmSession(
+        stt=FakeService(gate), llm=FakeService(gate, error), tts=FakeService(gate),
+        context=None, context_aggregator=aggregator, messages=[],
+    )
+
+def released(session: WarmSession) -> int:
+    """Times the session was torn down (each service must agree)."""
+    counts = {service.released for service in (session.stt, session.llm, session.tts)}
+    assert len(counts) == 1, counts
+    return counts.pop()
+
+def test_prepare_then_claim_once():
+    async def scenario():
+        pool = WarmSessionPool(ttl=0.1)
+        session = fake_session()
+        pool.prepare("CA1", lambda: session)
+        pool.prepare("CA1", fake_session)  # already preparing: ignored
+        assert len(pool) == 1 and pool.stats["prepared"] == 1
+
+        claimed = await pool.claim("CA1")
+        assert claimed is session and claimed.warm and session.stt.prewarmed
+        assert await pool.claim("CA1") is None
+        assert len(pool) == 0 and pool.stats["claimed"] == 1
+
+        # A claimed session belongs to the pipeline: the TTL no longer applies
+        await asyncio.sleep(0.2)
+        assert pool.stats["expired"] == 0 and released(session) == 0
+
+    asyncio.run(scenario())
+
+def test_failed_prewarm_still_claimable_cold():
+    async def scenario():
+        pool = WarmSessionPool()
+        session = fake_session(error=RuntimeError("llm down"))
+        pool.prepare("CA1", lambda: session)
+        claimed = await pool.claim("CA1")
+        assert claimed is session and not claimed.warm
+
+        def broken_build():
+            raise RuntimeError("no agent")
+        pool.prepare("CA2", broken_build)
+        assert await pool.claim("CA2") is None
+
+    asyncio.run(scenario())
+
+def test_discard_releases_once():
+    async def scenario():
+        pool = WarmSessionPool()
+        session = fake_session()
+        pool.prepare("CA1", lambda: session)
+        await pool.discard("CA1")
+        await pool.discard("CA1")
+        assert released(session) == 1 and session.context_aggregator.user().cleaned_up == 1
+        assert await pool.claim("CA1") is None and len(pool) == 0
+
+    asyncio.run(scenario())
+
+def test_unclaimed_session_expires():
+    async def scenario():
+        pool = WarmSessionPool(ttl=0.05)
+        session = fake_session()
+        pool.prepare("CA1", lambda: session)
+        await asyncio.sleep(0.15)
+        assert pool.stats["expired"] == 1 and released(session) == 1
+        assert await pool.claim("CA1") is None
+
+    asyncio.run(scenario())
+
+def test_session_cap():
+    async def scenario():
+        pool = WarmSessionPool(max_sessions=1)
+        pool.prepare("CA1", fake_session)
+        pool.prepare("CA2", fake_session)
+        assert len(pool) == 1 and pool.stats["skipped"] == 1
+        await pool.discard("CA1")
+
+    asyncio.run(scenario())
+
+def test_claim_racing_expiry():
+    """Whichever of claim and expiry takes the session first owns it; it is never both used and released."""
+    async def scenario():
+        pool = WarmSessionPool()
+
+        # Expiry fired but has not run yet when the stream claims: the claim wins
+        session = fake_session()
+        pool.prepare("CA1", lambda: session)
+        expiry = asyncio.create_task(pool._expire("CA1"))
+        assert await pool.claim("CA1") is session
+        await expiry
+        assert pool.stats["expired"] == 0 and released(session) == 0
+
+        # Expiry is tearing the session down (still warming) when the stream claims: the claim misses
+        gate = asyncio.Event()
+        session = fake_session(gate)
+        pool.prepare("CA2", lambda: session)
+        expiry = asyncio.create_task(pool._expire("CA2"))
+        await asyncio.sleep(0)
+        assert await pool.claim("CA2") is None
+        gate.set()
+        await expiry
+        assert pool.stats["expired"] == 1 and released(session) == 1
+
+    asyncio.run(scenario())
+
+def test_claim_times_out_while_prepare_pending():
+    """A slow prewarm is not waited on past the timeout, not cancelled, and released once done."""
+    async def scenario():
+        pool = WarmSessionPool(claim_timeout=0.05)
+        gate = asyncio.Event()
+        session = fake_session(gate)
+        pool.prepare("CA1", lambda: session)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        assert await pool.claim("CA1") is None
+        assert loop.time() - started < 0.5
+        assert len(pool) == 0 and released(session) == 0
+
+        gate.set()
+        await asyncio.sleep(0.05)
+        assert session.stt.prewarmed and released(session) == 1
+        assert pool.stats["claimed"] == 0
+
+    asyncio.run(scenario())
+
+if __name__ == "__main__":
+    test_prepare_then_claim_once()
+    test_failed_prewarm_still_claimable_cold()
+    test_discard_releases_once()
+    test_unclaimed_session_expires()
+    test_session_cap()
+    test_claim_racing_expiry()
+    test_claim_times_out_while_prepare_pending()
+    print("warm pool tests passed")